@@ -1,7 +1,19 @@
 """  Admin panel configuration for core models """
 
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+from django.utils.functional import cached_property
+
 from .models import (
     User,
     Address,
@@ -16,9 +28,90 @@ from .models import (
     Conversation,
     ConversationParticipant,
     Message,
+    ErasureRequest,
+    ProfileCapture,
+    SlowQuery,
 )
 
 
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids exact ``COUNT(*)`` scans on very large tables.
+
+    Unfiltered changelists on PostgreSQL use the planner's row estimate from
+    ``pg_class`` (summed over partitions) once it exceeds
+    ``estimate_threshold``. Filtered or small result sets are counted exactly,
+    but never beyond ``count_cap`` rows.
+    """
+
+    estimate_threshold = 100_000
+    count_cap = 10_000
+
+    @cached_property
+    def count(self):
+        """Return an estimated or capped number of objects."""
+
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if not queryset.query.where and connection.vendor == "postgresql":
+            estimate = self._estimate(connection, queryset.model._meta.db_table)
+            if estimate >= self.estimate_threshold:
+                return estimate
+        return queryset[: self.count_cap].count()
+
+    @staticmethod
+    def _estimate(connection, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint FROM pg_class c "
+                "WHERE c.oid = to_regclass(%s) "
+                "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))",
+                [table, table],
+            )
+            return cursor.fetchone()[0]
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Base admin for tables that grow to tens of millions of rows.
+
+    Changelists use :class:`EstimatedCountPaginator` and skip the unfiltered
+    total. A search term that parses as a value of one of
+    ``exact_search_fields`` (UUIDs, e-mail addresses) becomes an indexed
+    equality lookup. Other terms fall back to ``search_fields``, which on these
+    admins only target small related tables with prefix (``^``) lookups.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+    exact_search_fields = ()
+
+    def get_search_fields(self, request):
+        """Show the search box whenever exact lookups are configured."""
+
+        return tuple(super().get_search_fields(request)) or self.exact_search_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        """Prefer exact, index-backed lookups over ``LIKE`` scans."""
+
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        lookups = Q()
+        for lookup in self.exact_search_fields:
+            field = get_fields_from_path(self.model, lookup)[-1]
+            try:
+                value = field.to_python(term)
+                field.run_validators(value)
+            except ValidationError:
+                continue
+            lookups |= Q(**{lookup: value})
+        if lookups:
+            return queryset.filter(lookups), False
+        if self.search_fields:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.none(), False
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """Admin panel configuration for the User model"""
@@ -172,6 +265,8 @@ class AthleteAdmin(admin.ModelAdmin):
     """Admin configuration for athlete profiles."""
 
     list_display = ("name", "location", "category", "price", "certified", "level", "user")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
     search_fields = ("name", "location", "category", "user__email")
     list_filter = ("certified", "level")
     ordering = ("name",)
@@ -198,64 +293,180 @@ class SportCategoryAdmin(admin.ModelAdmin):
 class MediaAssetAdmin(admin.ModelAdmin):
     """Admin configuration for media asset objects."""
 
-    list_display = ("url", "created_at")
-    search_fields = ("url",)
+    list_display = ("url", "status", "width", "height", "created_at")
+    list_filter = ("status",)
+    search_fields = ("url", "content_hash")
+    readonly_fields = ("content_hash", "original", "width", "height", "derivatives", "last_error")
 
 
 @admin.register(AthleteImage)
-class AthleteImageAdmin(admin.ModelAdmin):
+class AthleteImageAdmin(LargeTableAdmin):
     """Admin configuration for athlete-media relations."""
 
     list_display = ("athlete", "media", "order")
     list_editable = ("order",)
-    search_fields = ("athlete__name",)
+    list_select_related = ("athlete", "media")
+    autocomplete_fields = ("athlete",)
+    raw_id_fields = ("media",)
+    search_fields = ("^athlete__name",)
+    exact_search_fields = ("athlete__id",)
 
 
 @admin.register(SocialStat)
-class SocialStatAdmin(admin.ModelAdmin):
+class SocialStatAdmin(LargeTableAdmin):
     """Admin configuration for social statistics."""
 
     list_display = ("athlete", "platform", "followers", "last_updated")
     list_filter = ("platform",)
-    search_fields = ("athlete__name",)
+    list_select_related = ("athlete",)
+    autocomplete_fields = ("athlete",)
+    search_fields = ("^athlete__name",)
+    exact_search_fields = ("athlete__id",)
 
 
 @admin.register(AthleteFollow)
-class AthleteFollowAdmin(admin.ModelAdmin):
+class AthleteFollowAdmin(LargeTableAdmin):
     """Admin configuration for follow relationships."""
 
     list_display = ("user", "athlete", "created_at")
-    search_fields = ("user__email", "athlete__name")
+    list_select_related = ("user", "athlete")
+    raw_id_fields = ("user",)
+    autocomplete_fields = ("athlete",)
+    search_fields = ("^athlete__name",)
+    exact_search_fields = ("user__email", "user__id", "athlete__id")
 
 
 @admin.register(ActivityEvent)
-class ActivityEventAdmin(admin.ModelAdmin):
+class ActivityEventAdmin(LargeTableAdmin):
     """Admin configuration for activity feed entries."""
 
     list_display = ("athlete", "type", "happened_at")
     list_filter = ("type",)
-    search_fields = ("athlete__name", "text")
+    list_select_related = ("athlete",)
+    autocomplete_fields = ("athlete",)
+    raw_id_fields = ("images",)
+    search_fields = ("^athlete__name",)
+    exact_search_fields = ("id", "athlete__id")
 
 
 @admin.register(Conversation)
-class ConversationAdmin(admin.ModelAdmin):
+class ConversationAdmin(LargeTableAdmin):
     """Admin configuration for conversations."""
 
-    list_display = ("id", "topic", "created_at", "updated_at")
-    search_fields = ("topic", "id")
+    list_display = ("id", "topic", "is_archived", "created_at", "updated_at")
+    list_filter = ("is_archived",)
+    raw_id_fields = ("last_message",)
+    # No search on topic: it is unindexed, so any match would scan the table.
+    exact_search_fields = ("id",)
 
 
 @admin.register(ConversationParticipant)
-class ConversationParticipantAdmin(admin.ModelAdmin):
+class ConversationParticipantAdmin(LargeTableAdmin):
     """Admin configuration for conversation participants."""
 
     list_display = ("conversation", "user", "unread_count", "is_muted")
-    search_fields = ("conversation__id", "user__email")
+    list_select_related = ("conversation", "user")
+    raw_id_fields = ("conversation", "user")
+    exact_search_fields = ("conversation__id", "user__email", "user__id")
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(LargeTableAdmin):
     """Admin configuration for conversation messages."""
 
     list_display = ("conversation", "sender", "created_at")
-    search_fields = ("conversation__id", "sender__email", "text")
+    list_select_related = ("conversation", "sender")
+    raw_id_fields = ("conversation", "sender", "attachments", "read_by")
+    exact_search_fields = ("id", "conversation__id", "sender__email", "sender__id")
+
+
+@admin.register(ErasureRequest)
+class ErasureRequestAdmin(admin.ModelAdmin):
+    """Read-only audit trail of right-to-erasure requests."""
+
+    list_display = ("subject_id", "status", "step", "attempts", "requested_at", "completed_at")
+    list_filter = ("status",)
+    search_fields = ("=subject_id", "=email_hash")
+    readonly_fields = [field.name for field in ErasureRequest._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Per-fingerprint aggregates recorded by ``api.slow_queries``."""
+
+    list_display = ("fingerprint", "alias", "calls", "total_ms", "max_ms", "last_view", "last_seen")
+    list_filter = ("alias",)
+    search_fields = ("=fingerprint", "^last_view")
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    """Request profiles captured by ``api.profiling.ProfilingMiddleware``."""
+
+    list_display = (
+        "created_at",
+        "method",
+        "view_name",
+        "status_code",
+        "duration_ms",
+        "trigger",
+        "user",
+        "download",
+    )
+    list_filter = ("trigger", "method", "backend")
+    search_fields = ("^view_name", "^path")
+    list_select_related = ("user",)
+    readonly_fields = [field.name for field in ProfileCapture._meta.fields] + ["download"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<uuid:pk>/download/",
+                self.admin_site.admin_view(self.download_view),
+                name="api_profilecapture_download",
+            )
+        ] + super().get_urls()
+
+    @admin.display(description="Profile")
+    def download(self, obj):
+        """Link to the stored profile file."""
+
+        url = reverse("admin:api_profilecapture_download", args=[obj.pk])
+        return format_html('<a href="{}">{}</a>', url, obj.file_name)
+
+    def download_view(self, request, pk):
+        """Serve the stored profile as an attachment."""
+
+        if not self.has_view_permission(request):
+            raise Http404
+        capture = get_object_or_404(ProfileCapture, pk=pk)
+        file_path = settings.PROFILING_ROOT / capture.file_name
+        if not file_path.is_file():
+            raise Http404("The profile file no longer exists.")
+        handle = open(file_path, "rb")  # pylint: disable=consider-using-with
+        return FileResponse(handle, as_attachment=True, filename=capture.file_name)
+
+    def delete_model(self, request, obj):
+        (settings.PROFILING_ROOT / obj.file_name).unlink(missing_ok=True)
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        for file_name in queryset.values_list("file_name", flat=True):
+            (settings.PROFILING_ROOT / file_name).unlink(missing_ok=True)
+        super().delete_queryset(request, queryset)
@@ -7,3 +7,10 @@ class ApiConfig(AppConfig):
     """Api app configuration."""
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        """Connect the signal handlers that keep cached profiles and unread totals fresh."""
+
+        # pylint: disable=import-outside-toplevel,unused-import
+        from . import claims  # noqa: F401
+        from .utils import messaging  # noqa: F401
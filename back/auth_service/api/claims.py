@@ -0,0 +1,103 @@
+"""JWT profile claims and the cached profile served by ``/auth/me``.
+
+Profile fields copied into tokens go stale when the user edits them. Each user
+carries a ``claims_version`` that is bumped on such writes and embedded in the
+tokens. The serialised profile is cached together with that version, so the
+profile endpoint answers from the token plus one cache read and can tell the
+client when its token predates the latest profile change.
+"""
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+
+PROFILE_CACHE_PREFIX = "auth:me:"
+PROFILE_CACHE_TIMEOUT = 15 * 60
+CLAIMS_VERSION_CLAIM = "claims_version"
+STALE_CLAIMS_HEADER = "X-Claims-Stale"
+
+
+def add_user_claims(token, user):
+    """Copy the profile claims of ``user`` into ``token``.
+
+    Args:
+        token (Token): Refresh or access token being issued.
+        user (User): Owner of the token.
+
+    Returns:
+        Token: The same token, for chaining.
+    """
+
+    token["first_name"] = user.first_name
+    token["last_name"] = user.last_name
+    token["subscription_plan"] = user.subscription_plan
+    token["email"] = user.email
+    token["is_verified"] = user.is_verified
+    token["is_staff"] = user.is_staff
+    token["language"] = getattr(user, "language", None)
+    token["currency"] = getattr(user, "currency", None)
+    token["timezone"] = getattr(user, "timezone", None)
+    token[CLAIMS_VERSION_CLAIM] = user.claims_version
+    return token
+
+
+def profile_cache_key(user_id):
+    """Return the cache key holding the serialised profile of ``user_id``."""
+
+    return f"{PROFILE_CACHE_PREFIX}{user_id}"
+
+
+def cached_profile(user_id):
+    """Return ``{"version", "data"}`` for ``user_id``, reading the DB on a miss.
+
+    Returns:
+        dict | None: The cached entry, or ``None`` when the user does not exist.
+    """
+
+    key = profile_cache_key(user_id)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    # Imported lazily: the serializers module imports this one.
+    from .serializers import UserSerializer  # pylint: disable=import-outside-toplevel
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return None
+    entry = {"version": user.claims_version, "data": dict(UserSerializer(user).data)}
+    cache.set(key, entry, timeout=PROFILE_CACHE_TIMEOUT)
+    return entry
+
+
+def invalidate_profile(user_id):
+    """Drop the cached profile of ``user_id``."""
+
+    cache.delete(profile_cache_key(user_id))
+
+
+def bump_claims_version(user):
+    """Mark the claims held in existing tokens of ``user`` as stale.
+
+    Args:
+        user (User): User whose profile claims changed.
+
+    Returns:
+        int: The new claims version.
+    """
+
+    User.objects.filter(pk=user.pk).update(claims_version=F("claims_version") + 1)
+    user.refresh_from_db(fields=["claims_version"])
+    invalidate_profile(user.pk)
+    return user.claims_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _invalidate_profile_on_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Keep the cached profile in step with every saved change to a user."""
+
+    invalidate_profile(instance.pk)
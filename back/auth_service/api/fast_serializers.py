@@ -0,0 +1,298 @@
+"""Fast-path rendering for read-only list endpoints.
+
+``ModelSerializer`` renders a list by instantiating every model row and then
+dispatching ``get_attribute``/``to_representation`` field by field. The
+classes here read rows straight from ``.values()`` instead and run each column
+through a converter compiled once from the regular serializer's own field, so
+the output is identical to the regular serializer's. Fields that are not
+columns (method fields, galleries, many-to-many ids) come from ``get_<field>``
+methods fed by a single batched lookup per page.
+
+Only lists use this path; validation and writes stay with the serializers in
+:mod:`api.serializers`.
+"""
+
+from __future__ import annotations
+
+import decimal
+from collections import defaultdict
+from datetime import date
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .models import ActivityEvent, AthleteImage
+from .serializers import (
+    ActivityEventSerializer,
+    AthleteSerializer,
+    UserSerializer,
+    age_in_years,
+)
+from .utils.media import derivatives_srcset
+
+# Fields whose representation of a database value is the value itself.
+_IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return convert
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if (
+        not coerce_to_string
+        or field.localize
+        or field.decimal_places is None
+        or getattr(field, "normalize_output", False)
+    ):
+        return field.to_representation
+
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        return f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+    return convert
+
+
+def compile_converter(field):
+    """Return a callable producing ``field``'s representation of a column value.
+
+    ``None`` means the database value is already its representation. Fields
+    without a fast converter fall back to their own ``to_representation``.
+
+    Args:
+        field (serializers.Field): Bound field of the regular serializer.
+
+    Returns:
+        Callable[[Any], Any] | None: The converter, or ``None`` for identity.
+    """
+
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return date.isoformat
+        return field.to_representation
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.UUIDField):
+        return str if field.uuid_format == "hex_verbose" else field.to_representation
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, serializers.ChoiceField) and not isinstance(
+        field, serializers.MultipleChoiceField
+    ):
+        return None
+    if isinstance(field, _IDENTITY_FIELDS):
+        return None
+    return field.to_representation
+
+
+class FastListSerializer:
+    """Render ``serializer_class`` lists from ``.values()`` rows.
+
+    Subclasses name the serializer to mirror, the serializer fields computed
+    by ``get_<field>(row)`` methods and any annotation those methods read.
+    ``prepare(rows)`` runs once per page to batch-load related data.
+    """
+
+    serializer_class = None
+    computed_fields = ()
+    extra_columns = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    def readable_fields(self):
+        """Return the readable fields of the mirrored serializer, in output order."""
+
+        serializer = self.serializer_class(context=self.context)  # pylint: disable=not-callable
+        return [field for field in serializer.fields.values() if not field.write_only]
+
+    def columns(self):
+        """Return the database columns to select for the mirrored serializer."""
+
+        sources = [
+            field.source
+            for field in self.readable_fields()
+            if field.field_name not in self.computed_fields
+        ]
+        for source in sources:
+            if "." in source or source == "*":
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__} cannot read '{source}' from .values(); "
+                    "list it in computed_fields."
+                )
+        return list(dict.fromkeys(["pk", *sources, *self.extra_columns]))
+
+    def values(self, queryset):
+        """Return ``queryset`` as the ``.values()`` rows that :meth:`render` expects."""
+
+        return queryset.prefetch_related(None).values(*self.columns())
+
+    def prepare(self, rows):
+        """Batch-load whatever the ``get_<field>`` methods need for ``rows``."""
+
+    def render(self, rows):
+        """Return the serialized representation of ``rows``.
+
+        Args:
+            rows (Iterable[dict]): Rows produced by :meth:`values`.
+
+        Returns:
+            list[dict]: One dict per row, equal to the regular serializer output.
+        """
+
+        rows = list(rows)
+        self.prepare(rows)
+        plan = []
+        for field in self.readable_fields():
+            if field.field_name in self.computed_fields:
+                plan.append((field.field_name, None, getattr(self, f"get_{field.field_name}")))
+            else:
+                plan.append((field.field_name, field.source, compile_converter(field)))
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in plan:
+                if source is None:
+                    item[name] = convert(row)
+                    continue
+                value = row[source]
+                item[name] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+class AthleteListSerializer(FastListSerializer):
+    """Fast list rendering of :class:`AthleteSerializer`.
+
+    Expects querysets built with ``Athlete.objects.for_listing()``.
+    """
+
+    serializer_class = AthleteSerializer
+    computed_fields = (
+        "age",
+        "followers_count",
+        "is_followed",
+        "recent_activity_count",
+        "has_recent_activity",
+        "images",
+        "image_srcsets",
+    )
+    extra_columns = ("followers_total", "recent_activity_total", "followed_by_user")
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        request = self.context.get("request")
+        self.absolute = request.build_absolute_uri if request is not None else None
+        self.today = None
+        self.galleries = {}
+
+    def prepare(self, rows):
+        """Load the ordered gallery of every athlete on the page in one query."""
+
+        self.today = date.today()
+        self.galleries = defaultdict(list)
+        images = (
+            AthleteImage.objects.filter(athlete_id__in=[row["pk"] for row in rows])
+            .order_by("order")
+            .values_list("athlete_id", "media__url", "media__derivatives")
+        )
+        for athlete_id, url, derivatives in images:
+            self.galleries[athlete_id].append((url, derivatives))
+
+    def get_age(self, row):
+        """Mirror :meth:`AthleteSerializer.get_age`."""
+
+        return age_in_years(row["date_of_birth"], self.today)
+
+    def get_followers_count(self, row):
+        """Mirror :meth:`AthleteSerializer.get_followers_count`."""
+
+        return row["followers_total"]
+
+    def get_is_followed(self, row):
+        """Mirror :meth:`AthleteSerializer.get_is_followed`."""
+
+        return row["followed_by_user"]
+
+    def get_recent_activity_count(self, row):
+        """Mirror :meth:`AthleteSerializer.get_recent_activity_count`."""
+
+        return row["recent_activity_total"]
+
+    def get_has_recent_activity(self, row):
+        """Mirror :meth:`AthleteSerializer.get_has_recent_activity`."""
+
+        return bool(row["recent_activity_total"])
+
+    def get_images(self, row):
+        """Return the ordered gallery URLs."""
+
+        return [url for url, _ in self.galleries[row["pk"]]]
+
+    def get_image_srcsets(self, row):
+        """Return one ``srcset`` per gallery image."""
+
+        return [
+            derivatives_srcset(derivatives, self.absolute)
+            for _, derivatives in self.galleries[row["pk"]]
+        ]
+
+
+class ActivityEventListSerializer(FastListSerializer):
+    """Fast list rendering of :class:`ActivityEventSerializer`."""
+
+    serializer_class = ActivityEventSerializer
+    computed_fields = ("images",)
+
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.images = {}
+
+    def prepare(self, rows):
+        """Load the image ids of every event on the page in one query."""
+
+        self.images = defaultdict(list)
+        event_ids = [row["pk"] for row in rows]
+        links = (
+            ActivityEvent.images.through.objects.filter(activityevent_id__in=event_ids)
+            .order_by("pk")
+            .values_list("activityevent_id", "mediaasset_id")
+        )
+        for event_id, media_id in links:
+            self.images[event_id].append(media_id)
+
+    def get_images(self, row):
+        """Return the primary keys of the event images."""
+
+        return self.images[row["pk"]]
+
+
+class UserListSerializer(FastListSerializer):
+    """Fast list rendering of :class:`UserSerializer`."""
+
+    serializer_class = UserSerializer
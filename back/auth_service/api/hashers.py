@@ -0,0 +1,37 @@
+"""Password hashers whose cost parameters come from the settings.
+
+Each hasher keeps the algorithm name of its Django parent so existing hashes
+keep verifying. When a cost parameter changes, ``must_update`` reports the old
+hashes as outdated and Django re-hashes the password on the user's next
+successful login.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 using ``settings.PBKDF2_ITERATIONS`` iterations."""
+
+    iterations = getattr(settings, "PBKDF2_ITERATIONS", None) or PBKDF2PasswordHasher.iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id using the ``ARGON2_*`` cost settings (requires ``argon2-cffi``)."""
+
+    time_cost = getattr(settings, "ARGON2_TIME_COST", None) or Argon2PasswordHasher.time_cost
+    memory_cost = getattr(settings, "ARGON2_MEMORY_COST", None) or Argon2PasswordHasher.memory_cost
+    parallelism = getattr(settings, "ARGON2_PARALLELISM", None) or Argon2PasswordHasher.parallelism
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt using the ``SCRYPT_*`` cost settings."""
+
+    work_factor = getattr(settings, "SCRYPT_WORK_FACTOR", None) or ScryptPasswordHasher.work_factor
+    block_size = getattr(settings, "SCRYPT_BLOCK_SIZE", None) or ScryptPasswordHasher.block_size
+    # OpenSSL refuses to allocate more than 32 MiB unless told otherwise.
+    maxmem = 256 * work_factor * block_size
@@ -0,0 +1,178 @@
+"""Replay the first response of POST requests retried with the same ``Idempotency-Key``.
+
+A client sends a unique ``Idempotency-Key`` header with a POST and reuses it
+when it retries. The first request runs normally and its response is cached
+for ``settings.IDEMPOTENCY_TTL`` seconds, keyed on the key and the caller (the
+user id from the session or bearer token, the client IP for anonymous callers).
+A retry is answered from that cache entry without running the view, with an
+``Idempotent-Replayed: true`` header. Reusing a key for a different request
+(method, path or body) is a ``422``; a retry arriving while the first request
+is still running is a ``409``.
+
+Server errors and throttled responses are not stored, so those can be retried.
+Paths under ``settings.IDEMPOTENCY_EXCLUDED_PATHS`` (login, refresh and logout)
+are never handled, and responses that set cookies or return ``access``/``refresh``
+tokens are never stored, so credentials do not end up in the cache.
+``IDEMPOTENCY_TTL = 0`` removes the middleware from the stack.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+KEY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+REPLAYED_HEADER = "Idempotent-Replayed"
+CACHE_PREFIX = "idempotency:"
+MAX_KEY_LENGTH = 255
+# How long a request holds its key while it runs; a crashed worker frees it after this.
+IN_FLIGHT_TIMEOUT = 60
+# Response headers replayed along with the body.
+REPLAYED_RESPONSE_HEADERS = ("Content-Type", "Location")
+# Response body keys that hold credentials.
+CREDENTIAL_KEYS = {"access", "refresh"}
+
+_PENDING = "pending"
+_DONE = "done"
+
+
+def _caller(request):
+    """Return the scope of the requester: ``user:<id>`` or ``anonymous:<ip>``."""
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    anonymous = f"anonymous:{request.META.get('REMOTE_ADDR', '')}"
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return anonymous
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return anonymous
+    return f"user:{token.get(jwt_settings.USER_ID_CLAIM)}"
+
+
+def carries_credentials(response):
+    """Return True when ``response`` sets cookies or returns JWTs in a JSON body."""
+
+    if response.cookies:
+        return True
+    if not response.get("Content-Type", "").startswith("application/json"):
+        return False
+    try:
+        body = json.loads(response.content)
+    except ValueError:
+        return False
+    return isinstance(body, dict) and not CREDENTIAL_KEYS.isdisjoint(body)
+
+
+def request_fingerprint(request):
+    """Return a digest of the method, path and body of ``request``.
+
+    Uploads and bodies above ``DATA_UPLOAD_MAX_MEMORY_SIZE`` are not read
+    here, which would buffer them in memory; their content type (without the
+    ``boundary`` and other parameters, which clients regenerate on retries) and
+    length stand in for the body.
+    """
+
+    digest = hashlib.sha256(f"{request.method} {request.get_full_path()}\n".encode())
+    length = int(request.META.get("CONTENT_LENGTH") or 0)
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    if request.content_type == "multipart/form-data" or (limit is not None and length > limit):
+        digest.update(f"{request.content_type} {length}".encode())
+    else:
+        digest.update(request.body)
+    return digest.hexdigest()
+
+
+class IdempotencyMiddleware:
+    """Store the first response of each keyed POST and replay it on retries."""
+
+    def __init__(self, get_response):
+        self.ttl = getattr(settings, "IDEMPOTENCY_TTL", 0)
+        if self.ttl <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.excluded_paths = tuple(getattr(settings, "IDEMPOTENCY_EXCLUDED_PATHS", ()))
+
+    def __call__(self, request):
+        key = request.META.get(KEY_HEADER)
+        if request.method != "POST" or not key or request.path.startswith(self.excluded_paths):
+            return self.get_response(request)
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse(
+                {"detail": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters."},
+                status=400,
+            )
+
+        scope = f"{_caller(request)}\n{key}"
+        cache_key = CACHE_PREFIX + hashlib.sha256(scope.encode()).hexdigest()
+        fingerprint = request_fingerprint(request)
+        stored = cache.get(cache_key)
+        if stored is None:
+            pending = {"state": _PENDING, "fingerprint": fingerprint}
+            if cache.add(cache_key, pending, timeout=IN_FLIGHT_TIMEOUT):
+                return self.execute(request, cache_key, fingerprint)
+            stored = cache.get(cache_key) or pending
+
+        if stored["fingerprint"] != fingerprint:
+            return JsonResponse(
+                {"detail": "Idempotency-Key was already used for a different request."}, status=422
+            )
+        if stored["state"] == _PENDING:
+            return JsonResponse(
+                {"detail": "A request with this Idempotency-Key is still in progress."}, status=409
+            )
+        return self.replay(stored)
+
+    def execute(self, request, cache_key, fingerprint):
+        """Run the view and store its response for later retries."""
+
+        try:
+            response = self.get_response(request)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+        if (
+            response.streaming
+            or response.status_code >= 500
+            or response.status_code == 429
+            or carries_credentials(response)
+        ):
+            cache.delete(cache_key)
+            return response
+        cache.set(
+            cache_key,
+            {
+                "state": _DONE,
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "headers": {
+                    name: response[name]
+                    for name in REPLAYED_RESPONSE_HEADERS
+                    if response.has_header(name)
+                },
+                "content": response.content,
+            },
+            timeout=self.ttl,
+        )
+        return response
+
+    @staticmethod
+    def replay(stored):
+        """Rebuild the stored response."""
+
+        response = HttpResponse(stored["content"], status=stored["status"])
+        for name, value in stored["headers"].items():
+            response[name] = value
+        response[REPLAYED_HEADER] = "true"
+        return response
@@ -0,0 +1,59 @@
+"""Archive conversations that have been inactive for a number of months.
+
+Usage:
+  python manage.py archive_conversations --months 6
+
+Each qualifying thread is packed into one compressed ``ConversationArchive``
+row and its messages (with their attachment and read receipt rows) are removed
+from the hot tables. Posting a new message rehydrates the thread.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.utils import timezone
+
+from api.models import Conversation
+from api.utils.archive import archive_conversation
+
+
+class Command(BaseCommand):
+    """Pack cold conversation threads into compressed archive rows."""
+
+    help = "Archive conversations without messages for the given number of months."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--months", type=int, default=6)
+        parser.add_argument("--limit", type=int, default=None, help="Archive at most N threads.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["months"] < 1:
+            raise CommandError("--months must be at least 1.")
+
+        cutoff = timezone.now() - timedelta(days=30 * options["months"])
+        candidates = (
+            Conversation.objects.filter(is_archived=False)
+            .annotate(last_message_at=Max("messages__created_at"))
+            .filter(last_message_at__lt=cutoff)
+            .order_by("last_message_at")
+        )
+        if options["limit"]:
+            candidates = candidates[: options["limit"]]
+
+        archived = messages = 0
+        for conversation in candidates.iterator(chunk_size=100):
+            if options["dry_run"]:
+                self.stdout.write(f"Would archive {conversation.pk}")
+                continue
+            # The thread may have received a message since it was selected.
+            count = archive_conversation(conversation, cutoff=cutoff)
+            messages += count
+            archived += bool(count)
+
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Archived {archived} conversations ({messages} messages)."
+            )
+        )
@@ -0,0 +1,92 @@
+"""Measure the per-request cost of opening database connections.
+
+Usage:
+  python manage.py bench_connections --requests 500
+
+Each simulated request fires Django's ``request_started``/``request_finished``
+signals around a trivial query, exactly like a real request handled by a
+gunicorn worker. The run is repeated with ``CONN_MAX_AGE=0`` (a new connection
+per request) and with the configured persistent-connection settings.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+
+def run_requests(alias, count, conn_max_age):
+    """Simulate ``count`` requests on ``alias`` and return per-request timings.
+
+    Args:
+        alias (str): Database alias to benchmark.
+        count (int): Number of simulated requests.
+        conn_max_age (int | None): ``CONN_MAX_AGE`` to apply during the run.
+
+    Returns:
+        list[float]: Wall-clock duration of each request in seconds.
+    """
+
+    connection = connections[alias]
+    original = connection.settings_dict.get("CONN_MAX_AGE", 0)
+    connection.close()
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    timings = []
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            request_started.send(sender=None)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            request_finished.send(sender=None)
+            timings.append(time.perf_counter() - started)
+    finally:
+        connection.settings_dict["CONN_MAX_AGE"] = original
+        connection.close()
+    return timings
+
+
+def summarize(timings):
+    """Return mean and p95 latency in milliseconds for a list of timings."""
+
+    ordered = sorted(timings)
+    mean = sum(ordered) / len(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return mean * 1000, p95 * 1000
+
+
+class Command(BaseCommand):
+    """Compare per-request connection setup against persistent connections."""
+
+    help = "Benchmark per-request database connection cost."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        count = max(1, options["requests"])
+        configured = connections[alias].settings_dict.get("CONN_MAX_AGE", 0)
+        persistent = configured if configured != 0 else 60
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(  # pylint: disable=no-member
+                f"Benchmarking {count} requests on '{alias}' "
+                f"({connections[alias].vendor})..."
+            )
+        )
+        results = {}
+        for label, max_age in (("per-request", 0), (f"persistent ({persistent})", persistent)):
+            mean, p95 = summarize(run_requests(alias, count, max_age))
+            results[label] = mean
+            self.stdout.write(f"{label:<24} mean {mean:8.3f} ms   p95 {p95:8.3f} ms")
+
+        per_request, persistent_mean = results.values()
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Saved per request: {per_request - persistent_mean:.3f} ms"
+            )
+        )
@@ -0,0 +1,61 @@
+"""Report password hashing throughput per CPU core.
+
+Usage:
+  python manage.py bench_hashers --seconds 3
+
+Every hasher listed in ``PASSWORD_HASHERS`` whose library is installed is timed
+on a single core. Login throughput is bounded by these numbers: one login costs
+one verification, so ``hashes/sec * cores`` approximates the login capacity of
+a worker pool.
+"""
+
+import os
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+def measure(hasher, seconds):
+    """Return how many hashes ``hasher`` computes per second on one core."""
+
+    salt = hasher.salt()
+    hasher.encode("benchmark-password", salt)  # Warm up (library loading, caches).
+    count = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        hasher.encode("benchmark-password", salt)
+        count += 1
+        elapsed = time.perf_counter() - started
+    return count / elapsed
+
+
+class Command(BaseCommand):
+    """Benchmark the configured password hashers."""
+
+    help = "Report hashes/sec per core for each configured password hasher."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=2.0, help="Time spent per hasher.")
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(  # pylint: disable=no-member
+                f"Hashing throughput ({cores} cores available)"
+            )
+        )
+        for index, hasher in enumerate(get_hashers()):
+            label = f"{type(hasher).__name__} ({hasher.algorithm})"
+            if index == 0:
+                label += " [preferred]"
+            try:
+                rate = measure(hasher, options["seconds"])
+            except ValueError as exc:  # Hasher library (e.g. argon2-cffi) not installed.
+                self.stdout.write(f"{label:<60} skipped: {exc}")
+                continue
+            self.stdout.write(
+                f"{label:<60} {rate:10.1f} hashes/s/core  "
+                f"{rate * cores:10.1f} hashes/s total  {1000 / rate:8.2f} ms/hash"
+            )
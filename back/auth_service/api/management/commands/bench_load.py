@@ -0,0 +1,433 @@
+"""Load-test the hot API paths against a running gunicorn.
+
+Usage:
+  python manage.py bench_load --seed-scale 10 --start-server --workers 4 \\
+      --concurrency 1,8,32 --requests 400 --output bench/load.json
+  python manage.py bench_load --base-url http://localhost:8001 --compare bench/load.json
+
+Fixture users are read from the local database (``manage.py seed`` creates
+company users sharing the ``password123`` password, ``--seed-scale`` runs it
+first with every count multiplied). Each user logs in once before the run; the
+scenarios then reuse those access tokens with ``--concurrency`` client threads.
+
+For every scenario and concurrency level the command reports requests/sec,
+p50/p95/p99 latency and queries per request. Query counts come from the
+``X-Query-Count`` header, so the server must run with ``QUERY_COUNT_HEADER=1``;
+``--start-server`` sets it, along with throttle rates high enough for the login
+scenario. Results are written as JSON so that runs can be compared across
+commits with ``--compare``.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Athlete, ConversationParticipant
+from core.query_count import QUERY_COUNT_HEADER
+
+SEED_PASSWORD = "password123"
+# Base counts of ``manage.py seed``; --seed-scale multiplies each of them.
+SEED_COUNTS = {"athletes": 24, "companies": 10, "events": 120, "messages": 200}
+# Rates applied to a server started with --start-server so throttles stay out of the numbers.
+UNTHROTTLED_RATE = "1000000/min"
+
+
+def _login(session, base_url, email, password):
+    return session.post(
+        f"{base_url}/api/auth/login/",
+        json={"email": email, "password": password},
+    )
+
+
+def scenario_login(session, base_url, fixture, iteration):
+    """Obtain a token pair (bounded by the password hasher)."""
+
+    return _login(session, base_url, fixture["email"], fixture["password"])
+
+
+def scenario_athlete_list(session, base_url, fixture, iteration):
+    """Fetch the first page of the athlete listing."""
+
+    return session.get(f"{base_url}/api/athletes/", headers=fixture["headers"])
+
+
+def scenario_athlete_detail(session, base_url, fixture, iteration):
+    """Fetch one athlete profile, cycling through the seeded athletes."""
+
+    athlete = fixture["athletes"][iteration % len(fixture["athletes"])]
+    return session.get(f"{base_url}/api/athletes/{athlete}/", headers=fixture["headers"])
+
+
+def scenario_follow_unfollow(session, base_url, fixture, iteration):
+    """Alternate following and unfollowing the same athlete."""
+
+    athlete = fixture["athletes"][(iteration // 2) % len(fixture["athletes"])]
+    if iteration % 2 == 0:
+        return session.post(
+            f"{base_url}/api/follows/", json={"athlete": athlete}, headers=fixture["headers"]
+        )
+    return session.delete(
+        f"{base_url}/api/follows/by-athlete/{athlete}/", headers=fixture["headers"]
+    )
+
+
+def scenario_inbox(session, base_url, fixture, iteration):
+    """List the conversations of the authenticated user."""
+
+    return session.get(f"{base_url}/api/conversations/", headers=fixture["headers"])
+
+
+def scenario_message_send(session, base_url, fixture, iteration):
+    """Post a message into one of the user's conversations."""
+
+    return session.post(
+        f"{base_url}/api/messages/",
+        json={
+            "conversation": fixture["conversation"],
+            "sender": fixture["user_id"],
+            "text": f"Benchmark message {iteration}",
+        },
+        headers=fixture["headers"],
+    )
+
+
+def scenario_feed(session, base_url, fixture, iteration):
+    """Fetch the first page of the activity feed."""
+
+    return session.get(f"{base_url}/api/activities/", headers=fixture["headers"])
+
+
+SCENARIOS = {
+    "login": scenario_login,
+    "athlete_list": scenario_athlete_list,
+    "athlete_detail": scenario_athlete_detail,
+    "follow_unfollow": scenario_follow_unfollow,
+    "inbox": scenario_inbox,
+    "message_send": scenario_message_send,
+    "feed": scenario_feed,
+}
+
+
+def load_fixtures(password, limit):
+    """Return one fixture per seeded user that takes part in a conversation.
+
+    Args:
+        password (str): Password shared by the seeded users.
+        limit (int): Maximum number of users to return.
+
+    Returns:
+        list[dict]: Credentials, a conversation identifier and the athlete ids.
+    """
+
+    athletes = [str(pk) for pk in Athlete.objects.order_by("pk").values_list("pk", flat=True)[:500]]
+    fixtures = {}
+    participants = (
+        ConversationParticipant.objects.filter(user__company_profile__isnull=False)
+        .select_related("user")
+        .order_by("user__email")
+    )
+    for participant in participants.iterator():
+        if participant.user_id in fixtures:
+            continue
+        fixtures[participant.user_id] = {
+            "email": participant.user.email,
+            "password": password,
+            "user_id": str(participant.user_id),
+            "conversation": str(participant.conversation_id),
+            "athletes": athletes,
+            "headers": {},
+        }
+        if len(fixtures) >= limit:
+            break
+    return list(fixtures.values())
+
+
+def authenticate(base_url, fixtures):
+    """Log every fixture user in once and store its bearer header."""
+
+    with requests.Session() as session:
+        for fixture in fixtures:
+            response = _login(session, base_url, fixture["email"], fixture["password"])
+            if response.status_code != 200:
+                raise CommandError(
+                    f"Login failed for {fixture['email']} ({response.status_code}): "
+                    f"{response.text[:200]}"
+                )
+            fixture["headers"] = {"Authorization": f"Bearer {response.json()['access']}"}
+
+
+def percentile(ordered, pct):
+    """Return the nearest-rank percentile of an already sorted list."""
+
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    """Aggregate ``(latency, status, queries)`` samples into a result row.
+
+    Args:
+        samples (list[tuple[float, int, int | None]]): One entry per request.
+        elapsed (float): Wall-clock duration of the run in seconds.
+
+    Returns:
+        dict: Request and error counts, RPS, latency percentiles in milliseconds
+        and the mean number of queries per request (``None`` when the server
+        does not send ``X-Query-Count``).
+    """
+
+    latencies = sorted(latency * 1000 for latency, _, _ in samples)
+    errors = sum(1 for _, status_code, _ in samples if status_code >= 400)
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / elapsed, 2) if elapsed > 0 else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99), 2) if latencies else None,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def run_scenario(  # pylint: disable=too-many-locals
+    base_url, scenario, fixtures, concurrency, total
+):
+    """Issue ``total`` requests of ``scenario`` from ``concurrency`` threads.
+
+    Args:
+        base_url (str): Root URL of the server under test.
+        scenario (Callable): One of the ``SCENARIOS`` request functions.
+        fixtures (list[dict]): Authenticated users, assigned to threads round-robin.
+        concurrency (int): Number of client threads.
+        total (int): Number of requests across all threads.
+
+    Returns:
+        dict: The :func:`summarize` row for the run.
+    """
+
+    samples = []
+    lock = threading.Lock()
+
+    def worker(index):
+        fixture = fixtures[index % len(fixtures)]
+        local = []
+        with requests.Session() as session:
+            for iteration in range(index, total, concurrency):
+                started = time.perf_counter()
+                try:
+                    response = scenario(session, base_url, fixture, iteration)
+                except requests.RequestException:
+                    local.append((time.perf_counter() - started, 599, None))
+                    continue
+                latency = time.perf_counter() - started
+                header = response.headers.get(QUERY_COUNT_HEADER)
+                local.append((latency, response.status_code, int(header) if header else None))
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(samples, time.perf_counter() - started)
+
+
+def _wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def start_server(port, workers):
+    """Start gunicorn on ``127.0.0.1:port`` with query counting and no throttling."""
+
+    env = dict(
+        os.environ,
+        QUERY_COUNT_HEADER="1",
+        THROTTLE_LOGIN_RATE=UNTHROTTLED_RATE,
+        THROTTLE_PASSWORD_RESET_RATE=UNTHROTTLED_RATE,
+        THROTTLE_REGISTER_RATE=UNTHROTTLED_RATE,
+    )
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable, "-m", "gunicorn",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "core.wsgi:application",
+        ],
+        cwd=settings.BASE_DIR,
+        env=env,
+    )
+    if not _wait_for_port("127.0.0.1", port, timeout=30):
+        process.terminate()
+        raise CommandError(f"gunicorn did not start listening on port {port}.")
+    return process
+
+
+def current_commit():
+    """Return the checked-out git commit, or ``None`` outside a git checkout."""
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_list(value, allowed=None):
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    if allowed is not None:
+        unknown = sorted(set(items) - set(allowed))
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}")
+    return items
+
+
+class Command(BaseCommand):
+    """Drive the hot API endpoints with concurrent clients and save the results."""
+
+    help = "Load-test login, athletes, follows, inbox, messages and feed endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+        parser.add_argument(
+            "--start-server",
+            action="store_true",
+            help="Start a local gunicorn (on the --base-url port) for the duration of the run.",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--seed-scale",
+            type=int,
+            default=0,
+            help="Run `seed` first with every default count multiplied by this factor.",
+        )
+        parser.add_argument(
+            "--users", type=int, default=50, help="Maximum number of fixture users."
+        )
+        parser.add_argument("--password", default=SEED_PASSWORD)
+        parser.add_argument(
+            "--concurrency", default="1,8,32", help="Comma separated client thread counts."
+        )
+        parser.add_argument(
+            "--requests", type=int, default=400, help="Requests per scenario and level."
+        )
+        parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+        parser.add_argument(
+            "--output", default="bench_load.json", help="Where to write the JSON results."
+        )
+        parser.add_argument("--compare", help="Previous JSON results to diff RPS and p95 against.")
+
+    def handle(self, *args, **options):
+        scenarios = _parse_list(options["scenarios"], allowed=SCENARIOS)
+        levels = [max(1, int(level)) for level in _parse_list(options["concurrency"])]
+        base_url = options["base_url"].rstrip("/")
+
+        if options["seed_scale"] > 0:
+            counts = {key: value * options["seed_scale"] for key, value in SEED_COUNTS.items()}
+            call_command("seed", **counts, stdout=self.stdout)
+
+        fixtures = load_fixtures(options["password"], options["users"])
+        if not fixtures or not fixtures[0]["athletes"]:
+            raise CommandError(
+                "No seeded users with conversations found; run with --seed-scale 1 or more."
+            )
+
+        server = None
+        if options["start_server"]:
+            port = int(base_url.rsplit(":", 1)[-1].split("/")[0])
+            server = start_server(port, options["workers"])
+        try:
+            authenticate(base_url, fixtures)
+            results = self.run(base_url, scenarios, levels, fixtures, options["requests"])
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        report = {
+            "commit": current_commit(),
+            "created_at": datetime.now(dt_timezone.utc).isoformat(),
+            "base_url": base_url,
+            "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+            "users": len(fixtures),
+            "requests": options["requests"],
+            "results": results,
+        }
+        output = Path(options["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        self.stdout.write(
+            self.style.SUCCESS(f"Results written to {output}")  # pylint: disable=no-member
+        )
+
+        if options["compare"]:
+            self.compare(results, json.loads(Path(options["compare"]).read_text(encoding="utf-8")))
+
+    def run(self, base_url, scenarios, levels, fixtures, total):
+        """Run every scenario at every concurrency level and print a table row for each."""
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(  # pylint: disable=no-member
+                f"{'scenario':<16}{'conc':>5}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}"
+                f"{'q/req':>7}{'errors':>8}"
+            )
+        )
+        results = {}
+        for name in scenarios:
+            results[name] = {}
+            for level in levels:
+                row = run_scenario(base_url, SCENARIOS[name], fixtures, level, total)
+                results[name][str(level)] = row
+                queries = row["queries_per_request"]
+                self.stdout.write(
+                    f"{name:<16}{level:>5}{row['rps'] or 0:>10.1f}{row['p50_ms'] or 0:>9.1f}"
+                    f"{row['p95_ms'] or 0:>9.1f}{row['p99_ms'] or 0:>9.1f}"
+                    f"{'-' if queries is None else queries:>7}{row['errors']:>8}"
+                )
+        return results
+
+    def compare(self, results, baseline):
+        """Print RPS and p95 changes relative to a previous run."""
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(  # pylint: disable=no-member
+                f"Compared with {(baseline.get('commit') or 'unknown')[:12]}"
+            )
+        )
+        for name, levels in results.items():
+            for level, row in levels.items():
+                previous = baseline.get("results", {}).get(name, {}).get(level)
+                if not previous or not previous.get("rps") or not previous.get("p95_ms"):
+                    continue
+                rps_delta = (row["rps"] - previous["rps"]) / previous["rps"] * 100
+                p95_delta = (row["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+                self.stdout.write(
+                    f"{name:<16}{level:>5}  rps {rps_delta:+7.1f}%  p95 {p95_delta:+7.1f}%"
+                )
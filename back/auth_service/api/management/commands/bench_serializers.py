@@ -0,0 +1,328 @@
+"""Micro-benchmark the list serializers and the main querysets.
+
+Usage:
+  python manage.py bench_serializers --sizes 1000,10000 --save bench/serializers.json
+  python manage.py bench_serializers --compare bench/serializers.json --threshold 15
+
+A synthetic dataset (users, athletes with galleries, follows and activity
+events) is bulk-created inside a transaction that is rolled back at the end, so
+the run needs nothing but the local SQLite database and leaves it untouched.
+
+Each benchmark is called once to warm up and then timed over ``--rounds``
+rounds; min/median/mean/max are reported in milliseconds, like
+pytest-benchmark. ``--compare`` fails with a non-zero exit status when a
+benchmark's median is more than ``--threshold`` percent slower than in the
+stored baseline.
+"""
+
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.fast_serializers import (
+    ActivityEventListSerializer,
+    AthleteListSerializer,
+    UserListSerializer,
+)
+from api.models import (
+    ActivityEvent,
+    Athlete,
+    AthleteFollow,
+    AthleteImage,
+    MediaAsset,
+    User,
+)
+from api.serializers import ActivityEventSerializer, AthleteSerializer, UserSerializer
+
+# Statistic compared against the baseline; the median is least sensitive to outliers.
+GATE_STAT = "median_ms"
+
+
+def build_dataset(size):
+    """Bulk-create ``size`` users, athletes and activity events.
+
+    Every athlete gets a three-image gallery and one follower, and every event
+    references one image, so the serializers exercise their related fields.
+
+    Returns:
+        User: A user following part of the athletes, used for ``is_followed``.
+    """
+
+    password = make_password("benchmark-password")
+    now = timezone.now()
+    users = User.objects.bulk_create(
+        [
+            User(
+                email=f"bench-{index}@example.com",
+                first_name="Bench",
+                last_name=f"User {index}",
+                phone_country_code="+33",
+                phone_number=f"06{index:08d}",
+                date_of_birth=date(1990, 1, 1) + timedelta(days=index % 7000),
+                language="fr",
+                currency="EUR",
+                timezone="Europe/Paris",
+                is_active=True,
+                is_verified=True,
+                last_login=now,
+                password=password,
+            )
+            for index in range(size)
+        ]
+    )
+    athletes = Athlete.objects.bulk_create(
+        [
+            Athlete(
+                name=f"Athlete {index}",
+                location="Paris, France",
+                category="Judo",
+                price=Decimal("5500.00") + index,
+                is_carousel=index % 2 == 0,
+                profile_url=f"/athletes/bench-{index}",
+                certified=index % 3 == 0,
+                bio="Benchmark athlete",
+                level="PRO",
+                nationality="France",
+                date_of_birth=date(1995, 6, 15) - timedelta(days=index % 5000),
+                subscribers_facebook=index * 10,
+                subscribers_instagram=index * 20,
+                subscribers_youtube=index * 5,
+            )
+            for index in range(size)
+        ]
+    )
+    media = MediaAsset.objects.bulk_create(
+        [MediaAsset(url=f"/images/bench-{index}.jpg", alt_text="Benchmark") for index in range(30)]
+    )
+    AthleteImage.objects.bulk_create(
+        [
+            AthleteImage(athlete=athlete, media=media[(index + order) % len(media)], order=order)
+            for index, athlete in enumerate(athletes)
+            for order in range(3)
+        ]
+    )
+    AthleteFollow.objects.bulk_create(
+        [AthleteFollow(user=user, athlete=athlete) for user, athlete in zip(users, athletes)]
+    )
+    events = ActivityEvent.objects.bulk_create(
+        [
+            ActivityEvent(
+                athlete=athletes[index % len(athletes)],
+                type="competition",
+                text="Benchmark event",
+                platform="instagram",
+                happened_at=now - timedelta(hours=index),
+                competition_title="Open",
+                competition_location="Paris",
+                competition_date=(now - timedelta(hours=index)).date(),
+                competition_result="Finale",
+            )
+            for index in range(size)
+        ]
+    )
+    ActivityEvent.images.through.objects.bulk_create(
+        [
+            ActivityEvent.images.through(
+                activityevent_id=event.pk, mediaasset_id=media[index % len(media)].pk
+            )
+            for index, event in enumerate(events)
+        ]
+    )
+    return users[0]
+
+
+def timed(func, rounds):
+    """Call ``func`` once to warm up, then time it over ``rounds`` rounds.
+
+    Returns:
+        dict: ``min_ms``, ``median_ms``, ``mean_ms`` and ``max_ms``.
+    """
+
+    func()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def benchmarks(sizes, viewer):
+    """Return ``{name: callable}`` for every serializer and queryset benchmark.
+
+    Serializer benchmarks render objects that are loaded (with their related
+    rows prefetched) before timing starts, so they measure rendering only. The
+    ``fast_serialize_*`` cases render preloaded ``.values()`` rows through
+    :mod:`api.fast_serializers`, including the per-page related-row lookup.
+    Queryset benchmarks measure fetching the rows the list endpoints need.
+    """
+
+    largest = max(sizes)
+    athletes = list(Athlete.objects.for_listing(viewer).order_by("name")[:largest])
+    users = list(User.objects.order_by("email")[:largest])
+    events = list(
+        ActivityEvent.objects.prefetch_related("images").order_by("-happened_at")[:largest]
+    )
+    fast_athletes = AthleteListSerializer(context={"request": None})
+    fast_users = UserListSerializer()
+    fast_events = ActivityEventListSerializer()
+    athlete_rows = list(
+        fast_athletes.values(Athlete.objects.for_listing(viewer).order_by("name")[:largest])
+    )
+    user_rows = list(fast_users.values(User.objects.order_by("email")[:largest]))
+    event_rows = list(fast_events.values(ActivityEvent.objects.order_by("-happened_at")[:largest]))
+
+    cases = {}
+    for size in sizes:
+        cases[f"serialize_athletes_{size}"] = (
+            lambda rows=athletes[:size]: AthleteSerializer(
+                rows, many=True, context={"request": None}
+            ).data
+        )
+        cases[f"serialize_users_{size}"] = (
+            lambda rows=users[:size]: UserSerializer(rows, many=True).data
+        )
+        cases[f"serialize_activity_events_{size}"] = (
+            lambda rows=events[:size]: ActivityEventSerializer(rows, many=True).data
+        )
+        cases[f"fast_serialize_athletes_{size}"] = (
+            lambda rows=athlete_rows[:size]: fast_athletes.render(rows)
+        )
+        cases[f"fast_serialize_users_{size}"] = (
+            lambda rows=user_rows[:size]: fast_users.render(rows)
+        )
+        cases[f"fast_serialize_activity_events_{size}"] = (
+            lambda rows=event_rows[:size]: fast_events.render(rows)
+        )
+
+    cases["queryset_athlete_list_page"] = (
+        lambda: list(Athlete.objects.for_listing(viewer).order_by("name")[:12])
+    )
+    cases["queryset_athlete_list_all"] = (
+        lambda: list(Athlete.objects.for_listing(viewer).order_by("name"))
+    )
+    cases["queryset_followed_athletes"] = lambda: list(
+        Athlete.objects.for_listing(viewer).filter(followed_by_user=True).order_by("name")
+    )
+    cases["queryset_user_list_page"] = lambda: list(User.objects.order_by("email")[:12])
+    cases["queryset_activity_feed_page"] = lambda: list(
+        ActivityEvent.objects.prefetch_related("images").order_by("-happened_at")[:12]
+    )
+    return cases
+
+
+def find_regressions(results, baseline, threshold):
+    """Return the benchmarks whose median grew by more than ``threshold`` percent.
+
+    Args:
+        results (dict): Current ``{name: stats}`` mapping.
+        baseline (dict): Stored ``{name: stats}`` mapping from an earlier run.
+        threshold (float): Allowed slowdown in percent.
+
+    Returns:
+        list[tuple[str, float, float, float]]: ``(name, baseline, current, change %)``
+        for each regressed benchmark. Benchmarks absent from either side are ignored.
+    """
+
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name, {}).get(GATE_STAT)
+        if not previous:
+            continue
+        change = (stats[GATE_STAT] - previous) / previous * 100
+        if change > threshold:
+            regressions.append((name, previous, stats[GATE_STAT], change))
+    return regressions
+
+
+class Command(BaseCommand):
+    """Time the serializers and querysets behind the list endpoints."""
+
+    help = "Micro-benchmark list serializers and querysets, optionally gating on a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000", help="Comma separated object counts.")
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument(
+            "--filter", default="", help="Only run benchmarks whose name contains this text."
+        )
+        parser.add_argument("--save", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Baseline JSON file written by an earlier --save.")
+        parser.add_argument(
+            "--threshold", type=float, default=10.0, help="Allowed slowdown in percent."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options["sizes"].split(",") if size.strip()})
+        except ValueError as exc:
+            raise CommandError(f"Invalid --sizes: {options['sizes']}") from exc
+        if not sizes or sizes[0] < 1:
+            raise CommandError("--sizes must list positive integers.")
+        rounds = max(1, options["rounds"])
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(  # pylint: disable=no-member
+                f"Building a {sizes[-1]}-row dataset on {connection.vendor}..."
+            )
+        )
+        results = {}
+        with transaction.atomic():
+            viewer = build_dataset(sizes[-1])
+            for name, func in benchmarks(sizes, viewer).items():
+                if options["filter"] not in name:
+                    continue
+                results[name] = timed(func, rounds)
+                stats = results[name]
+                self.stdout.write(
+                    f"{name:<40} min {stats['min_ms']:10.2f}  median {stats['median_ms']:10.2f}  "
+                    f"mean {stats['mean_ms']:10.2f}  max {stats['max_ms']:10.2f} ms"
+                )
+            transaction.set_rollback(True)
+
+        if options["save"]:
+            path = Path(options["save"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                "created_at": datetime.now(dt_timezone.utc).isoformat(),
+                "database": connection.vendor,
+                "rounds": rounds,
+                "benchmarks": results,
+            }
+            path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            self.stdout.write(
+                self.style.SUCCESS(f"Results written to {path}")  # pylint: disable=no-member
+            )
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+            regressions = find_regressions(
+                results, baseline.get("benchmarks", {}), options["threshold"]
+            )
+            for name, previous, current, change in regressions:
+                self.stderr.write(
+                    f"{name:<40} {previous:10.2f} -> {current:10.2f} ms ({change:+.1f}%)"
+                )
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} benchmark(s) regressed by more than "
+                    f"{options['threshold']}%."
+                )
+            self.stdout.write(
+                self.style.SUCCESS(  # pylint: disable=no-member
+                    "No regression against the baseline."
+                )
+            )
@@ -0,0 +1,136 @@
+"""Maintain time partitions and retention for messages and activity events.
+
+Usage:
+  python manage.py maintain_partitions --ahead 3 --retain-months 24
+  python manage.py maintain_partitions --retain-months 24 --archive-dir /backups/archive
+
+On PostgreSQL, tables that are range partitioned get their next ``--ahead``
+monthly partitions created and partitions older than ``--retain-months``
+detached (the detached tables are kept as the archive unless ``--drop`` is
+given). Tables that are not partitioned, including every table on SQLite, fall
+back to a plain retention mode: old rows are optionally written to a gzipped
+NDJSON archive and deleted in small batches.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import ActivityEvent, Message
+from api.utils.partitioning import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition_sql,
+    detach_partition_sql,
+    is_partitioned,
+    list_partitions,
+    month_start,
+)
+
+MODELS = {model._meta.db_table: model for model in (Message, ActivityEvent)}
+
+
+class Command(BaseCommand):
+    """Create upcoming partitions and expire old data."""
+
+    help = "Create future partitions and detach, archive or purge old message/activity data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=3, help="Future months to pre-create.")
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            default=None,
+            help="Keep this many months of data; older data is detached or purged.",
+        )
+        parser.add_argument("--archive-dir", default=None, help="Write purged rows here first.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--drop", action="store_true", help="Drop detached partitions.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["retain_months"] is not None and options["retain_months"] < 1:
+            raise CommandError("--retain-months must be at least 1.")
+
+        current = month_start(timezone.now())
+        for table, column in PARTITIONED_TABLES.items():
+            if is_partitioned(table):
+                self.maintain_partitioned(table, current, options)
+            elif options["retain_months"] is not None:
+                self.purge(table, column, add_months(current, -options["retain_months"]), options)
+            else:
+                self.stdout.write(f"{table}: not partitioned, no retention requested.")
+
+        self.stdout.write(
+            self.style.SUCCESS("Partition maintenance completed.")  # pylint: disable=no-member
+        )
+
+    def run_sql(self, sql, dry_run):
+        """Execute ``sql`` unless running in dry-run mode."""
+
+        self.stdout.write(f"  {sql};")
+        if not dry_run:
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+
+    def maintain_partitioned(self, table, current, options):
+        """Create future monthly partitions and detach expired ones."""
+
+        self.stdout.write(f"{table}: partitioned")
+        for offset in range(options["ahead"] + 1):
+            self.run_sql(
+                create_partition_sql(table, add_months(current, offset)), options["dry_run"]
+            )
+
+        if options["retain_months"] is None:
+            return
+        cutoff = add_months(current, -options["retain_months"])
+        for child, month in list_partitions(table):
+            if month >= cutoff:
+                continue
+            self.run_sql(detach_partition_sql(table, child), options["dry_run"])
+            if options["drop"]:
+                self.run_sql(f"DROP TABLE {connection.ops.quote_name(child)}", options["dry_run"])
+
+    def purge(self, table, column, cutoff, options):
+        """Archive then delete rows older than ``cutoff`` in short batches."""
+
+        model = MODELS[table]
+        queryset = model.objects.filter(**{f"{column}__lt": cutoff}).order_by(column)
+        total = queryset.count()
+        self.stdout.write(f"{table}: {total} rows older than {cutoff:%Y-%m-%d}")
+        if not total or options["dry_run"]:
+            return
+
+        archive = None
+        if options["archive_dir"]:
+            directory = Path(options["archive_dir"])
+            directory.mkdir(parents=True, exist_ok=True)
+            path = (
+                directory / f"{table}-before-{cutoff:%Y%m}-{timezone.now():%Y%m%d%H%M%S}.ndjson.gz"
+            )
+            archive = gzip.open(path, "wt", encoding="utf-8")
+            self.stdout.write(f"  archiving to {path}")
+
+        deleted = 0
+        try:
+            while True:
+                rows = list(queryset.values()[: options["batch_size"]])
+                if not rows:
+                    break
+                if archive:
+                    for row in rows:
+                        archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+                # One short transaction per batch keeps row locks brief.
+                with transaction.atomic():
+                    model.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+                deleted += len(rows)
+                self.stdout.write(f"  deleted {deleted}/{total}")
+        finally:
+            if archive:
+                archive.close()
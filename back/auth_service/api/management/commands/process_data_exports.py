@@ -0,0 +1,82 @@
+"""Build queued right-of-access exports and purge expired ones.
+
+Usage:
+  python manage.py process_data_exports --limit 10
+
+Exports are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so several
+workers can run side by side. The worker building an export refreshes its
+``heartbeat_at`` after every dataset; an export left ``running`` by a worker
+that died is built again once its heartbeat is older than ``--stale-minutes``.
+Archives past their ``expires_at`` are deleted from disk together with their
+rows.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import DataExport
+from api.utils.export import build_export, delete_export_files
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Stream pending user data exports into ZIP archives."""
+
+    help = "Process pending data export requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Process at most N exports.")
+        parser.add_argument("--stale-minutes", type=int, default=30)
+        parser.add_argument("--retry-failed", action="store_true")
+
+    def handle(self, *args, **options):
+        statuses = ["pending", "failed"] if options["retry_failed"] else ["pending"]
+        stale = timezone.now() - timedelta(minutes=options["stale_minutes"])
+        claimable = Q(status__in=statuses) | Q(status="running", heartbeat_at__lt=stale)
+
+        done = failed = 0
+        seen = []
+        while options["limit"] is None or done + failed < options["limit"]:
+            with transaction.atomic():
+                export = (
+                    DataExport.objects.select_for_update(skip_locked=True, of=("self",))
+                    .filter(claimable)
+                    .exclude(pk__in=seen)
+                    .select_related("user")
+                    .first()
+                )
+                if export is None:
+                    break
+                seen.append(export.pk)
+                export.status = "running"
+                export.heartbeat_at = timezone.now()
+                export.save(update_fields=["status", "heartbeat_at"])
+
+            try:
+                build_export(export)
+                done += 1
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception("Data export %s failed", export.pk)
+                export.status = "failed"
+                export.last_error = str(exc)
+                export.save(update_fields=["status", "last_error"])
+                failed += 1
+
+        purged = 0
+        expired_exports = DataExport.objects.filter(status="ready", expires_at__lt=timezone.now())
+        for expired in expired_exports.iterator():
+            delete_export_files(expired)
+            expired.delete()
+            purged += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Built {done} data exports ({failed} failed), purged {purged} expired."
+            )
+        )
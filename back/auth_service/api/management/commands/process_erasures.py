@@ -0,0 +1,77 @@
+"""Work through queued right-to-erasure requests.
+
+Usage:
+  python manage.py process_erasures --batch-size 500 --limit 10
+
+Requests are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` so several
+workers can run side by side. The worker running a request refreshes its
+``heartbeat_at`` after every step; a request left ``running`` by a worker that
+died is picked up again once its heartbeat is older than ``--stale-minutes``,
+and the pipeline resumes from its recorded step.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import ErasureRequest
+from api.utils.erasure import process_erasure
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Erase queued accounts in bounded, resumable chunks."""
+
+    help = "Process pending right-to-erasure requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause", type=float, default=0, help="Seconds to sleep between batches."
+        )
+        parser.add_argument("--limit", type=int, default=None, help="Process at most N requests.")
+        parser.add_argument("--stale-minutes", type=int, default=30)
+        parser.add_argument("--retry-failed", action="store_true")
+
+    def handle(self, *args, **options):
+        statuses = ["pending", "failed"] if options["retry_failed"] else ["pending"]
+        stale = timezone.now() - timedelta(minutes=options["stale_minutes"])
+        claimable = Q(status__in=statuses) | Q(status="running", heartbeat_at__lt=stale)
+
+        done = failed = 0
+        seen = []
+        while options["limit"] is None or done + failed < options["limit"]:
+            with transaction.atomic():
+                erasure = (
+                    ErasureRequest.objects.select_for_update(skip_locked=True)
+                    .filter(claimable)
+                    .exclude(pk__in=seen)
+                    .first()
+                )
+                if erasure is None:
+                    break
+                seen.append(erasure.pk)
+                erasure.status = "running"
+                erasure.heartbeat_at = timezone.now()
+                erasure.save(update_fields=["status", "heartbeat_at"])
+
+            try:
+                process_erasure(erasure, batch_size=options["batch_size"], pause=options["pause"])
+                done += 1
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.exception("Erasure %s failed", erasure.pk)
+                erasure.status = "failed"
+                erasure.last_error = str(exc)
+                erasure.save(update_fields=["status", "last_error"])
+                failed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Processed {done} erasure requests ({failed} failed)."
+            )
+        )
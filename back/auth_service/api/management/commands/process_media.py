@@ -0,0 +1,92 @@
+"""Build responsive WebP derivatives for uploaded media assets.
+
+Usage:
+  python manage.py process_media --workers 4
+  python manage.py process_media --ingest-root ../../front/public
+
+Pending uploads are resized on a thread pool of ``--workers`` threads
+(``MEDIA_WORKERS`` by default). ``--ingest-root`` first adopts external assets
+whose URL is a path under that directory, such as the seeded ``/images/...``
+files: they are hashed, stored as originals and merged with any asset that
+already holds the same bytes, then processed like uploads.
+
+Assets are claimed with a conditional ``UPDATE``. An asset left ``running`` by
+a worker that died is claimed again once it is older than ``--stale-minutes``.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import MediaAsset
+from api.utils.media import (
+    InvalidImage,
+    adopt_original,
+    claimable,
+    local_path,
+    process_pending,
+)
+
+CHUNK_SIZE = 200
+
+
+class Command(BaseCommand):
+    """Resize pending media assets into WebP derivatives."""
+
+    help = "Generate thumbnails and WebP derivatives for pending media assets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Number of resize threads.")
+        parser.add_argument("--limit", type=int, default=None, help="Process at most N assets.")
+        parser.add_argument("--stale-minutes", type=int, default=30)
+        parser.add_argument("--retry-failed", action="store_true")
+        parser.add_argument(
+            "--ingest-root", type=Path, default=None, help="Adopt external URLs found here."
+        )
+
+    def handle(self, *args, **options):
+        adopted = skipped = 0
+        root = options["ingest_root"]
+        if root is not None:
+            if not root.is_dir():
+                raise CommandError(f"{root} is not a directory.")
+            for asset in list(
+                MediaAsset.objects.filter(status="external").only("pk", "url", "alt_text")
+            ):
+                path = local_path(asset.url, root)
+                if path is None:
+                    continue
+                try:
+                    adopt_original(asset, path)
+                    adopted += 1
+                except InvalidImage as exc:
+                    self.stderr.write(f"Skipping {asset.url}: {exc}")
+                    skipped += 1
+
+        statuses = ("pending", "failed") if options["retry_failed"] else ("pending",)
+        stale = timezone.now() - timedelta(minutes=options["stale_minutes"])
+        queryset = (
+            MediaAsset.objects.filter(claimable(statuses, stale))
+            .order_by("created_at")
+            .values_list("pk", flat=True)
+        )
+        if options["limit"] is not None:
+            queryset = queryset[: options["limit"]]
+
+        done = failed = 0
+        ids = list(queryset)
+        for start in range(0, len(ids), CHUNK_SIZE):
+            ok, ko = process_pending(
+                ids[start : start + CHUNK_SIZE], statuses, options["workers"], stale
+            )
+            done += ok
+            failed += ko
+
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Adopted {adopted} external assets ({skipped} skipped), "
+                f"built derivatives for {done} ({failed} failed)."
+            )
+        )
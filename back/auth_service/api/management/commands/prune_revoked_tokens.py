@@ -0,0 +1,24 @@
+"""Delete revocation records of refresh tokens that have expired.
+
+Usage:
+  python manage.py prune_revoked_tokens --batch-size 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.tokens import prune_revoked_tokens
+
+
+class Command(BaseCommand):
+    """Keep the revoked token table limited to tokens that are still valid."""
+
+    help = "Prune revoked refresh tokens whose expiry has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = prune_revoked_tokens(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Pruned {deleted} revoked tokens.")  # pylint: disable=no-member
+        )
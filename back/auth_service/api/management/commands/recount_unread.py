@@ -0,0 +1,32 @@
+"""Rebuild the per-user unread totals from the participant counters.
+
+Usage:
+  python manage.py recount_unread
+  python manage.py recount_unread --email someone@example.com
+
+Totals are kept in step on every write; this repairs drift after bulk
+updates that bypass :mod:`api.utils.messaging`.
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.models import User
+from api.utils.messaging import recount_unread_totals
+
+
+class Command(BaseCommand):
+    """Recompute ``User.unread_total`` from ``ConversationParticipant.unread_count``."""
+
+    help = "Recount the unread message totals served by /api/inbox/unread/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--email", help="Only recount this user.")
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(email=options["email"]) if options["email"] else None
+        updated = recount_unread_totals(users)
+        self.stdout.write(
+            self.style.SUCCESS(  # pylint: disable=no-member
+                f"Recounted unread totals of {updated} users."
+            )
+        )
@@ -8,12 +8,14 @@ If counts are omitted, sensible defaults are used.
 
 import random
 from datetime import timedelta
+from functools import lru_cache
 
 try:  # pragma: no cover - dependency check for development utilities
     from faker import Faker
 except ImportError:  # pragma: no cover - avoid hard failure when Faker missing
     Faker = None  # type: ignore[misc]
 
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.utils.text import slugify
@@ -60,6 +62,13 @@ IMAGE_POOLS = [
 ]
 
 
+@lru_cache(maxsize=None)
+def seed_password_hash():
+    """Hash the shared demo password once so seeding does not pay it per user."""
+
+    return make_password("password123")
+
+
 def ensure_categories():
     """Ensure the reference sport categories exist with the right emoji."""
 
@@ -95,9 +104,9 @@ def create_company_users(n, fake: Faker):
                 "is_verified": True,
             },
         )
-        if not user.has_usable_password():
-            user.set_password("password123")
-            user.save()
+        if not user.password or not user.has_usable_password():
+            user.password = seed_password_hash()
+            user.save(update_fields=["password"])
         CompanyProfile.objects.get_or_create(
             user=user,
             defaults={
@@ -160,9 +169,6 @@ def create_athletes(n, fake: Faker):  # pylint: disable=too-many-locals
                 "subscribers_facebook": random.randint(5_000, 1_000_000),
                 "subscribers_instagram": random.randint(10_000, 5_000_000),
                 "subscribers_youtube": random.randint(1_000, 2_000_000),
-                "image1": images[0],
-                "image2": images[1],
-                "image3": images[2],
             },
         )
         # Link an auth user account for the athlete
@@ -181,9 +187,9 @@ def create_athletes(n, fake: Faker):  # pylint: disable=too-many-locals
                 "is_verified": True,
             },
         )
-        if not a_user.has_usable_password():
-            a_user.set_password("password123")
-            a_user.save()
+        if not a_user.password or not a_user.has_usable_password():
+            a_user.password = seed_password_hash()
+            a_user.save(update_fields=["password"])
         if not athlete.user:
             athlete.user = a_user
             athlete.save()
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.19 on 2026-10-19 11:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_athlete_nationality"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConversationArchive",
+            fields=[
+                (
+                    "conversation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="api.conversation",
+                    ),
+                ),
+                ("codec", models.CharField(default="gzip", max_length=10)),
+                ("payload", models.BinaryField()),
+                ("message_count", models.PositiveIntegerField(default=0)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="is_archived",
+            field=models.BooleanField(default=False),
+        ),
+    ]
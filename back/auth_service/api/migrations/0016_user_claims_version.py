@@ -0,0 +1,18 @@
+# Generated by Django 4.2.19 on 2026-10-19 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="claims_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.19 on 2026-10-19 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_user_claims_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="reset_password_token",
+            field=models.UUIDField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("verification_token__isnull", False)),
+                fields=["verification_token_expiry"],
+                name="user_verif_expiry_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("reset_password_token__isnull", False)),
+                fields=["reset_token_expiry"],
+                name="user_reset_expiry_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                condition=models.Q(("is_verified", False)),
+                fields=["date_joined"],
+                name="user_unverified_joined_idx",
+            ),
+        ),
+    ]
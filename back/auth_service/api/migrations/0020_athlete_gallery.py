@@ -0,0 +1,88 @@
+# Generated by Django 4.2.19 on 2026-10-19 11:57
+
+from django.db import migrations, models
+
+LEGACY_COLUMNS = ("image1", "image2", "image3")
+
+
+def backfill_gallery(apps, schema_editor):
+    """Copy the legacy image columns into ordered AthleteImage rows."""
+
+    db = schema_editor.connection.alias
+    Athlete = apps.get_model("api", "Athlete")
+    AthleteImage = apps.get_model("api", "AthleteImage")
+    MediaAsset = apps.get_model("api", "MediaAsset")
+
+    athletes = (
+        Athlete.objects.using(db)
+        .exclude(image1__isnull=True, image2__isnull=True, image3__isnull=True)
+        .values_list("pk", *LEGACY_COLUMNS)
+        .iterator(chunk_size=1000)
+    )
+    for athlete_id, *urls in athletes:
+        images = AthleteImage.objects.using(db).filter(athlete_id=athlete_id)
+        linked = set(images.values_list("media__url", flat=True))
+        next_order = images.count()
+        for url in urls:
+            if not url or url in linked:
+                continue
+            assets = MediaAsset.objects.using(db)
+            media = assets.filter(url=url).first() or assets.create(url=url)
+            AthleteImage.objects.using(db).create(athlete_id=athlete_id, media=media, order=next_order)
+            linked.add(url)
+            next_order += 1
+
+
+def restore_columns(apps, schema_editor):
+    """Fill the legacy columns back from the first three gallery images."""
+
+    db = schema_editor.connection.alias
+    Athlete = apps.get_model("api", "Athlete")
+    AthleteImage = apps.get_model("api", "AthleteImage")
+
+    for athlete in Athlete.objects.using(db).iterator(chunk_size=1000):
+        urls = list(
+            AthleteImage.objects.using(db)
+            .filter(athlete=athlete)
+            .order_by("order")
+            .values_list("media__url", flat=True)[:3]
+        )
+        if not urls:
+            continue
+        for column, url in zip(LEGACY_COLUMNS, urls):
+            setattr(athlete, column, url)
+        athlete.save(update_fields=list(LEGACY_COLUMNS[: len(urls)]))
+
+
+class Migration(migrations.Migration):
+
+    # The backfill inserts AthleteImage rows whose deferred FK checks would still be
+    # pending when the schema changes below run ("cannot ALTER TABLE ... because it has
+    # pending trigger events" on PostgreSQL), so it commits in its own transaction first.
+    atomic = False
+
+    dependencies = [
+        ("api", "0019_dataexport"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_gallery, restore_columns, atomic=True),
+        migrations.RemoveField(
+            model_name="athlete",
+            name="image1",
+        ),
+        migrations.RemoveField(
+            model_name="athlete",
+            name="image2",
+        ),
+        migrations.RemoveField(
+            model_name="athlete",
+            name="image3",
+        ),
+        migrations.AddIndex(
+            model_name="athleteimage",
+            index=models.Index(
+                fields=["athlete", "order"], name="api_athlete_athlete_67a6f7_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0020_athlete_gallery"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mediaasset",
+            name="content_hash",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="derivatives",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="last_error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="original",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("external", "External"),
+                    ("pending", "Pending"),
+                    ("running", "Running"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                default="external",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="mediaasset",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="mediaasset",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "failed"])),
+                fields=["status"],
+                name="media_unprocessed_idx",
+            ),
+        ),
+    ]
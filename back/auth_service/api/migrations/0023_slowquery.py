@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-19 12:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0022_profilecapture"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                ("fingerprint", models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ("alias", models.CharField(max_length=50)),
+                ("sql", models.TextField()),
+                ("calls", models.PositiveBigIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                ("last_view", models.CharField(blank=True, default="", max_length=200)),
+                ("last_frame", models.CharField(blank=True, default="", max_length=500)),
+                ("explain", models.TextField(blank=True, default="")),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("last_seen", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "ordering": ["-total_ms"],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.19 on 2026-10-19 14:40
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_totals(apps, schema_editor):
+    """Initialise every user's total from the existing participant counters."""
+
+    User = apps.get_model("api", "User")
+    ConversationParticipant = apps.get_model("api", "ConversationParticipant")
+    totals = (
+        ConversationParticipant.objects.filter(user=OuterRef("pk"))
+        .order_by()
+        .values("user")
+        .annotate(total=Sum("unread_count"))
+        .values("total")
+    )
+    db = schema_editor.connection.alias
+    User.objects.using(db).update(unread_total=Coalesce(Subquery(totals), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0024_conversation_last_message"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="unread_total",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_totals, migrations.RunPython.noop),
+    ]
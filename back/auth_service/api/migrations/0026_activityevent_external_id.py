@@ -0,0 +1,24 @@
+# Generated by Django 4.2.19 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0025_user_unread_total"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="activityevent",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="activityevent",
+            constraint=models.UniqueConstraint(
+                fields=("platform", "external_id"), name="activity_external_id_uniq"
+            ),
+        ),
+    ]
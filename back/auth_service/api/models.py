@@ -2,6 +2,7 @@
 
 import uuid
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now, timedelta
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -127,10 +128,16 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     # Password reset fields
     reset_password_token = models.UUIDField(
-        unique=False, editable=False, blank=True, null=True
+        unique=True, editable=False, blank=True, null=True
     )
     reset_token_expiry = models.DateTimeField(blank=True, null=True)
 
+    # Incremented whenever data copied into JWT claims changes.
+    claims_version = models.PositiveIntegerField(default=1)
+
+    # Sum of unread_count over the user's conversations, kept in step by api.utils.messaging.
+    unread_total = models.PositiveIntegerField(default=0)
+
     def get_token_expiry(self):
         """
         Returns a token expiration datetime (default: 1 day)
@@ -144,6 +151,27 @@ class User(AbstractBaseUser, PermissionsMixin):
     # Custom manager
     objects = CustomUserManager()
 
+    class Meta:
+        """Partial indexes backing the expired token sweeper."""
+
+        indexes = [
+            models.Index(
+                fields=["verification_token_expiry"],
+                name="user_verif_expiry_idx",
+                condition=models.Q(verification_token__isnull=False),
+            ),
+            models.Index(
+                fields=["reset_token_expiry"],
+                name="user_reset_expiry_idx",
+                condition=models.Q(reset_password_token__isnull=False),
+            ),
+            models.Index(
+                fields=["date_joined"],
+                name="user_unverified_joined_idx",
+                condition=models.Q(is_verified=False),
+            ),
+        ]
+
     # Email authentication
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = [
@@ -178,6 +206,172 @@ class User(AbstractBaseUser, PermissionsMixin):
         self.save()
 
 
+class RevokedToken(models.Model):
+    """Refresh token identifier revoked by rotation or logout.
+
+    Rows are only needed until the token would have expired anyway, after which
+    ``manage.py prune_revoked_tokens`` removes them.
+    """
+
+    jti = models.UUIDField(primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.jti} (until {self.expires_at})"
+
+
+class ErasureRequest(models.Model):
+    """Queued right-to-erasure job and its audit record.
+
+    The row outlives the account: ``subject_id`` and ``email_hash`` identify
+    who was erased without keeping personal data. ``process_erasures`` works
+    through the steps in ``api.utils.erasure`` and records progress here so an
+    interrupted job resumes where it stopped.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        "api.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="erasure_requests",
+    )
+    subject_id = models.UUIDField(db_index=True)
+    email_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    step = models.CharField(max_length=30, blank=True, default="")
+    progress = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    requested_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    # Refreshed when a worker claims the request and after every step.
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        """Workers pick the oldest unfinished requests first."""
+
+        ordering = ["requested_at"]
+        indexes = [models.Index(fields=["status", "requested_at"])]
+
+    def __str__(self):
+        return f"Erasure {self.subject_id} ({self.status})"
+
+
+class DataExport(models.Model):
+    """Right-of-access export of a user's data, built by ``process_data_exports``.
+
+    The archive is a ZIP of NDJSON files written under
+    ``settings.DATA_EXPORT_ROOT``; ``file_name`` is relative to that directory.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey("api.User", on_delete=models.CASCADE, related_name="data_exports")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    size = models.PositiveBigIntegerField(default=0)
+    row_counts = models.JSONField(default=dict, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    requested_at = models.DateTimeField(auto_now_add=True)
+    # Refreshed when a worker claims the export and after every dataset.
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        """Workers pick the oldest unfinished exports first."""
+
+        ordering = ["requested_at"]
+        indexes = [models.Index(fields=["status", "requested_at"])]
+
+    def __str__(self):
+        return f"Export {self.pk} ({self.status})"
+
+
+class ProfileCapture(models.Model):
+    """Profile of one request captured by :class:`api.profiling.ProfilingMiddleware`.
+
+    The profile itself is written under ``settings.PROFILING_ROOT``;
+    ``file_name`` is relative to that directory.
+    """
+
+    TRIGGER_CHOICES = [
+        ("header", "Header"),
+        ("sample", "Sample"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        "api.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="profile_captures",
+    )
+    view_name = models.CharField(max_length=200, blank=True, default="")
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    backend = models.CharField(max_length=20)
+    file_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        """Newest captures first."""
+
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.method} {self.view_name or self.path} ({self.duration_ms:.0f} ms)"
+
+
+class SlowQuery(models.Model):
+    """Aggregate of the slow executions of one normalized SQL statement.
+
+    Rows are keyed by the fingerprint computed in :mod:`api.slow_queries`;
+    ``explain`` holds the plan captured the first time the statement was slow.
+    """
+
+    fingerprint = models.CharField(max_length=40, primary_key=True)
+    alias = models.CharField(max_length=50)
+    sql = models.TextField()
+    calls = models.PositiveBigIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_view = models.CharField(max_length=200, blank=True, default="")
+    last_frame = models.CharField(max_length=500, blank=True, default="")
+    explain = models.TextField(blank=True, default="")
+    first_seen = models.DateTimeField(auto_now_add=True)
+    last_seen = models.DateTimeField(default=now)
+
+    class Meta:
+        """Most expensive statements first."""
+
+        ordering = ["-total_ms"]
+
+    def __str__(self):
+        return f"{self.fingerprint[:12]} ({self.calls} calls, max {self.max_ms:.0f} ms)"
+
+
 class Address(models.Model):
     """
     Address model compatible with Google Address API
@@ -257,6 +451,54 @@ class Address(models.Model):
         )
 
 
+class AthleteQuerySet(models.QuerySet):
+    """Query helpers for athlete listings."""
+
+    def for_listing(self, user=None):
+        """Annotate counters and prefetch the ordered gallery in one extra query.
+
+        Args:
+            user (User | None): Requesting user, used for ``is_followed``.
+
+        Returns:
+            AthleteQuerySet: Athletes carrying ``followers_total``,
+            ``recent_activity_total``, ``followed_by_user`` and ``gallery``.
+        """
+
+        since = now() - timedelta(days=7)
+        followers = (
+            AthleteFollow.objects.filter(athlete=models.OuterRef("pk"))
+            .order_by()
+            .values("athlete")
+            .annotate(total=models.Count("pk"))
+            .values("total")
+        )
+        activities = (
+            ActivityEvent.objects.filter(athlete=models.OuterRef("pk"), happened_at__gte=since)
+            .order_by()
+            .values("athlete")
+            .annotate(total=models.Count("pk"))
+            .values("total")
+        )
+        if user is not None and user.is_authenticated:
+            followed = models.Exists(
+                AthleteFollow.objects.filter(athlete=models.OuterRef("pk"), user=user)
+            )
+        else:
+            followed = models.Value(False)
+        return self.annotate(
+            followers_total=Coalesce(models.Subquery(followers), 0),
+            recent_activity_total=Coalesce(models.Subquery(activities), 0),
+            followed_by_user=followed,
+        ).prefetch_related(
+            models.Prefetch(
+                "media",
+                queryset=AthleteImage.objects.select_related("media").order_by("order"),
+                to_attr="gallery",
+            )
+        )
+
+
 class Athlete(models.Model):
     """
     Athlete model representing public athlete profiles.
@@ -288,14 +530,11 @@ class Athlete(models.Model):
     subscribers_instagram = models.PositiveIntegerField(default=0)
     subscribers_youtube = models.PositiveIntegerField(default=0)
 
-    # Images
-    image1 = models.CharField(max_length=255, blank=True, null=True)
-    image2 = models.CharField(max_length=255, blank=True, null=True)
-    image3 = models.CharField(max_length=255, blank=True, null=True)
-
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AthleteQuerySet.as_manager()
+
     def __str__(self):
         return str(self.name)
 
@@ -349,13 +588,47 @@ class SportCategory(models.Model):
 
 
 class MediaAsset(models.Model):
-    """Reusable media asset stored as an external URL."""
+    """Reusable media asset, either an external URL or an uploaded original.
+
+    Uploaded originals live in the default storage under ``original`` and are
+    deduplicated by ``content_hash``. ``process_media`` fills ``derivatives``
+    with resized WebP copies, stored as ``{"width": ..., "name": ...}`` entries
+    sorted by width.
+    """
+
+    STATUS_CHOICES = [
+        ("external", "External"),
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("ready", "Ready"),
+        ("failed", "Failed"),
+    ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     url = models.CharField(max_length=512)
     alt_text = models.CharField(max_length=255, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    original = models.CharField(max_length=255, blank=True, default="")
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    derivatives = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="external")
+    last_error = models.TextField(blank=True, default="")
+    # When a worker last claimed the asset; lets abandoned ``running`` rows be reclaimed.
+    started_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """Let workers find unprocessed uploads without scanning the table."""
+
+        indexes = [
+            models.Index(
+                fields=["status"],
+                name="media_unprocessed_idx",
+                condition=models.Q(status__in=["pending", "failed"]),
+            )
+        ]
+
     def __str__(self):
         return str(self.url)
 
@@ -373,6 +646,7 @@ class AthleteImage(models.Model):
 
         ordering = ["order"]
         unique_together = [("athlete", "media")]
+        indexes = [models.Index(fields=["athlete", "order"])]
 
 
 SOCIAL_PLATFORM_CHOICES = [
@@ -466,6 +740,8 @@ class ActivityEvent(models.Model):
         blank=True,
         null=True,
     )
+    # Identifier of the event on ``platform``, set by bulk ingestion.
+    external_id = models.CharField(max_length=255, blank=True, null=True)
     happened_at = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -490,6 +766,13 @@ class ActivityEvent(models.Model):
             models.Index(fields=["athlete", "happened_at"]),
             models.Index(fields=["type", "happened_at"]),
         ]
+        constraints = [
+            # Ingestion upserts on this key, so an edited happened_at updates the event.
+            models.UniqueConstraint(
+                fields=["platform", "external_id"],
+                name="activity_external_id_uniq",
+            ),
+        ]
         ordering = ["-happened_at"]
 
     def __str__(self):
@@ -501,6 +784,16 @@ class Conversation(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     topic = models.CharField(max_length=255, blank=True, null=True)
+    # Set while the messages live in a compressed ConversationArchive row.
+    is_archived = models.BooleanField(default=False)
+    # Maintained by api.utils.messaging.send_message so inboxes need no per-thread lookup.
+    last_message = models.ForeignKey(
+        "api.Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -508,6 +801,24 @@ class Conversation(models.Model):
         return f"Conversation {self.id}"
 
 
+class ConversationArchive(models.Model):
+    """Compressed snapshot of the messages of a conversation that went cold."""
+
+    conversation = models.OneToOneField(
+        "api.Conversation",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archive",
+    )
+    codec = models.CharField(max_length=10, default="gzip")
+    payload = models.BinaryField()
+    message_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive of conversation {self.conversation_id}"
+
+
 class ConversationParticipant(models.Model):
     """Participant metadata associated with a conversation."""
 
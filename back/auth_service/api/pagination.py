@@ -0,0 +1,128 @@
+"""Pagination classes for the API."""
+
+from __future__ import annotations
+
+import uuid
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class MessageAnchorPagination(BasePagination):
+    """Keyset pagination over the messages of one conversation.
+
+    Pages are anchored on a message id: ``?before=<id>`` returns the
+    ``limit`` messages preceding it, ``?after=<id>`` the ones following it, and
+    no anchor returns the newest page. Messages are ordered by
+    ``(created_at, id)`` so every page is a range scan of the
+    ``(conversation, created_at)`` index, whatever its depth in the thread.
+    Each page is returned oldest first with ``previous``/``next`` links.
+    """
+
+    page_size = 50
+    max_page_size = 200
+
+    def __init__(self):
+        self.request = None
+        self.page = []
+        self.has_older = False
+        self.has_newer = False
+
+    def _limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.page_size))
+        except ValueError as exc:
+            raise ValidationError({"limit": ["A positive integer is required."]}) from exc
+        return max(1, min(limit, self.max_page_size))
+
+    def _anchor(self, request):
+        before = request.query_params.get("before")
+        after = request.query_params.get("after")
+        if before and after:
+            raise ValidationError({"before": ["Use either 'before' or 'after', not both."]})
+        name, value = ("after", after) if after else ("before", before)
+        if not value:
+            return None, None
+        try:
+            return name, uuid.UUID(value)
+        except ValueError as exc:
+            raise ValidationError({name: [f"'{value}' is not a valid message id."]}) from exc
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return one page of ``queryset`` (a single conversation's messages)."""
+
+        self.request = request
+        limit = self._limit(request)
+        direction, anchor_id = self._anchor(request)
+
+        if direction is None:
+            rows = list(queryset.order_by("-created_at", "-pk")[: limit + 1])
+            self.has_older, self.has_newer = len(rows) > limit, False
+            self.page = rows[:limit][::-1]
+            return self.page
+
+        anchor = queryset.filter(pk=anchor_id).values_list("created_at", flat=True).first()
+        if anchor is None:
+            raise NotFound("Unknown message anchor.")
+        if direction == "after":
+            newer = Q(created_at__gt=anchor) | Q(created_at=anchor, pk__gt=anchor_id)
+            rows = list(queryset.filter(newer).order_by("created_at", "pk")[: limit + 1])
+            self.has_older, self.has_newer = True, len(rows) > limit
+            self.page = rows[:limit]
+        else:
+            older = Q(created_at__lt=anchor) | Q(created_at=anchor, pk__lt=anchor_id)
+            rows = list(queryset.filter(older).order_by("-created_at", "-pk")[: limit + 1])
+            self.has_older, self.has_newer = len(rows) > limit, True
+            self.page = rows[:limit][::-1]
+        return self.page
+
+    def paginate_list(self, items, request):
+        """Return one page of ``items``, serialized messages in chronological order.
+
+        Used for archived threads, which are read back as a list.
+        """
+
+        self.request = request
+        limit = self._limit(request)
+        direction, anchor_id = self._anchor(request)
+
+        end = len(items)
+        if direction is not None:
+            positions = [
+                index for index, item in enumerate(items) if str(item["id"]) == str(anchor_id)
+            ]
+            if not positions:
+                raise NotFound("Unknown message anchor.")
+            if direction == "after":
+                start = positions[0] + 1
+                self.page = items[start : start + limit]
+                self.has_older, self.has_newer = True, start + limit < len(items)
+                return self.page
+            end = positions[0]
+        start = max(0, end - limit)
+        self.page = items[start:end]
+        self.has_older, self.has_newer = start > 0, end < len(items)
+        return self.page
+
+    def _link(self, item, param):
+        if item is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "after" if param == "before" else "before")
+        return replace_query_param(url, param, item["id"] if isinstance(item, dict) else item.pk)
+
+    def get_paginated_response(self, data):
+        """Wrap ``data`` with links to the older and newer pages."""
+
+        first = self.page[0] if self.page and self.has_older else None
+        last = self.page[-1] if self.page and self.has_newer else None
+        return Response(
+            {
+                "results": data,
+                "previous": self._link(first, "before"),
+                "next": self._link(last, "after"),
+            }
+        )
@@ -0,0 +1,199 @@
+"""On-demand per-request profiling.
+
+With ``settings.PROFILING_ENABLED`` a request is profiled when a staff user
+sends ``X-Profile: 1`` or when it falls within ``PROFILING_SAMPLE_RATE``. The
+profile (a ``cProfile`` stats dump, or a pyinstrument HTML report when
+``PROFILING_BACKEND = "pyinstrument"`` and the library is installed) is written
+under ``settings.PROFILING_ROOT`` and recorded as a
+:class:`~api.models.ProfileCapture`, listed in the admin. Only the newest
+``PROFILING_MAX_FILES`` captures are kept; older ones and their files are
+deleted as new ones are stored.
+
+When profiling is disabled the middleware removes itself from the stack, so it
+costs nothing.
+"""
+
+import cProfile
+import logging
+import random
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError
+from django.utils.text import slugify
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import ProfileCapture
+
+try:  # pragma: no cover - optional dependency
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # pragma: no cover - fall back to cProfile
+    PyinstrumentProfiler = None
+
+LOGGER = logging.getLogger(__name__)
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def _staff_user(request):
+    """Return the staff user behind ``request`` (session or bearer token), else ``None``."""
+
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        user = result[0] if result else None
+    return user if user is not None and user.is_staff else None
+
+
+class _CProfileBackend:
+    """Deterministic profiler from the standard library, saved as a pstats dump."""
+
+    name = "cprofile"
+    suffix = ".prof"
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        """Start profiling the current thread."""
+
+        self.profiler.enable()
+
+    def stop(self):
+        """Stop profiling."""
+
+        self.profiler.disable()
+
+    def save(self, path):
+        """Write the profile to ``path``."""
+
+        self.profiler.dump_stats(path)
+
+
+class _PyinstrumentBackend:
+    """Sampling profiler, saved as a self-contained HTML report."""
+
+    name = "pyinstrument"
+    suffix = ".html"
+
+    def __init__(self):
+        self.profiler = PyinstrumentProfiler()
+
+    def start(self):
+        """Start profiling the current thread."""
+
+        self.profiler.start()
+
+    def stop(self):
+        """Stop profiling."""
+
+        self.profiler.stop()
+
+    def save(self, path):
+        """Write the profile to ``path``."""
+
+        Path(path).write_text(self.profiler.output_html(), encoding="utf-8")
+
+
+def profiler_backend():
+    """Return a fresh profiler for the configured ``PROFILING_BACKEND``."""
+
+    backend = getattr(settings, "PROFILING_BACKEND", "cprofile")
+    if backend == "pyinstrument" and PyinstrumentProfiler:
+        return _PyinstrumentBackend()
+    return _CProfileBackend()
+
+
+class ProfilingMiddleware:
+    """Profile selected requests and store the result on disk."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+        self.root = Path(settings.PROFILING_ROOT)
+        self.max_files = getattr(settings, "PROFILING_MAX_FILES", 0)
+
+    def trigger(self, request):
+        """Return why ``request`` should be profiled, or ``None`` to skip it."""
+
+        if request.META.get(PROFILE_HEADER) == "1" and _staff_user(request) is not None:
+            return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def __call__(self, request):
+        trigger = self.trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        backend = profiler_backend()
+        started = time.perf_counter()
+        backend.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            backend.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        capture = self.store(request, response, backend, trigger, duration_ms)
+        if capture is not None and trigger == "header":
+            response[PROFILE_ID_HEADER] = str(capture.pk)
+        return response
+
+    def store(self, request, response, backend, trigger, duration_ms):
+        """Write the profile to disk and record it; failures are logged, never raised."""
+
+        match = getattr(request, "resolver_match", None)
+        user = getattr(request, "user", None)
+        capture = ProfileCapture(
+            user=user if user is not None and user.is_authenticated else None,
+            view_name=(match.view_name if match else "")[:200],
+            method=request.method,
+            path=request.get_full_path()[:2048],
+            status_code=response.status_code,
+            duration_ms=round(duration_ms, 3),
+            trigger=trigger,
+            backend=backend.name,
+        )
+        label = slugify(capture.view_name.replace(":", "-")) or "unresolved"
+        capture.file_name = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{duration_ms:.0f}ms-"
+            f"{capture.pk.hex[:8]}{backend.suffix}"
+        )
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self.root / capture.file_name
+            backend.save(path)
+            capture.size = path.stat().st_size
+            capture.save()
+            if self.max_files:
+                prune_captures(self.root, self.max_files)
+        except (OSError, DatabaseError):
+            LOGGER.exception("Could not store the profile of %s %s", request.method, request.path)
+            return None
+        return capture
+
+
+def prune_captures(root, keep):
+    """Delete all but the ``keep`` newest captures and their files under ``root``.
+
+    Returns:
+        int: Number of deleted captures.
+    """
+
+    stale = list(
+        ProfileCapture.objects.order_by("-created_at", "-pk").values_list("pk", "file_name")[keep:]
+    )
+    for _, file_name in stale:
+        (Path(root) / file_name).unlink(missing_ok=True)
+    return ProfileCapture.objects.filter(pk__in=[pk for pk, _ in stale]).delete()[0]
@@ -12,7 +12,10 @@ from typing import Any, Dict, Optional
 import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
+from django.db.models import Q
 from django.template import TemplateDoesNotExist
 from django.utils.timezone import now
 from rest_framework import serializers
@@ -26,12 +29,15 @@ from .models import (
     CompanyProfile,
     Conversation,
     ConversationParticipant,
+    DataExport,
     MediaAsset,
     Message,
     SocialStat,
     SportCategory,
 )
+from .claims import bump_claims_version
 from .utils.email import send_html_email
+from .utils.media import srcset
 
 # API key stored in the environment so it can be overridden per deployment.
 GOOGLE_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
@@ -149,7 +155,9 @@ class UserSerializer(serializers.ModelSerializer):
             "address",
             "raw_address",
             "password",
+            "claims_version",
         ]
+        read_only_fields = ["claims_version"]
         extra_kwargs = {"password": {"write_only": True}}
 
     def create(self, validated_data):
@@ -200,6 +208,7 @@ class UserSerializer(serializers.ModelSerializer):
             instance.verification_token_expiry = now() + timedelta(hours=24)
 
         instance.save()
+        bump_claims_version(instance)
 
         if email_changed:
             base_site = getattr(settings, "BRAND_SITE_URL", "http://127.0.0.1:3000")
@@ -296,18 +305,20 @@ class ResetPasswordConfirmSerializer(serializers.Serializer):
             serializers.ValidationError: When the token is invalid or expired.
         """
 
-        try:
-            user = User.objects.get(reset_password_token=attrs["token"])
-        except User.DoesNotExist as exc:
-            raise serializers.ValidationError({"token": "Invalid or expired token."}) from exc
-
-        if user.reset_token_expiry and user.reset_token_expiry < now():
-            raise serializers.ValidationError({"token": "Token has expired."})
-
-        user.set_password(attrs["new_password"])
-        user.reset_password_token = None
-        user.reset_token_expiry = None
-        user.save(update_fields=["password", "reset_password_token", "reset_token_expiry"])
+        # Match the token on its unique index before paying for the password hash,
+        # then consume it with a conditional UPDATE so a token can never be used
+        # twice even by concurrent requests.
+        matching = User.objects.filter(reset_password_token=attrs["token"]).filter(
+            Q(reset_token_expiry__isnull=True) | Q(reset_token_expiry__gte=now())
+        )
+        user_id = matching.values_list("pk", flat=True).first()
+        updated = user_id is not None and matching.filter(pk=user_id).update(
+            password=make_password(attrs["new_password"]),
+            reset_password_token=None,
+            reset_token_expiry=None,
+        )
+        if not updated:
+            raise serializers.ValidationError({"token": "Invalid or expired token."})
 
         return {"message": "Password successfully reset."}
 
@@ -323,6 +334,45 @@ class ResetPasswordConfirmSerializer(serializers.Serializer):
 
 
 # --- Athlete Serializer ---
+class AthleteGalleryField(serializers.ListField):
+    """Ordered gallery image URLs backed by ``AthleteImage`` rows.
+
+    Reads the ``gallery`` prefetched by ``Athlete.objects.for_listing()`` and
+    falls back to a query for athletes loaded without it.
+    """
+
+    child = serializers.CharField(max_length=512)
+
+    def get_attribute(self, instance):
+        """Return the ordered image URLs of ``instance``."""
+
+        return [image.media.url for image in athlete_gallery(instance)]
+
+
+def athlete_gallery(athlete):
+    """Return the ordered ``AthleteImage`` rows of ``athlete`` with their media."""
+
+    gallery = getattr(athlete, "gallery", None)
+    if gallery is None:
+        gallery = athlete.media.select_related("media").order_by("order")
+    return gallery
+
+
+def age_in_years(dob, today=None):
+    """Return the age in years on ``today`` for a birth date, ``None`` when unknown."""
+
+    if not dob:
+        return None
+    today = today or date.today()
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+def absolute_srcset(asset, request):
+    """Return the ``srcset`` of ``asset`` with URLs made absolute for ``request``."""
+
+    return srcset(asset, request.build_absolute_uri if request is not None else None)
+
+
 class AthleteSerializer(serializers.ModelSerializer):
     """Expose public athlete profile details with derived metrics."""
 
@@ -336,6 +386,8 @@ class AthleteSerializer(serializers.ModelSerializer):
     recent_activity_count = serializers.SerializerMethodField()
     has_recent_activity = serializers.SerializerMethodField()
     is_followed = serializers.SerializerMethodField()
+    images = AthleteGalleryField(required=False)
+    image_srcsets = serializers.SerializerMethodField()
 
     class Meta:
         """Serializer configuration for athlete instances."""
@@ -363,31 +415,36 @@ class AthleteSerializer(serializers.ModelSerializer):
             "subscribers_facebook",
             "subscribers_instagram",
             "subscribers_youtube",
-            "image1",
-            "image2",
-            "image3",
+            "images",
+            "image_srcsets",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
 
+    def get_image_srcsets(self, obj):
+        """Return one ``srcset`` per gallery image, ``""`` where none was built."""
+
+        request = self.context.get("request")
+        return [absolute_srcset(image.media, request) for image in athlete_gallery(obj)]
+
     def get_age(self, obj):
         """Return the athlete age in years when the birth date is known."""
 
-        dob = getattr(obj, "date_of_birth", None)
-        if not dob:
-            return None
-        today = date.today()
-        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+        return age_in_years(getattr(obj, "date_of_birth", None))
 
     def get_followers_count(self, obj):
         """Return the number of user follows for the athlete profile."""
 
+        if hasattr(obj, "followers_total"):
+            return obj.followers_total
         return AthleteFollow.objects.filter(athlete=obj).count()
 
     def get_is_followed(self, obj):
         """Return True when the requesting user follows the athlete."""
 
+        if hasattr(obj, "followed_by_user"):
+            return obj.followed_by_user
         request = self.context.get("request")
         user = getattr(request, "user", None) if request else None
         if not user or not user.is_authenticated:
@@ -397,6 +454,8 @@ class AthleteSerializer(serializers.ModelSerializer):
     def get_recent_activity_count(self, obj):
         """Return the number of activity events recorded in the last week."""
 
+        if hasattr(obj, "recent_activity_total"):
+            return obj.recent_activity_total
         since = now() - timedelta(days=7)
         return ActivityEvent.objects.filter(athlete=obj, happened_at__gte=since).count()
 
@@ -405,6 +464,61 @@ class AthleteSerializer(serializers.ModelSerializer):
 
         return bool(self.get_recent_activity_count(obj))
 
+    def create(self, validated_data):
+        """Create the athlete and its ordered gallery."""
+
+        images = validated_data.pop("images", None)
+        athlete = super().create(validated_data)
+        if images is not None:
+            set_athlete_gallery(athlete, images)
+        return athlete
+
+    def update(self, instance, validated_data):
+        """Update the athlete, replacing the gallery when ``images`` is sent."""
+
+        images = validated_data.pop("images", None)
+        athlete = super().update(instance, validated_data)
+        if images is not None:
+            set_athlete_gallery(athlete, images)
+        return athlete
+
+
+def media_assets_for_urls(urls):
+    """Return ``{url: MediaAsset}`` for ``urls``, creating the missing assets in bulk.
+
+    Args:
+        urls (Iterable[str]): Image URLs, duplicates allowed.
+
+    Returns:
+        dict[str, MediaAsset]: One asset per distinct URL.
+    """
+
+    urls = list(dict.fromkeys(urls))
+    existing = {asset.url: asset for asset in MediaAsset.objects.filter(url__in=urls)}
+    missing = [MediaAsset(url=url) for url in urls if url not in existing]
+    for asset in MediaAsset.objects.bulk_create(missing):
+        existing[asset.url] = asset
+    return existing
+
+
+def set_athlete_gallery(athlete, urls):
+    """Replace the gallery of ``athlete`` with ``urls`` in the given order.
+
+    Args:
+        athlete (Athlete): Athlete whose gallery is rewritten.
+        urls (list[str]): Image URLs, first one shown first.
+    """
+
+    existing = media_assets_for_urls(urls)
+    with transaction.atomic():
+        AthleteImage.objects.filter(athlete=athlete).delete()
+        athlete.gallery = AthleteImage.objects.bulk_create(
+            [
+                AthleteImage(athlete=athlete, media=existing[url], order=order)
+                for order, url in enumerate(dict.fromkeys(urls))
+            ]
+        )
+
 
 # --- Additional Serializers for MVP models ---
 
@@ -421,14 +535,47 @@ class SportCategorySerializer(serializers.ModelSerializer):
 
 
 class MediaAssetSerializer(serializers.ModelSerializer):
-    """Serialize stored media assets."""
+    """Serialize stored media assets with their responsive ``srcset``."""
+
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         """Serializer configuration for media assets."""
 
         model = MediaAsset
-        fields = ["id", "url", "alt_text", "created_at"]
-        read_only_fields = ["id", "created_at"]
+        fields = [
+            "id",
+            "url",
+            "alt_text",
+            "content_hash",
+            "width",
+            "height",
+            "status",
+            "srcset",
+            "created_at",
+        ]
+        read_only_fields = ["id", "content_hash", "width", "height", "status", "created_at"]
+
+    def get_srcset(self, obj):
+        """Return the WebP derivatives as a ``srcset`` attribute value."""
+
+        return absolute_srcset(obj, self.context.get("request"))
+
+
+class MediaUploadSerializer(serializers.Serializer):
+    """Validate an image upload before it is ingested."""
+
+    file = serializers.FileField()
+    alt_text = serializers.CharField(max_length=255, required=False, allow_blank=True)
+
+    def validate_file(self, value):
+        """Reject uploads larger than ``MEDIA_MAX_UPLOAD_BYTES``."""
+
+        if value.size > settings.MEDIA_MAX_UPLOAD_BYTES:
+            raise serializers.ValidationError(
+                f"Images are limited to {settings.MEDIA_MAX_UPLOAD_BYTES // (1024 * 1024)} MB."
+            )
+        return value
 
 
 class AthleteImageSerializer(serializers.ModelSerializer):
@@ -526,6 +673,66 @@ class ActivityEventSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
+class ActivityEventIngestSerializer(serializers.ModelSerializer):
+    """Validate one event of a bulk ingestion batch.
+
+    ``platform`` and ``external_id`` identify the event on its source platform
+    and make re-sending it an update. ``images`` are URLs. The athlete is
+    checked once per batch by :func:`api.utils.activity.ingest_activity_events`
+    rather than per row.
+    """
+
+    athlete = serializers.UUIDField(source="athlete_id")
+    images = serializers.ListField(child=serializers.CharField(max_length=512), required=False)
+
+    class Meta:
+        """Serializer configuration for ingested activity events."""
+
+        model = ActivityEvent
+        fields = [
+            "external_id",
+            "athlete",
+            "type",
+            "text",
+            "images",
+            "platform",
+            "happened_at",
+            "competition_title",
+            "competition_location",
+            "competition_date",
+            "competition_result",
+            "followers_delta",
+            "followers_note",
+            "trophy_title",
+            "trophy_award",
+        ]
+        extra_kwargs = {
+            "external_id": {"required": True, "allow_null": False},
+            "platform": {"required": True, "allow_null": False},
+        }
+        # Uniqueness is resolved by the upsert, not by one query per row.
+        validators = []
+
+
+class DataExportSerializer(serializers.ModelSerializer):
+    """Serialize the status of a right-of-access export."""
+
+    class Meta:
+        """Serializer configuration for data exports."""
+
+        model = DataExport
+        fields = [
+            "id",
+            "status",
+            "size",
+            "row_counts",
+            "requested_at",
+            "completed_at",
+            "expires_at",
+        ]
+        read_only_fields = fields
+
+
 class ConversationSerializer(serializers.ModelSerializer):
     """Serialize conversation threads."""
 
@@ -533,8 +740,8 @@ class ConversationSerializer(serializers.ModelSerializer):
         """Serializer configuration for conversations."""
 
         model = Conversation
-        fields = ["id", "topic", "created_at", "updated_at"]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        fields = ["id", "topic", "last_message", "created_at", "updated_at"]
+        read_only_fields = ["id", "last_message", "created_at", "updated_at"]
 
 
 class ConversationParticipantSerializer(serializers.ModelSerializer):
@@ -572,3 +779,29 @@ class MessageSerializer(serializers.ModelSerializer):
             "read_by",
         ]
         read_only_fields = ["id", "created_at"]
+
+
+class MessageSendSerializer(serializers.Serializer):
+    """Validate a message posted to a conversation by the authenticated user."""
+
+    text = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    attachments = serializers.PrimaryKeyRelatedField(
+        queryset=MediaAsset.objects.all(), many=True, required=False
+    )
+
+    def validate(self, attrs):
+        """Reject messages with neither text nor attachments.
+
+        Args:
+            attrs (dict[str, Any]): Serialised message payload.
+
+        Returns:
+            dict[str, Any]: The validated payload.
+
+        Raises:
+            serializers.ValidationError: When the message would be empty.
+        """
+
+        if not attrs.get("text") and not attrs.get("attachments"):
+            raise serializers.ValidationError("A message needs text or at least one attachment.")
+        return attrs
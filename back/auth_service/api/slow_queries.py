@@ -0,0 +1,184 @@
+"""Slow-query log with per-fingerprint aggregates and captured plans.
+
+With ``settings.SLOW_QUERY_MS`` above zero, :class:`SlowQueryMiddleware`
+installs an execute wrapper on every connection for the duration of a request.
+Each query costs one timer; only statements slower than the threshold do more:
+
+* a warning is logged with the duration, the view and the innermost project
+  stack frame that issued the query;
+* the :class:`~api.models.SlowQuery` row for the statement's fingerprint (SQL
+  with literals and ``IN`` lists collapsed) is created or updated;
+* with ``SLOW_QUERY_EXPLAIN`` the plan is captured the first time a fingerprint
+  is seen. ``SLOW_QUERY_EXPLAIN_ANALYZE`` re-executes the statement to get
+  actual timings and is off by default; it only applies to plain ``SELECT``
+  statements, so data-modifying CTEs and locking reads are never re-run.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+import traceback
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Greatest
+from django.utils.timezone import now
+
+from .models import SlowQuery
+
+LOGGER = logging.getLogger(__name__)
+
+# Set while a slow query is being recorded, so the bookkeeping queries are not timed.
+_recording = ContextVar("slow_query_recording", default=False)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_WRITES = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """Return ``(digest, normalized_sql)`` identifying the shape of ``sql``.
+
+    Literals become ``?`` and ``IN`` placeholder lists of any length become
+    ``IN (...)``, so lookups over different numbers of ids share a fingerprint.
+    """
+
+    normalized = _LITERALS.sub("?", sql)
+    normalized = _IN_LISTS.sub("IN (...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest(), normalized
+
+
+def origin_frame():
+    """Return ``path:line in function`` for the innermost project frame on the stack."""
+
+    root = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename == __file__ or not filename.startswith(root) or "site-packages" in filename:
+            continue
+        return f"{os.path.relpath(filename, root)}:{frame.lineno} in {frame.name}"[:500]
+    return ""
+
+
+def analyzable(sql):
+    """Return True when ``sql`` is a plain ``SELECT`` that is safe to execute again.
+
+    ``WITH`` statements may hide an ``INSERT``/``UPDATE``/``DELETE`` in a CTE,
+    and ``SELECT ... FOR UPDATE`` takes row locks, so both are refused.
+    """
+
+    return sql.lstrip().upper().startswith("SELECT") and not _WRITES.search(_LITERALS.sub("?", sql))
+
+
+def explain(alias, sql, params, analyze=False):
+    """Return the plan of ``sql`` on ``alias``, or ``""`` for statements that cannot be explained.
+
+    ``analyze`` is ignored unless :func:`analyzable` accepts the statement.
+    """
+
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return ""
+    analyze = analyze and analyzable(sql)
+    connection = connections[alias]
+    if connection.vendor == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    elif connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        prefix = "EXPLAIN ANALYZE " if analyze else "EXPLAIN "
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
+
+
+def record(alias, sql, params, duration_ms, view_name):
+    """Log a slow query and fold it into the aggregate of its fingerprint."""
+
+    frame = origin_frame()
+    LOGGER.warning(
+        "Slow query (%.1f ms) in %s at %s: %s", duration_ms, view_name or "-", frame or "-", sql
+    )
+
+    digest, normalized = fingerprint(sql)
+    fields = {"last_view": view_name[:200], "last_frame": frame, "last_seen": now()}
+    # Aggregates go straight to the primary; routing them would pin the request to it.
+    stats = SlowQuery.objects.using(DEFAULT_DB_ALIAS)
+    token = _recording.set(True)
+    try:
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            updated = stats.filter(pk=digest).update(
+                calls=F("calls") + 1,
+                total_ms=F("total_ms") + duration_ms,
+                max_ms=Greatest("max_ms", Value(duration_ms, output_field=FloatField())),
+                **fields,
+            )
+            if updated:
+                return
+            plan = ""
+            if getattr(settings, "SLOW_QUERY_EXPLAIN", False):
+                analyze = getattr(settings, "SLOW_QUERY_EXPLAIN_ANALYZE", False)
+                plan = explain(alias, sql, params, analyze)
+            stats.create(
+                fingerprint=digest,
+                alias=alias,
+                sql=normalized,
+                calls=1,
+                total_ms=duration_ms,
+                max_ms=duration_ms,
+                explain=plan,
+                **fields,
+            )
+    except IntegrityError:
+        pass  # Another worker recorded the fingerprint first; this sample is dropped.
+    except DatabaseError:
+        LOGGER.exception("Could not record slow query %s", digest)
+    finally:
+        _recording.reset(token)
+
+
+class SlowQueryTimer:
+    """Execute wrapper timing each query and recording the slow ones."""
+
+    def __init__(self, alias, threshold_ms, view_name):
+        self.alias = alias
+        self.threshold = threshold_ms / 1000
+        self.view_name = view_name
+
+    def __call__(self, execute, sql, params, many, context):
+        if _recording.get():
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold:
+            record(self.alias, sql, None if many else params, elapsed * 1000, self.view_name())
+        return result
+
+
+class SlowQueryMiddleware:
+    """Time every query of a request and record those above ``SLOW_QUERY_MS``."""
+
+    def __init__(self, get_response):
+        self.threshold_ms = getattr(settings, "SLOW_QUERY_MS", 0)
+        if self.threshold_ms <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        def view_name():
+            match = getattr(request, "resolver_match", None)
+            return match.view_name if match else request.path
+
+        with ExitStack() as stack:
+            for alias in connections:
+                timer = SlowQueryTimer(alias, self.threshold_ms, view_name)
+                stack.enter_context(connections[alias].execute_wrapper(timer))
+            return self.get_response(request)
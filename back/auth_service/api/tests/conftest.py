@@ -21,6 +21,7 @@ os.environ.setdefault("EMAIL_HOST", "localhost")
 os.environ.setdefault("EMAIL_PORT", "1025")
 os.environ.setdefault("EMAIL_HOST_USER", "test@example.com")
 os.environ.setdefault("EMAIL_HOST_PASSWORD", "password")
+os.environ.setdefault("PASSWORD_HASHER", "fast")
 
 import pytest
 from rest_framework.test import APIClient
@@ -44,11 +45,12 @@ if "whitenoise" not in sys.modules:  # pragma: no cover - testing shim
     sys.modules["whitenoise.middleware"] = middleware_module
 
 import django
+from django.core.cache import cache
 from django.core.management import call_command
 
 django.setup()
 
-from api.models import User
+from api.models import User  # noqa: E402
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -60,10 +62,11 @@ def _migrate_db() -> None:
 
 @pytest.fixture(autouse=True)
 def _flush_db() -> None:
-    """Ensure a clean database state after each test."""
+    """Ensure a clean database and cache state after each test."""
 
     yield
     call_command("flush", verbosity=0, interactive=False)
+    cache.clear()
 
 
 @pytest.fixture
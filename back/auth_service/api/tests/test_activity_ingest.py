@@ -0,0 +1,109 @@
+"""Tests for the bulk activity ingestion endpoint."""
+
+from __future__ import annotations
+
+import uuid
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import ActivityEvent, Athlete
+
+
+def _athlete():
+    return Athlete.objects.create(
+        name="Synced athlete",
+        location="Paris",
+        category="Running",
+        price=100,
+        profile_url="/athletes/synced",
+    )
+
+
+def _events(athlete, count, text="Post"):
+    return [
+        {
+            "external_id": f"ig-{index}",
+            "platform": "instagram",
+            "athlete": str(athlete.pk),
+            "type": "post",
+            "text": f"{text} {index}",
+            "happened_at": f"2026-09-{index % 28 + 1:02d}T10:00:00Z",
+            "images": [f"/images/ig-{index}-a.jpg", f"/images/ig-{index}-b.jpg"],
+        }
+        for index in range(count)
+    ]
+
+
+def test_bulk_ingest_upserts_with_a_fixed_number_of_queries(api_client, user_factory):
+    """A batch costs the same number of statements however many events it holds."""
+
+    admin, _ = user_factory(is_staff=True)
+    athlete = _athlete()
+    api_client.force_authenticate(user=admin)
+    url = reverse("activity-bulk")
+
+    with CaptureQueriesContext(connection) as small:
+        response = api_client.post(url, {"events": _events(athlete, 3)}, format="json")
+    assert response.json() == {"created": 3, "updated": 0}
+
+    ActivityEvent.objects.all().delete()
+    with CaptureQueriesContext(connection) as large:
+        response = api_client.post(url, {"events": _events(athlete, 20)}, format="json")
+    assert response.json() == {"created": 20, "updated": 0}
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+    resent = _events(athlete, 20, text="Edited")
+    resent[0]["images"] = ["/images/replacement.jpg"]
+    response = api_client.post(url, {"events": resent}, format="json")
+    assert response.json() == {"created": 0, "updated": 20}
+    assert ActivityEvent.objects.count() == 20
+    first = ActivityEvent.objects.get(platform="instagram", external_id="ig-0")
+    assert first.text == "Edited 0"
+    assert list(first.images.values_list("url", flat=True)) == ["/images/replacement.jpg"]
+
+
+def test_resent_event_with_a_new_date_is_updated(api_client, user_factory):
+    """A platform correcting an event's timestamp edits the stored row."""
+
+    admin, _ = user_factory(is_staff=True)
+    athlete = _athlete()
+    api_client.force_authenticate(user=admin)
+    url = reverse("activity-bulk")
+    api_client.post(url, {"events": _events(athlete, 1)}, format="json")
+    stored = ActivityEvent.objects.get()
+
+    moved = _events(athlete, 1)
+    moved[0]["happened_at"] = "2026-10-02T08:30:00Z"
+    response = api_client.post(url, {"events": moved}, format="json")
+
+    assert response.json() == {"created": 0, "updated": 1}
+    event = ActivityEvent.objects.get()
+    assert event.pk == stored.pk
+    assert event.happened_at.isoformat() == "2026-10-02T08:30:00+00:00"
+
+
+def test_bulk_ingest_validation(api_client, user_factory):
+    """Staff only; unknown athletes and missing keys reject the batch."""
+
+    admin, _ = user_factory(is_staff=True)
+    user, _ = user_factory()
+    athlete = _athlete()
+    url = reverse("activity-bulk")
+
+    api_client.force_authenticate(user=user)
+    assert api_client.post(url, {"events": _events(athlete, 1)}, format="json").status_code == (
+        status.HTTP_403_FORBIDDEN
+    )
+
+    api_client.force_authenticate(user=admin)
+    stranger = _events(athlete, 1)
+    stranger[0]["athlete"] = str(uuid.uuid4())
+    keyless = _events(athlete, 1)
+    del keyless[0]["external_id"]
+    for events in (stranger, keyless, []):
+        response = api_client.post(url, {"events": events}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not ActivityEvent.objects.exists()
@@ -0,0 +1,76 @@
+"""Tests for the athlete gallery and the prefetching athlete listing."""
+
+from __future__ import annotations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import Athlete, AthleteFollow, AthleteImage, MediaAsset
+
+
+def _athlete(index, urls=()):
+    athlete = Athlete.objects.create(
+        name=f"Gallery {index}",
+        location="Paris",
+        category="Running",
+        price=100,
+        profile_url=f"/athletes/gallery-{index}",
+    )
+    for order, url in reversed(list(enumerate(urls))):
+        AthleteImage.objects.create(
+            athlete=athlete, media=MediaAsset.objects.create(url=url), order=order
+        )
+    return athlete
+
+
+def _list_queries(api_client):
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(reverse("athlete-list"))
+    assert response.status_code == status.HTTP_200_OK
+    return response, len(ctx.captured_queries)
+
+
+def test_athlete_list_query_count_is_constant(api_client, user_factory):
+    """Counters and galleries are loaded with a fixed number of queries."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+    first = _athlete(0, ["/a-1.jpg", "/a-2.jpg"])
+    AthleteFollow.objects.create(user=user, athlete=first)
+    _, few = _list_queries(api_client)
+
+    for index in range(1, 8):
+        _athlete(index, [f"/{index}-1.jpg", f"/{index}-2.jpg", f"/{index}-3.jpg"])
+    response, many = _list_queries(api_client)
+
+    assert many == few
+    by_id = {item["id"]: item for item in response.data["results"]}
+    assert by_id[str(first.id)]["images"] == ["/a-1.jpg", "/a-2.jpg"]
+    assert by_id[str(first.id)]["followers_count"] == 1
+    assert by_id[str(first.id)]["is_followed"] is True
+
+
+def test_athlete_images_can_be_written_in_order(api_client, user_factory):
+    """Sending ``images`` replaces the gallery, reusing known media assets."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+    athlete = _athlete(0, ["/old.jpg"])
+    athlete.user = user
+    athlete.save(update_fields=["user"])
+
+    response = api_client.patch(
+        reverse("athlete-detail", kwargs={"pk": athlete.id}),
+        {"images": ["/new-1.jpg", "/old.jpg"]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["images"] == ["/new-1.jpg", "/old.jpg"]
+    assert MediaAsset.objects.filter(url="/old.jpg").count() == 1
+    assert list(athlete.media.order_by("order").values_list("media__url", flat=True)) == [
+        "/new-1.jpg",
+        "/old.jpg",
+    ]
@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import uuid
 from datetime import timedelta
+from io import StringIO
 
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -17,6 +19,7 @@ from api.models import (
     CompanyProfile,
     Conversation,
     ConversationParticipant,
+    ErasureRequest,
     Message,
     User,
 )
@@ -262,7 +265,7 @@ def test_followed_athletes_endpoint(api_client, user_factory):
 
 
 def test_right_to_erasure_anonymises_user(api_client, user_factory):
-    """Right to erasure should anonymise athlete profile and delete the user."""
+    """Right to erasure should queue the job, then anonymise and delete in the worker."""
 
     user, _ = user_factory()
     athlete = Athlete.objects.create(
@@ -286,8 +289,14 @@ def test_right_to_erasure_anonymises_user(api_client, user_factory):
     api_client.force_authenticate(user=user)
     response = api_client.post(reverse("privacy-erase"))
 
-    assert response.status_code == status.HTTP_200_OK
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    user.refresh_from_db()
+    assert user.is_active is False
+
+    call_command("process_erasures", stdout=StringIO())
+
     assert not User.objects.filter(id=user.id).exists()
+    assert ErasureRequest.objects.get(subject_id=user.id).status == "done"
     athlete.refresh_from_db()
     assert athlete.user is None
     assert athlete.name == "Profil supprimé"
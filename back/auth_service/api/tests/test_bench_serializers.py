@@ -0,0 +1,63 @@
+"""Tests for the serializer and queryset micro-benchmarks."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.management.commands.bench_serializers import find_regressions
+from api.models import ActivityEvent, Athlete, User
+
+
+def test_find_regressions_uses_median_and_threshold():
+    """Only medians slower than the threshold are reported."""
+
+    baseline = {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}}
+    results = {
+        "fast": {"median_ms": 10.5},
+        "slow": {"median_ms": 12.0},
+        "new": {"median_ms": 99.0},
+    }
+
+    regressions = find_regressions(results, baseline, threshold=10)
+
+    assert [name for name, *_ in regressions] == ["slow"]
+    assert regressions[0][3] == pytest.approx(20.0)
+
+
+def test_command_saves_results_and_rolls_back_dataset(tmp_path):
+    """A run writes every benchmark to JSON and leaves the database untouched."""
+
+    output = tmp_path / "baseline.json"
+
+    call_command("bench_serializers", sizes="5", rounds=1, save=str(output))
+
+    payload = json.loads(output.read_text(encoding="utf-8"))
+    assert {"serialize_athletes_5", "serialize_users_5", "queryset_athlete_list_page"} <= set(
+        payload["benchmarks"]
+    )
+    assert not User.objects.exists()
+    assert not Athlete.objects.exists()
+    assert not ActivityEvent.objects.exists()
+
+
+def test_command_fails_on_regression_against_baseline(tmp_path):
+    """Comparing against a much faster baseline exits with an error."""
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"benchmarks": {"serialize_users_5": {"median_ms": 0.000001}}}),
+        encoding="utf-8",
+    )
+
+    with pytest.raises(CommandError, match="regressed"):
+        call_command(
+            "bench_serializers",
+            sizes="5",
+            rounds=1,
+            filter="serialize_users",
+            compare=str(baseline),
+        )
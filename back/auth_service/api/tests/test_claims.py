@@ -0,0 +1,75 @@
+"""Tests for JWT claims versioning and the cached profile endpoint."""
+
+from __future__ import annotations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.claims import STALE_CLAIMS_HEADER
+
+
+def _login(api_client, user_factory, **kwargs):
+    user, password = user_factory(**kwargs)
+    response = api_client.post(
+        reverse("auth-login"),
+        {"email": user.email, "password": password},
+        format="json",
+    )
+    return user, response.data
+
+
+def test_me_is_served_from_cache_without_queries(api_client, user_factory):
+    """Once cached, the profile is answered from the token and the cache only."""
+
+    user, tokens = _login(api_client, user_factory)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+    first = api_client.get(reverse("auth-me"))
+    assert first.status_code == status.HTTP_200_OK
+    assert first.data["email"] == user.email
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = api_client.get(reverse("auth-me"))
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data == first.data
+    assert STALE_CLAIMS_HEADER not in second
+    assert len(ctx.captured_queries) == 0
+
+
+def test_preference_change_flags_stale_claims_until_refresh(api_client, user_factory):
+    """Updating preferences bumps the version; a refresh re-mints the claims."""
+
+    _, tokens = _login(api_client, user_factory, language="fr")
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert STALE_CLAIMS_HEADER not in api_client.get(reverse("auth-me"))
+
+    api_client.patch(reverse("auth-preferences"), {"language": "en"}, format="json")
+
+    response = api_client.get(reverse("auth-me"))
+    assert response.data["language"] == "en"
+    assert response[STALE_CLAIMS_HEADER] == "1"
+
+    refreshed = api_client.post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert AccessToken(refreshed.data["access"])["language"] == "en"
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refreshed.data['access']}")
+    assert STALE_CLAIMS_HEADER not in api_client.get(reverse("auth-me"))
+
+
+def test_me_rejects_deactivated_user(api_client, user_factory):
+    """Deactivating an account invalidates its cached profile."""
+
+    user, tokens = _login(api_client, user_factory)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+    assert api_client.get(reverse("auth-me")).status_code == status.HTTP_200_OK
+
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+
+    assert api_client.get(reverse("auth-me")).status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,101 @@
+"""Tests for archiving cold conversations into compressed rows."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import (
+    Conversation,
+    ConversationArchive,
+    ConversationParticipant,
+    MediaAsset,
+    Message,
+)
+from api.utils.archive import archive_conversation
+
+
+def _cold_conversation(user_factory):
+    """Create a two-person conversation whose messages are a year old."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    ConversationParticipant.objects.create(conversation=conversation, user=alice)
+    ConversationParticipant.objects.create(conversation=conversation, user=bob)
+    media = MediaAsset.objects.create(url="/images/contract.png")
+    for index in range(3):
+        message = Message.objects.create(
+            conversation=conversation, sender=alice, text=f"msg {index}"
+        )
+        message.attachments.add(media)
+        message.read_by.add(bob)
+        Message.objects.filter(pk=message.pk).update(
+            created_at=timezone.now() - timedelta(days=365, minutes=10 - index)
+        )
+    return conversation, alice, bob
+
+
+def test_archive_and_read_archived_thread(api_client, user_factory):
+    """Archived threads disappear from the hot table but read back identically."""
+
+    conversation, alice, _ = _cold_conversation(user_factory)
+    api_client.force_authenticate(user=alice)
+    url = reverse("conversation-messages", args=[conversation.pk])
+    before = api_client.get(url).json()
+
+    call_command("archive_conversations", months=6, stdout=StringIO())
+
+    conversation.refresh_from_db()
+    assert conversation.is_archived is True
+    assert not Message.objects.filter(conversation=conversation).exists()
+    assert ConversationArchive.objects.get(conversation=conversation).message_count == 3
+
+    after = api_client.get(url).json()
+    assert after == before
+    assert [m["text"] for m in after["results"]] == ["msg 0", "msg 1", "msg 2"]
+
+
+def test_new_message_rehydrates_archived_thread(api_client, user_factory):
+    """Posting into an archived thread restores its messages first."""
+
+    conversation, alice, bob = _cold_conversation(user_factory)
+    call_command("archive_conversations", months=6, stdout=StringIO())
+
+    api_client.force_authenticate(user=bob)
+    response = api_client.post(
+        reverse("message-list"),
+        {"conversation": str(conversation.pk), "sender": str(bob.pk), "text": "Back again"},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    conversation.refresh_from_db()
+    assert conversation.is_archived is False
+    assert not ConversationArchive.objects.filter(conversation=conversation).exists()
+    restored = Message.objects.filter(conversation=conversation, sender=alice).order_by(
+        "created_at"
+    )
+    assert [m.text for m in restored] == ["msg 0", "msg 1", "msg 2"]
+    assert restored[0].created_at < timezone.now() - timedelta(days=300)
+    assert list(restored[0].read_by.all()) == [bob]
+    assert restored[0].attachments.count() == 1
+
+
+def test_archive_skips_threads_that_warmed_up(user_factory):
+    """A thread that got a message after it was selected is left in place."""
+
+    conversation, alice, _ = _cold_conversation(user_factory)
+    Message.objects.create(conversation=conversation, sender=alice, text="Fresh")
+
+    assert archive_conversation(conversation, cutoff=timezone.now() - timedelta(days=180)) == 0
+
+    conversation.refresh_from_db()
+    assert conversation.is_archived is False
+    assert Message.objects.filter(conversation=conversation).count() == 4
+    assert not ConversationArchive.objects.filter(conversation=conversation).exists()
@@ -0,0 +1,123 @@
+"""Tests for the anchored conversation messages endpoint."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import Conversation, ConversationParticipant, Message
+
+
+def _thread(user_factory, size):
+    """Create a two-person conversation holding ``size`` messages, one minute apart."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    ConversationParticipant.objects.create(conversation=conversation, user=alice)
+    ConversationParticipant.objects.create(conversation=conversation, user=bob)
+    start = timezone.now() - timedelta(days=1)
+    messages = []
+    for index in range(size):
+        message = Message.objects.create(
+            conversation=conversation, sender=alice, text=f"msg {index}"
+        )
+        Message.objects.filter(pk=message.pk).update(created_at=start + timedelta(minutes=index))
+        messages.append(message)
+    return conversation, alice, messages
+
+
+def _texts(response):
+    return [message["text"] for message in response.json()["results"]]
+
+
+def test_latest_page_and_anchors(api_client, user_factory):
+    """The newest page comes first; ``before``/``after`` walk the thread in order."""
+
+    conversation, alice, messages = _thread(user_factory, 7)
+    api_client.force_authenticate(user=alice)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    latest = api_client.get(url, {"limit": 3})
+    assert latest.status_code == status.HTTP_200_OK
+    assert _texts(latest) == ["msg 4", "msg 5", "msg 6"]
+    assert latest.json()["next"] is None
+    assert f"before={messages[4].pk}" in latest.json()["previous"]
+
+    older = api_client.get(latest.json()["previous"])
+    assert _texts(older) == ["msg 1", "msg 2", "msg 3"]
+
+    newer = api_client.get(url, {"limit": 3, "after": str(messages[1].pk)})
+    assert _texts(newer) == ["msg 2", "msg 3", "msg 4"]
+    assert f"after={messages[4].pk}" in newer.json()["next"]
+
+    oldest = api_client.get(url, {"limit": 3, "before": str(messages[2].pk)})
+    assert _texts(oldest) == ["msg 0", "msg 1"]
+    assert oldest.json()["previous"] is None
+
+
+def test_page_cost_does_not_depend_on_thread_length(api_client, user_factory):
+    """Opening a thread runs the membership check, the page and its prefetches only."""
+
+    conversation, alice, _ = _thread(user_factory, 30)
+    api_client.force_authenticate(user=alice)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(url, {"limit": 5})
+    assert len(response.json()["results"]) == 5
+    # Membership EXISTS, the page itself, then the attachments and read_by prefetches.
+    assert len(ctx.captured_queries) == 4
+
+
+def test_non_participants_and_bad_anchors_are_rejected(api_client, user_factory):
+    """Strangers get a 404, malformed or foreign anchors are refused."""
+
+    conversation, alice, messages = _thread(user_factory, 2)
+    _, other_alice, other_messages = _thread(user_factory, 1)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    api_client.force_authenticate(user=other_alice)
+    assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    api_client.force_authenticate(user=alice)
+    assert api_client.get(url, {"before": "not-a-uuid"}).status_code == status.HTTP_400_BAD_REQUEST
+    both = {"before": str(messages[0].pk), "after": str(messages[1].pk)}
+    assert api_client.get(url, both).status_code == status.HTTP_400_BAD_REQUEST
+    foreign = api_client.get(url, {"after": str(other_messages[0].pk)})
+    assert foreign.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_send_updates_conversation_and_unread_counters(api_client, user_factory):
+    """Posting a message bumps the thread and every other participant's unread count."""
+
+    conversation, alice, _ = _thread(user_factory, 1)
+    carol, _ = user_factory()
+    ConversationParticipant.objects.create(conversation=conversation, user=carol)
+    ConversationParticipant.objects.filter(conversation=conversation).update(unread_count=2)
+    previous_update = Conversation.objects.get(pk=conversation.pk).updated_at
+    api_client.force_authenticate(user=alice)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    response = api_client.post(url, {"text": "Deal?"}, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    body = response.json()
+    assert body["text"] == "Deal?"
+    assert body["sender"] == str(alice.pk)
+    conversation.refresh_from_db()
+    assert str(conversation.last_message_id) == body["id"]
+    assert conversation.updated_at > previous_update
+    participants = ConversationParticipant.objects.filter(conversation=conversation)
+    counts = dict(participants.values_list("user", "unread_count"))
+    assert counts[alice.pk] == 2
+    assert sorted(count for user, count in counts.items() if user != alice.pk) == [3, 3]
+    assert _texts(api_client.get(url))[-1] == "Deal?"
+
+    empty = api_client.post(url, {"text": ""}, format="json")
+    assert empty.status_code == status.HTTP_400_BAD_REQUEST
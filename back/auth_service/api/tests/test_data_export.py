@@ -0,0 +1,130 @@
+"""Tests for the streaming right-of-access export."""
+
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import Conversation, ConversationParticipant, DataExport, Message
+from api.utils import export as export_module
+from api.utils.erasure import request_erasure
+
+
+def _download(api_client, export_id, **headers):
+    response = api_client.get(reverse("data-export-download", args=[export_id]), **headers)
+    return response, b"".join(response.streaming_content)
+
+
+def test_export_is_built_in_chunks_and_downloadable(
+    tmp_path, monkeypatch, api_client, user_factory
+):
+    """The worker writes one NDJSON member per dataset, reading rows in chunks."""
+
+    monkeypatch.setattr(export_module, "EXPORT_CHUNK_SIZE", 3)
+    user, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Deal")
+    ConversationParticipant.objects.create(conversation=conversation, user=user)
+    for index in range(7):
+        Message.objects.create(conversation=conversation, sender=user, text=f"hello {index}")
+    api_client.force_authenticate(user=user)
+
+    with override_settings(DATA_EXPORT_ROOT=tmp_path):
+        response = api_client.post(reverse("data-export-list"))
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        export_id = response.data["id"]
+
+        pending = api_client.get(reverse("data-export-download", args=[export_id]))
+        assert pending.status_code == status.HTTP_409_CONFLICT
+
+        call_command("process_data_exports", stdout=StringIO())
+        export = DataExport.objects.get(pk=export_id)
+        assert export.status == "ready"
+        assert export.row_counts["messages"] == 7
+
+        response, body = _download(api_client, export_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        profile = [json.loads(line) for line in archive.read("profile.ndjson").splitlines()]
+        messages = archive.read("messages.ndjson").splitlines()
+    assert profile[0]["email"] == user.email
+    assert "password" not in profile[0]
+    assert sorted(json.loads(line)["text"] for line in messages) == [f"hello {i}" for i in range(7)]
+
+
+def test_download_supports_ranges_and_ownership(tmp_path, api_client, user_factory):
+    """Range requests return 206 slices; other users cannot see the export."""
+
+    user, _ = user_factory()
+    other, _ = user_factory()
+    export = DataExport.objects.create(user=user)
+
+    with override_settings(DATA_EXPORT_ROOT=tmp_path):
+        call_command("process_data_exports", stdout=StringIO())
+        api_client.force_authenticate(user=user)
+        _, whole = _download(api_client, export.pk)
+        response, head = _download(api_client, export.pk, HTTP_RANGE="bytes=0-9")
+        _, tail = _download(api_client, export.pk, HTTP_RANGE="bytes=10-")
+        unsatisfiable = api_client.get(
+            reverse("data-export-download", args=[export.pk]), HTTP_RANGE=f"bytes={len(whole)}-"
+        )
+
+        api_client.force_authenticate(user=other)
+        forbidden = api_client.get(reverse("data-export-download", args=[export.pk]))
+
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response["Content-Range"] == f"bytes 0-9/{len(whole)}"
+    assert head + tail == whole
+    assert unsatisfiable.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert forbidden.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_failed_and_abandoned_builds_leave_no_files(tmp_path, monkeypatch, user_factory):
+    """A failing build removes its partial archive; a dead worker's export is rebuilt."""
+
+    user, _ = user_factory()
+    export = DataExport.objects.create(user=user)
+
+    def boom(handle, rows):
+        handle.write(b"partial")
+        raise RuntimeError("disk full")
+
+    with override_settings(DATA_EXPORT_ROOT=tmp_path):
+        monkeypatch.setattr(export_module, "_write_ndjson", boom)
+        call_command("process_data_exports", stdout=StringIO())
+        assert DataExport.objects.get(pk=export.pk).status == "failed"
+        assert not list(tmp_path.iterdir())
+
+        monkeypatch.undo()
+        abandoned = timezone.now() - timedelta(hours=1)
+        DataExport.objects.filter(pk=export.pk).update(status="running", heartbeat_at=abandoned)
+        live = DataExport.objects.create(user=user, status="running", heartbeat_at=timezone.now())
+        call_command("process_data_exports", "--stale-minutes", "30", stdout=StringIO())
+
+    assert DataExport.objects.get(pk=export.pk).status == "ready"
+    assert DataExport.objects.get(pk=live.pk).status == "running"
+
+
+def test_erasure_deletes_export_archives(tmp_path, user_factory):
+    """Erasing a user removes their export rows and the archives on disk."""
+
+    user, _ = user_factory()
+    DataExport.objects.create(user=user)
+
+    with override_settings(DATA_EXPORT_ROOT=tmp_path):
+        call_command("process_data_exports", stdout=StringIO())
+        assert [path.suffix for path in tmp_path.iterdir()] == [".zip"]
+        request_erasure(user)
+        call_command("process_erasures", stdout=StringIO())
+
+    assert not DataExport.objects.exists()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,152 @@
+"""Tests for the primary/replica database router."""
+
+from __future__ import annotations
+
+import pytest
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.models import Athlete
+from core.db_router import PrimaryReplicaRouter, ReplicaPinningMiddleware, is_pinned
+
+
+def _middleware(view):
+    with override_settings(DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_LAG_WINDOW=5):
+        return ReplicaPinningMiddleware(view)
+
+
+def test_router_reads_from_replica_until_a_write():
+    """Reads go to the replica and stick to the primary after a write."""
+
+    router = PrimaryReplicaRouter(replicas=["replica"])
+    seen = {}
+
+    def view(_request):
+        seen["before"] = router.db_for_read(Athlete)
+        seen["write"] = router.db_for_write(Athlete)
+        seen["after"] = router.db_for_read(Athlete)
+        return HttpResponse()
+
+    _middleware(view)(RequestFactory().get("/api/athletes/"))
+
+    assert seen == {"before": "replica", "write": "default", "after": "default"}
+    assert is_pinned() is False
+
+
+def test_router_uses_primary_inside_transactions_and_unsafe_requests():
+    """Transactions and unsafe methods never read from a replica."""
+
+    router = PrimaryReplicaRouter(replicas=["replica"])
+    with transaction.atomic():
+        assert router.db_for_read(Athlete) == "default"
+
+    seen = {}
+
+    def view(_request):
+        seen["read"] = router.db_for_read(Athlete)
+        return HttpResponse()
+
+    _middleware(view)(RequestFactory().post("/api/athletes/"))
+    assert seen["read"] == "default"
+    assert router.allow_migrate("replica", "api") is False
+    assert router.allow_migrate("default", "api") is True
+
+
+def test_client_stays_on_primary_within_lag_window():
+    """A client that just wrote keeps reading from the primary on its next request."""
+
+    router = PrimaryReplicaRouter(replicas=["replica"])
+    reads = []
+
+    def writing_view(_request):
+        router.db_for_write(Athlete)
+        return HttpResponse()
+
+    def reading_view(_request):
+        reads.append(router.db_for_read(Athlete))
+        return HttpResponse()
+
+    headers = {"HTTP_AUTHORIZATION": "Bearer writer"}
+    _middleware(writing_view)(RequestFactory().post("/api/follows/", **headers))
+    _middleware(reading_view)(RequestFactory().get("/api/follows/", **headers))
+    _middleware(reading_view)(RequestFactory().get("/api/follows/"))
+
+    assert reads == ["default", "replica"]
+
+
+@pytest.fixture
+def sqlite_replica(tmp_path):
+    """Attach a second, migrated SQLite database as the ``replica`` alias and route to it.
+
+    Nothing replicates into it, so a row is visible only on the database it was
+    written to, which shows where each read and write actually landed.
+    """
+
+    connections.settings["replica"] = {
+        **connections.settings[DEFAULT_DB_ALIAS],
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    call_command("migrate", database="replica", run_syncdb=True, verbosity=0)
+    with override_settings(
+        DATABASE_REPLICAS=["replica"],
+        DATABASE_REPLICA_LAG_WINDOW=5,
+        DATABASE_ROUTERS=["core.db_router.PrimaryReplicaRouter"],
+    ):
+        yield
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+def _athlete(name, using):
+    return Athlete.objects.using(using).create(
+        name=name, location="Paris", category="Judo", price=100, profile_url=f"/athletes/{name}"
+    )
+
+
+def test_reads_and_writes_land_on_the_right_database(sqlite_replica):
+    """Reads hit the replica until the request writes; the write lands on the primary only."""
+
+    _athlete("on-primary", DEFAULT_DB_ALIAS)
+    _athlete("on-replica", "replica")
+    seen = {}
+
+    def view(_request):
+        seen["before"] = list(Athlete.objects.values_list("name", flat=True))
+        Athlete.objects.create(
+            name="written", location="Paris", category="Judo", price=100, profile_url="/athletes/w"
+        )
+        seen["after"] = sorted(Athlete.objects.values_list("name", flat=True))
+        return HttpResponse()
+
+    headers = {"HTTP_AUTHORIZATION": "Bearer writer"}
+    ReplicaPinningMiddleware(view)(RequestFactory().get("/api/athletes/", **headers))
+
+    assert seen["before"] == ["on-replica"]
+    assert seen["after"] == ["on-primary", "written"]
+    assert not Athlete.objects.using("replica").filter(name="written").exists()
+
+    def reading_view(_request):
+        seen.setdefault("reads", []).append(sorted(Athlete.objects.values_list("name", flat=True)))
+        return HttpResponse()
+
+    ReplicaPinningMiddleware(reading_view)(RequestFactory().get("/api/athletes/", **headers))
+    ReplicaPinningMiddleware(reading_view)(RequestFactory().get("/api/athletes/"))
+    assert seen["reads"] == [["on-primary", "written"], ["on-replica"]]
+
+
+def test_transactions_fall_back_to_the_primary(sqlite_replica):
+    """Reads inside a transaction see the primary even on a safe request."""
+
+    _athlete("on-primary", DEFAULT_DB_ALIAS)
+    seen = {}
+
+    def view(_request):
+        with transaction.atomic():
+            seen["names"] = list(Athlete.objects.values_list("name", flat=True))
+        return HttpResponse()
+
+    ReplicaPinningMiddleware(view)(RequestFactory().get("/api/athletes/"))
+    assert seen["names"] == ["on-primary"]
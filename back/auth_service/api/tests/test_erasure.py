@@ -0,0 +1,180 @@
+"""Tests for the queued, chunked right-to-erasure pipeline."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.models import (
+    Athlete,
+    AthleteFollow,
+    Conversation,
+    ConversationParticipant,
+    ErasureRequest,
+    Message,
+    User,
+)
+from api.utils import erasure as erasure_module
+from api.utils.archive import archive_conversation, archived_messages
+from api.utils.erasure import email_hash
+from api.utils.messaging import send_message
+
+
+def _heavy_user(user_factory):
+    user, _ = user_factory()
+    other, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    ConversationParticipant.objects.create(conversation=conversation, user=user)
+    ConversationParticipant.objects.create(conversation=conversation, user=other)
+    for index in range(5):
+        Message.objects.create(conversation=conversation, sender=user, text=f"mine {index}")
+        reply = Message.objects.create(
+            conversation=conversation, sender=other, text=f"reply {index}"
+        )
+        reply.read_by.add(user)
+    for index in range(3):
+        athlete = Athlete.objects.create(
+            name=f"Athlete {index}", price=100, profile_url=f"/athletes/erase-{index}"
+        )
+        AthleteFollow.objects.create(user=user, athlete=athlete)
+    return user, other
+
+
+def test_erasure_request_is_queued_and_idempotent(api_client, user_factory):
+    """Posting twice keeps a single pending request and locks the account."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+
+    first = api_client.post(reverse("privacy-erase"))
+    second = api_client.post(reverse("privacy-erase"))
+
+    assert first.status_code == second.status_code == status.HTTP_202_ACCEPTED
+    assert first.data["id"] == second.data["id"]
+    erasure = ErasureRequest.objects.get()
+    assert erasure.status == "pending"
+    assert erasure.email_hash == email_hash(user.email)
+    assert User.objects.get(pk=user.pk).is_active is False
+
+
+def test_worker_erases_in_batches_and_keeps_audit(user_factory):
+    """Dependents are removed in chunks and the audit record survives the account."""
+
+    user, other = _heavy_user(user_factory)
+    erasure_module.request_erasure(user)
+
+    call_command("process_erasures", "--batch-size", "2", stdout=StringIO())
+
+    erasure = ErasureRequest.objects.get()
+    assert erasure.status == "done"
+    assert erasure.user is None
+    assert erasure.subject_id == user.pk
+    assert erasure.progress == {
+        "athlete": 0,
+        "follows": 3,
+        "read_receipts": 5,
+        "archives": 0,
+        "messages": 5,
+        "participants": 1,
+        "company": 0,
+        "exports": 0,
+        "account": 1,
+    }
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert Message.objects.filter(sender=other).count() == 5
+
+
+def test_erasure_scrubs_archives_in_place_and_unread_counters(user_factory):
+    """Archived threads are rewritten, not restored, and unread counters drop."""
+
+    user, _ = user_factory()
+    other, _ = user_factory()
+    archived = Conversation.objects.create(topic="Archived")
+    hot = Conversation.objects.create(topic="Hot")
+    for conversation in (archived, hot):
+        ConversationParticipant.objects.create(conversation=conversation, user=user)
+        ConversationParticipant.objects.create(conversation=conversation, user=other)
+        send_message(conversation, user, text="mine")
+        send_message(conversation, other, text="reply")
+        send_message(conversation, user, text="mine again")
+    Message.objects.get(conversation=archived, text="reply").read_by.add(user)
+    archive_conversation(archived)
+    assert User.objects.get(pk=other.pk).unread_total == 4
+
+    erasure_module.process_erasure(erasure_module.request_erasure(user), batch_size=1)
+
+    archived.refresh_from_db()
+    assert archived.is_archived is True
+    assert [(m["text"], m["read_by"]) for m in archived_messages(archived)] == [("reply", [])]
+    assert not Message.objects.filter(conversation=archived).exists()
+    assert User.objects.get(pk=other.pk).unread_total == 0
+    assert set(ConversationParticipant.objects.values_list("unread_count", flat=True)) == {0}
+
+
+def test_interrupted_erasure_resumes_from_recorded_step(monkeypatch, user_factory):
+    """A failing step marks the request failed; a retry continues where it stopped."""
+
+    user, _ = _heavy_user(user_factory)
+    erasure_module.request_erasure(user)
+
+    def boom(*args):
+        raise RuntimeError("database went away")
+
+    steps = dict(erasure_module.STEPS)
+    monkeypatch.setattr(
+        erasure_module,
+        "STEPS",
+        [(name, boom if name == "messages" else step) for name, step in steps.items()],
+    )
+    call_command("process_erasures", stdout=StringIO())
+
+    erasure = ErasureRequest.objects.get()
+    assert erasure.status == "failed"
+    assert erasure.step == "messages"
+    assert not AthleteFollow.objects.filter(user=user).exists()
+    assert User.objects.filter(pk=user.pk).exists()
+
+    monkeypatch.setattr(erasure_module, "STEPS", list(steps.items()))
+    call_command("process_erasures", "--retry-failed", stdout=StringIO())
+
+    erasure.refresh_from_db()
+    assert erasure.status == "done"
+    assert erasure.attempts == 2
+    assert not User.objects.filter(pk=user.pk).exists()
+
+
+def test_worker_respects_limit(user_factory):
+    """``--limit`` bounds how many requests one run processes."""
+
+    for _ in range(2):
+        user, _ = user_factory()
+        erasure_module.request_erasure(user)
+
+    call_command("process_erasures", "--limit", "1", stdout=StringIO())
+
+    assert ErasureRequest.objects.filter(status="done").count() == 1
+
+
+def test_only_requests_with_a_stale_heartbeat_are_reclaimed(user_factory):
+    """A running request is left alone while its heartbeat is fresh."""
+
+    started = timezone.now() - timedelta(hours=2)
+    requests = []
+    for heartbeat in (timezone.now(), started):
+        user, _ = user_factory()
+        requests.append(erasure_module.request_erasure(user))
+        ErasureRequest.objects.filter(pk=requests[-1].pk).update(
+            status="running", started_at=started, heartbeat_at=heartbeat
+        )
+
+    call_command("process_erasures", "--stale-minutes", "30", stdout=StringIO())
+
+    live, stale = (ErasureRequest.objects.get(pk=request.pk) for request in requests)
+    assert live.status == "running"
+    assert stale.status == "done"
+    assert stale.started_at == started
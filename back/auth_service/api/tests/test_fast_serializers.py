@@ -0,0 +1,105 @@
+"""Tests for the fast-path list serializers."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import (
+    ActivityEventListSerializer,
+    AthleteListSerializer,
+    UserListSerializer,
+)
+from api.models import ActivityEvent, Athlete, AthleteFollow, AthleteImage, MediaAsset, User
+from api.serializers import ActivityEventSerializer, AthleteSerializer, UserSerializer
+
+
+def _render(data):
+    return JSONRenderer().render(data)
+
+
+def _athletes(user):
+    media = [
+        MediaAsset.objects.create(
+            url="/a.jpg", derivatives=[{"name": "media/a-320.webp", "width": 320}]
+        ),
+        MediaAsset.objects.create(url="/b.jpg"),
+    ]
+    for index in range(3):
+        athlete = Athlete.objects.create(
+            name=f"Fast {index}",
+            location="Lyon",
+            category="Judo",
+            price=Decimal("1234.5") + index,
+            profile_url=f"/athletes/fast-{index}",
+            date_of_birth=date(2000, 2, 29) if index else None,
+            user=user if index == 0 else None,
+        )
+        for order, asset in enumerate(media[index % 2:]):
+            AthleteImage.objects.create(athlete=athlete, media=asset, order=order)
+        ActivityEvent.objects.create(athlete=athlete, type="post", happened_at=timezone.now())
+    AthleteFollow.objects.create(user=user, athlete=Athlete.objects.get(name="Fast 1"))
+    return media
+
+
+def test_athlete_fast_path_matches_serializer_bytes(user_factory):
+    """The fast athlete list renders the same JSON as ``AthleteSerializer``."""
+
+    user, _ = user_factory()
+    _athletes(user)
+    request = RequestFactory().get("/api/athletes/")
+    request.user = user
+    queryset = Athlete.objects.for_listing(user).order_by("name")
+
+    expected = AthleteSerializer(queryset, many=True, context={"request": request}).data
+    fast = AthleteListSerializer(context={"request": request})
+
+    assert _render(fast.render(fast.values(queryset))) == _render(expected)
+
+
+def test_activity_and_user_fast_paths_match_serializer_bytes(user_factory):
+    """Activity events (with image ids) and users render identically."""
+
+    user, _ = user_factory(date_of_birth=date(1990, 5, 17))
+    user_factory(last_login=timezone.now() - timedelta(days=3))
+    media = _athletes(user)
+    ActivityEvent.objects.filter(type="post").first().images.add(media[0])
+    ActivityEvent.objects.create(
+        athlete=Athlete.objects.first(),
+        type="competition",
+        happened_at=timezone.now() - timedelta(days=2),
+        competition_date=date(2024, 7, 30),
+        followers_delta=-12,
+    )
+
+    events = ActivityEvent.objects.order_by("-happened_at")
+    fast_events = ActivityEventListSerializer()
+    assert _render(fast_events.render(fast_events.values(events))) == _render(
+        ActivityEventSerializer(events, many=True).data
+    )
+
+    users = User.objects.order_by("email")
+    fast_users = UserListSerializer()
+    assert _render(fast_users.render(fast_users.values(users))) == _render(
+        UserSerializer(users, many=True).data
+    )
+
+
+def test_activity_list_endpoint_uses_fast_path(api_client, user_factory):
+    """The paginated feed still returns the serializer fields."""
+
+    user, _ = user_factory()
+    _athletes(user)
+
+    response = api_client.get(reverse("activity-list"), {"limit": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["count"] == 3
+    assert len(response.data["results"]) == 2
+    assert set(response.data["results"][0]) == set(ActivityEventSerializer().fields)
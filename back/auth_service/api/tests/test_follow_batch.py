@@ -0,0 +1,88 @@
+"""Tests for the batch follow/unfollow and follow-state endpoints."""
+
+from __future__ import annotations
+
+import uuid
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import Athlete, AthleteFollow
+
+
+def _make_athletes(count: int) -> list[Athlete]:
+    """Create ``count`` minimal athlete profiles."""
+
+    return [
+        Athlete.objects.create(
+            name=f"Batch Athlete {index}",
+            location="Lyon",
+            category="Judo",
+            price=100,
+            profile_url=f"/athletes/batch-{index}",
+        )
+        for index in range(count)
+    ]
+
+
+def test_batch_follow_and_unfollow(api_client, user_factory):
+    """Batch endpoints should follow existing athletes and unfollow them in one call."""
+
+    user, _ = user_factory()
+    athletes = _make_athletes(3)
+    AthleteFollow.objects.create(user=user, athlete=athletes[0])
+    api_client.force_authenticate(user=user)
+
+    payload = {"athletes": [str(a.id) for a in athletes] + [str(uuid.uuid4())]}
+    response = api_client.post(reverse("follow-batch"), payload, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(response.data["followed"]) == sorted(str(a.id) for a in athletes)
+    assert AthleteFollow.objects.filter(user=user).count() == 3
+
+    response = api_client.delete(
+        reverse("follow-batch"),
+        {"athletes": [str(athletes[0].id), str(athletes[1].id)]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["unfollowed"] == 2
+    assert list(AthleteFollow.objects.filter(user=user).values_list("athlete_id", flat=True)) == [
+        athletes[2].id
+    ]
+
+
+def test_batch_follow_rejects_invalid_payload(api_client, user_factory):
+    """Invalid identifiers and oversized batches should be rejected."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+
+    response = api_client.post(reverse("follow-batch"), {"athletes": ["nope"]}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    too_many = [str(uuid.uuid4()) for _ in range(101)]
+    response = api_client.post(reverse("follow-batch"), {"athletes": too_many}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_follow_state_uses_single_query(api_client, user_factory):
+    """Follow state for many athletes should be answered with one query."""
+
+    user, _ = user_factory()
+    athletes = _make_athletes(5)
+    AthleteFollow.objects.create(user=user, athlete=athletes[1])
+    AthleteFollow.objects.create(user=user, athlete=athletes[3])
+    api_client.force_authenticate(user=user)
+
+    ids = ",".join(str(a.id) for a in athletes)
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(reverse("follow-state"), {"athletes": ids})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(ctx.captured_queries) == 1
+    assert response.data == {
+        str(a.id): index in (1, 3) for index, a in enumerate(athletes)
+    }
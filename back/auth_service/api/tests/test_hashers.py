@@ -0,0 +1,38 @@
+"""Tests for the configurable password hasher tiers."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.urls import reverse
+from rest_framework import status
+
+from api.hashers import TunedPBKDF2PasswordHasher
+
+
+def test_hasher_tiers_keep_legacy_hashes_verifiable():
+    """The preferred tier comes first and the strong hashers stay available."""
+
+    assert settings.PASSWORD_HASHERS[0] == settings.PASSWORD_HASHER_TIERS[settings.PASSWORD_HASHER]
+    assert "api.hashers.TunedPBKDF2PasswordHasher" in settings.PASSWORD_HASHERS
+    assert "api.hashers.TunedScryptPasswordHasher" in settings.PASSWORD_HASHERS
+
+
+def test_outdated_hash_is_upgraded_on_login(api_client, user_factory):
+    """Logging in with a hash using old parameters re-hashes it transparently."""
+
+    user, password = user_factory()
+    hasher = TunedPBKDF2PasswordHasher()
+    user.password = hasher.encode(password, hasher.salt(), iterations=1000)
+    user.save(update_fields=["password"])
+    assert hasher.must_update(user.password)
+
+    response = api_client.post(
+        reverse("auth-login"),
+        {"email": user.email, "password": password},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    user.refresh_from_db()
+    assert not user.password.startswith("pbkdf2_sha256$1000$")
+    assert user.check_password(password)
@@ -0,0 +1,156 @@
+"""Tests for Idempotency-Key replay of POST requests."""
+
+from __future__ import annotations
+
+import itertools
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyMiddleware,
+    carries_credentials,
+    request_fingerprint,
+)
+from api.models import Conversation, ConversationParticipant, Message, User
+
+
+def _bearer(api_client, user):
+    token = RefreshToken.for_user(user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+def _conversation(*users):
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    for user in users:
+        ConversationParticipant.objects.create(conversation=conversation, user=user)
+    return conversation
+
+
+def test_retry_replays_the_first_response(api_client, user_factory):
+    """A retried send returns the stored response and stores no second message."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    conversation = _conversation(alice, bob)
+    _bearer(api_client, alice)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    first = api_client.post(url, {"text": "Deal?"}, format="json", HTTP_IDEMPOTENCY_KEY="send-1")
+    retry = api_client.post(url, {"text": "Deal?"}, format="json", HTTP_IDEMPOTENCY_KEY="send-1")
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.content == first.content
+    assert retry[REPLAYED_HEADER] == "true"
+    assert not first.has_header(REPLAYED_HEADER)
+    assert Message.objects.filter(conversation=conversation).count() == 1
+    bob_participant = ConversationParticipant.objects.get(conversation=conversation, user=bob)
+    assert bob_participant.unread_count == 1
+
+    other = api_client.post(url, {"text": "Deal?"}, format="json", HTTP_IDEMPOTENCY_KEY="send-2")
+    assert other.status_code == status.HTTP_201_CREATED
+    assert Message.objects.filter(conversation=conversation).count() == 2
+
+
+def test_key_reuse_and_scoping(api_client, user_factory):
+    """Keys are per caller, and reusing one for another request is refused."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    conversation = _conversation(alice, bob)
+    url = reverse("conversation-messages", args=[conversation.pk])
+
+    _bearer(api_client, alice)
+    api_client.post(url, {"text": "Hello"}, format="json", HTTP_IDEMPOTENCY_KEY="shared")
+    changed = api_client.post(
+        url, {"text": "Bonjour"}, format="json", HTTP_IDEMPOTENCY_KEY="shared"
+    )
+    assert changed.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    _bearer(api_client, bob)
+    response = api_client.post(url, {"text": "Hello"}, format="json", HTTP_IDEMPOTENCY_KEY="shared")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not response.has_header(REPLAYED_HEADER)
+    senders = Message.objects.order_by("created_at").values_list("sender", flat=True)
+    assert list(senders) == [alice.pk, bob.pk]
+
+
+def test_anonymous_callers_are_scoped_by_ip():
+    """Anonymous callers sending the same key from different addresses do not share it."""
+
+    counter = itertools.count()
+    middleware = IdempotencyMiddleware(lambda _request: HttpResponse(str(next(counter))))
+    factory = RequestFactory()
+
+    def send(address):
+        request = factory.post(
+            "/api/contact/", {}, HTTP_IDEMPOTENCY_KEY="anon", REMOTE_ADDR=address
+        )
+        return middleware(request)
+
+    first = send("203.0.113.1")
+    assert send("203.0.113.1").content == first.content
+    other = send("203.0.113.2")
+    assert other.content != first.content
+    assert not other.has_header(REPLAYED_HEADER)
+
+
+def test_credentials_are_never_cached(api_client, user_factory):
+    """Logins are not replayed, and no response carrying tokens is stored."""
+
+    user, password = user_factory()
+    url = reverse("auth-login")
+    payload = {"email": user.email, "password": password}
+
+    first = api_client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="login")
+    retry = api_client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="login")
+    assert first.status_code == retry.status_code == status.HTTP_200_OK
+    assert not retry.has_header(REPLAYED_HEADER)
+
+    assert carries_credentials(JsonResponse({"access": "token", "refresh": "token"}))
+    with_cookie = HttpResponse()
+    with_cookie.set_cookie("sessionid", "value")
+    assert carries_credentials(with_cookie)
+    assert not carries_credentials(JsonResponse({"id": 1}))
+
+
+def test_retried_registration_is_replayed(monkeypatch, api_client):
+    """Registration is not excluded: a retry replays the 201 and creates no second user."""
+
+    monkeypatch.setattr("api.views.send_html_email", lambda **kwargs: None)
+    payload = {
+        "email": "retry@example.com",
+        "password": "RegisterPass123!",
+        "first_name": "Retry",
+        "last_name": "User",
+        "phone_country_code": "+33",
+        "phone_number": "0612345679",
+    }
+    url = reverse("auth-register")
+
+    first = api_client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="signup")
+    retry = api_client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="signup")
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry[REPLAYED_HEADER] == "true"
+    assert User.objects.filter(email=payload["email"]).count() == 1
+
+
+def test_upload_fingerprint_ignores_the_multipart_boundary():
+    """A rebuilt upload with a new boundary still matches the first attempt."""
+
+    factory = RequestFactory()
+    body = "x" * 64
+
+    def upload(boundary):
+        content_type = f"multipart/form-data; boundary={boundary}"
+        return factory.post("/api/media/", body, content_type=content_type)
+
+    assert request_fingerprint(upload("aaaa")) == request_fingerprint(upload("bbbb"))
+    assert request_fingerprint(upload("aaaa")) != request_fingerprint(
+        factory.post("/api/media/", body * 2, content_type="multipart/form-data; boundary=aaaa")
+    )
@@ -0,0 +1,76 @@
+"""Tests for the per-user unread total behind the inbox badge."""
+
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.models import Conversation, ConversationParticipant, User
+from api.utils.messaging import send_message
+
+
+def _unread(user):
+    return User.objects.values_list("unread_total", flat=True).get(pk=user.pk)
+
+
+def test_totals_follow_sends_reads_and_removals(user_factory):
+    """Sends, counter edits and deleted threads all keep the total in step."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    first = Conversation.objects.create(topic="Sponsoring")
+    second = Conversation.objects.create(topic="Contract")
+    for conversation in (first, second):
+        ConversationParticipant.objects.create(conversation=conversation, user=alice)
+        ConversationParticipant.objects.create(conversation=conversation, user=bob)
+
+    send_message(first, alice, text="Hello")
+    send_message(first, alice, text="Still there?")
+    send_message(second, alice, text="Draft attached")
+    assert _unread(bob) == 3
+    assert _unread(alice) == 0
+
+    participant = ConversationParticipant.objects.get(conversation=first, user=bob)
+    participant.unread_count = 0
+    participant.save()
+    assert _unread(bob) == 1
+
+    second.delete()
+    assert _unread(bob) == 0
+
+
+def test_unread_endpoint_is_a_single_lookup(api_client, user_factory):
+    """The badge endpoint answers from the user row alone."""
+
+    alice, _ = user_factory()
+    bob, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    ConversationParticipant.objects.create(conversation=conversation, user=alice)
+    ConversationParticipant.objects.create(conversation=conversation, user=bob)
+    send_message(conversation, alice, text="Hello")
+    api_client.force_authenticate(user=bob)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.get(reverse("inbox-unread"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"unread": 1}
+    assert len(ctx.captured_queries) == 1
+
+
+def test_recount_repairs_drift(user_factory):
+    """``recount_unread`` rebuilds totals changed behind the counters' back."""
+
+    alice, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Sponsoring")
+    ConversationParticipant.objects.create(conversation=conversation, user=alice, unread_count=4)
+    User.objects.filter(pk=alice.pk).update(unread_total=42)
+
+    call_command("recount_unread", email=alice.email, stdout=StringIO())
+
+    assert _unread(alice) == 4
@@ -0,0 +1,188 @@
+"""Tests for media uploads, content-hash dedupe and WebP derivatives."""
+
+from __future__ import annotations
+
+import io
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+
+from api.models import (
+    ActivityEvent,
+    Athlete,
+    AthleteImage,
+    Conversation,
+    MediaAsset,
+    Message,
+)
+
+
+def _jpeg(width=1600, height=900, color=(200, 30, 30)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _upload(api_client, content, name="photo.jpg"):
+    return api_client.post(
+        reverse("media-upload"),
+        {"file": SimpleUploadedFile(name, content, content_type="image/jpeg")},
+        format="multipart",
+    )
+
+
+def test_upload_dedupes_by_content_and_builds_srcset(tmp_path, api_client, user_factory):
+    """Identical bytes map to one asset whose derivatives feed ``srcset``."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+    content = _jpeg()
+
+    with override_settings(MEDIA_ROOT=tmp_path, MEDIA_DERIVATIVE_WIDTHS=[320, 640, 2000]):
+        first = _upload(api_client, content)
+        second = _upload(api_client, content, name="copy.jpg")
+        assert first.status_code == status.HTTP_201_CREATED
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data["id"] == first.data["id"]
+        assert first.data["status"] == "pending"
+        assert first.data["srcset"] == ""
+
+        call_command("process_media", "--workers", "1", stdout=StringIO())
+        response = api_client.get(reverse("media-detail", args=[first.data["id"]]))
+
+    asset = MediaAsset.objects.get(pk=first.data["id"])
+    assert MediaAsset.objects.count() == 1
+    assert asset.status == "ready"
+    assert [item["width"] for item in asset.derivatives] == [320, 640, 1600]
+    smallest = tmp_path / asset.derivatives[0]["name"]
+    assert smallest.stat().st_size < len(content)
+    with Image.open(smallest) as image:
+        assert image.format == "WEBP"
+        assert image.size == (320, 180)
+    assert response.data["srcset"].endswith("1600.webp 1600w")
+    assert response.data["srcset"].startswith("http://testserver/media/derivatives/")
+
+
+def test_upload_rejects_non_images(tmp_path, api_client, user_factory):
+    """Files Pillow cannot identify are refused before anything is stored."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+
+    with override_settings(MEDIA_ROOT=tmp_path):
+        response = _upload(api_client, b"not an image", name="notes.jpg")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not MediaAsset.objects.exists()
+    assert not any(tmp_path.iterdir())
+
+
+def test_upload_rejects_decompression_bombs(monkeypatch, tmp_path, api_client, user_factory):
+    """Images far above Pillow's pixel limit are refused like any invalid file."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    with override_settings(MEDIA_ROOT=tmp_path):
+        response = _upload(api_client, _jpeg(200, 200))
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not MediaAsset.objects.exists()
+
+
+def test_ingest_root_merges_duplicate_external_assets(tmp_path, api_client):
+    """Seeded URLs pointing at the same bytes collapse into one processed asset."""
+
+    public = tmp_path / "public"
+    (public / "images").mkdir(parents=True)
+    content = _jpeg(800, 600)
+    (public / "images" / "a.jpg").write_bytes(content)
+    (public / "images" / "b.jpg").write_bytes(content)
+    athletes = [
+        Athlete.objects.create(
+            name=f"Seeded {index}",
+            location="Lyon",
+            category="Judo",
+            price=100,
+            profile_url=f"/athletes/seeded-{index}",
+        )
+        for index in range(2)
+    ]
+    for athlete, url in zip(athletes, ["/images/a.jpg", "/images/b.jpg"]):
+        AthleteImage.objects.create(athlete=athlete, media=MediaAsset.objects.create(url=url))
+    MediaAsset.objects.create(url="https://cdn.example.com/remote.jpg")
+
+    with override_settings(MEDIA_ROOT=tmp_path / "media", MEDIA_DERIVATIVE_WIDTHS=[320]):
+        call_command(
+            "process_media", "--workers", "1", "--ingest-root", str(public), stdout=StringIO()
+        )
+        response = api_client.get(reverse("athlete-list"))
+
+    processed = MediaAsset.objects.exclude(status="external")
+    assert processed.count() == 1
+    assert processed.get().status == "ready"
+    assert MediaAsset.objects.filter(status="external").count() == 1
+    assert set(AthleteImage.objects.values_list("media", flat=True)) == {processed.get().pk}
+    for item in response.data["results"]:
+        assert item["images"] == ["/images/a.jpg"]
+        assert item["image_srcsets"][0].endswith("800.webp 800w")
+
+
+def test_ingest_root_repoints_activity_and_message_links(tmp_path, user_factory):
+    """Events and messages that used a merged asset end up on the adopted one."""
+
+    public = tmp_path / "public"
+    (public / "images").mkdir(parents=True)
+    content = _jpeg(800, 600)
+    (public / "images" / "a.jpg").write_bytes(content)
+    (public / "images" / "b.jpg").write_bytes(content)
+    first = MediaAsset.objects.create(url="/images/a.jpg")
+    second = MediaAsset.objects.create(url="/images/b.jpg")
+    athlete = Athlete.objects.create(
+        name="Linked", location="Lyon", category="Judo", price=100, profile_url="/athletes/linked"
+    )
+    event = ActivityEvent.objects.create(
+        athlete=athlete, type="post", text="Both pictures", happened_at=timezone.now()
+    )
+    event.images.set([first, second])
+    sender, _ = user_factory()
+    message = Message.objects.create(
+        conversation=Conversation.objects.create(topic="Media"), sender=sender, text="See attached"
+    )
+    message.attachments.set([second])
+
+    with override_settings(MEDIA_ROOT=tmp_path / "media", MEDIA_DERIVATIVE_WIDTHS=[320]):
+        call_command(
+            "process_media", "--workers", "1", "--ingest-root", str(public), stdout=StringIO()
+        )
+
+    adopted = MediaAsset.objects.get()
+    assert list(event.images.all()) == [adopted]
+    assert list(message.attachments.all()) == [adopted]
+
+
+def test_assets_abandoned_while_running_are_reclaimed(tmp_path, api_client, user_factory):
+    """A ``running`` asset is claimed again only once its claim is stale."""
+
+    user, _ = user_factory()
+    api_client.force_authenticate(user=user)
+
+    with override_settings(MEDIA_ROOT=tmp_path, MEDIA_DERIVATIVE_WIDTHS=[320]):
+        abandoned = _upload(api_client, _jpeg(color=(10, 10, 10))).data["id"]
+        busy = _upload(api_client, _jpeg(color=(20, 20, 20))).data["id"]
+        MediaAsset.objects.filter(pk=abandoned).update(
+            status="running", started_at=timezone.now() - timedelta(hours=1)
+        )
+        MediaAsset.objects.filter(pk=busy).update(status="running", started_at=timezone.now())
+        call_command("process_media", "--workers", "1", "--stale-minutes", "30", stdout=StringIO())
+
+    assert MediaAsset.objects.get(pk=abandoned).status == "ready"
+    assert MediaAsset.objects.get(pk=busy).status == "running"
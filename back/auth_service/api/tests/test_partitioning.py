@@ -0,0 +1,57 @@
+"""Tests for partition helpers and the retention fallback of maintain_partitions."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from api.models import Conversation, Message
+from api.utils.partitioning import add_months, create_partition_sql, partition_name
+
+
+def test_partition_helpers_generate_monthly_ranges():
+    """Partition DDL should cover exactly one calendar month."""
+
+    december = datetime(2025, 12, 17, tzinfo=dt_timezone.utc)
+    assert add_months(december, 1) == datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+    assert add_months(december, -12) == datetime(2024, 12, 1, tzinfo=dt_timezone.utc)
+    assert partition_name("api_message", december) == "api_message_p202512"
+
+    sql = create_partition_sql("api_message", december, quote_name=lambda name: f'"{name}"')
+    assert '"api_message_p202512" PARTITION OF "api_message"' in sql
+    assert "FROM ('2025-12-01T00:00:00+00:00') TO ('2026-01-01T00:00:00+00:00')" in sql
+
+
+def test_retention_archives_and_purges_old_messages(tmp_path, user_factory):
+    """Without partitions, old rows are archived to NDJSON and deleted in batches."""
+
+    user, _ = user_factory()
+    conversation = Conversation.objects.create(topic="Retention")
+    old = [
+        Message.objects.create(conversation=conversation, sender=user, text=f"old {i}")
+        for i in range(3)
+    ]
+    recent = Message.objects.create(conversation=conversation, sender=user, text="recent")
+    Message.objects.filter(pk__in=[m.pk for m in old]).update(
+        created_at=timezone.now() - timedelta(days=120)
+    )
+
+    call_command(
+        "maintain_partitions",
+        retain_months=2,
+        archive_dir=str(tmp_path),
+        batch_size=2,
+        stdout=StringIO(),
+    )
+
+    assert list(Message.objects.values_list("pk", flat=True)) == [recent.pk]
+    archives = list(tmp_path.glob("api_message-*.ndjson.gz"))
+    assert len(archives) == 1
+    with gzip.open(archives[0], "rt", encoding="utf-8") as handle:
+        texts = sorted(json.loads(line)["text"] for line in handle)
+    assert texts == ["old 0", "old 1", "old 2"]
@@ -0,0 +1,101 @@
+"""Tests for the on-demand profiling middleware and its admin."""
+
+from __future__ import annotations
+
+import pytest
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.models import ProfileCapture
+from api.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+
+
+def _view(_request):
+    return HttpResponse("ok")
+
+
+def _middleware(tmp_path, sample_rate=0.0, max_files=0):
+    with override_settings(
+        PROFILING_ENABLED=True,
+        PROFILING_SAMPLE_RATE=sample_rate,
+        PROFILING_ROOT=tmp_path,
+        PROFILING_MAX_FILES=max_files,
+    ):
+        return ProfilingMiddleware(_view)
+
+
+def _request(user, **headers):
+    request = RequestFactory().get("/api/athletes/", **headers)
+    request.user = user
+    return request
+
+
+def test_middleware_is_removed_when_disabled():
+    """Disabled profiling adds no middleware to the stack."""
+
+    with override_settings(PROFILING_ENABLED=False):
+        with pytest.raises(MiddlewareNotUsed):
+            ProfilingMiddleware(_view)
+
+
+def test_staff_header_captures_a_profile(tmp_path, user_factory):
+    """``X-Profile: 1`` from a staff user stores a profile and records it."""
+
+    staff, _ = user_factory(is_staff=True)
+
+    response = _middleware(tmp_path)(_request(staff, HTTP_X_PROFILE="1"))
+
+    capture = ProfileCapture.objects.get()
+    assert response[PROFILE_ID_HEADER] == str(capture.pk)
+    assert capture.trigger == "header"
+    assert capture.user == staff
+    assert capture.status_code == 200
+    assert (tmp_path / capture.file_name).stat().st_size == capture.size > 0
+
+
+def test_header_is_ignored_for_non_staff(tmp_path, user_factory):
+    """Regular and anonymous users cannot trigger a capture."""
+
+    user, _ = user_factory()
+    middleware = _middleware(tmp_path)
+
+    middleware(_request(user, HTTP_X_PROFILE="1"))
+    response = middleware(_request(AnonymousUser(), HTTP_X_PROFILE="1"))
+
+    assert PROFILE_ID_HEADER not in response
+    assert not ProfileCapture.objects.exists()
+    assert not list(tmp_path.iterdir())
+
+
+def test_only_the_newest_captures_are_kept(tmp_path):
+    """Beyond ``PROFILING_MAX_FILES`` the oldest captures and their files go."""
+
+    middleware = _middleware(tmp_path, sample_rate=1.0, max_files=2)
+    for _ in range(3):
+        middleware(_request(AnonymousUser()))
+
+    kept = ProfileCapture.objects.order_by("created_at")
+    assert kept.count() == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        capture.file_name for capture in kept
+    )
+
+
+def test_sampled_capture_is_downloadable_from_admin(tmp_path, user_factory):
+    """Sampled requests are captured and served by the admin download view."""
+
+    admin_user, _ = user_factory(is_staff=True, is_superuser=True)
+    _middleware(tmp_path, sample_rate=1.0)(_request(AnonymousUser()))
+    capture = ProfileCapture.objects.get()
+    assert capture.trigger == "sample"
+    assert capture.user is None
+
+    model_admin = admin.site._registry[ProfileCapture]  # pylint: disable=protected-access
+    with override_settings(PROFILING_ROOT=tmp_path):
+        response = model_admin.download_view(_request(admin_user), capture.pk)
+
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == (tmp_path / capture.file_name).read_bytes()
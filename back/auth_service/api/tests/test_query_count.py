@@ -0,0 +1,52 @@
+"""Tests for the X-Query-Count middleware and the load-test aggregation."""
+
+from __future__ import annotations
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.management.commands.bench_load import percentile, summarize
+from api.models import Athlete
+from core.query_count import QUERY_COUNT_HEADER, QueryCountMiddleware
+
+
+def test_middleware_reports_queries_per_request():
+    """Every statement executed by the view is counted in the header."""
+
+    def view(_request):
+        Athlete.objects.count()
+        list(Athlete.objects.all())
+        return HttpResponse()
+
+    with override_settings(QUERY_COUNT_HEADER=True):
+        middleware = QueryCountMiddleware(view)
+
+    response = middleware(RequestFactory().get("/api/athletes/"))
+    assert response[QUERY_COUNT_HEADER] == "2"
+
+
+def test_middleware_is_disabled_by_default():
+    """Without QUERY_COUNT_HEADER the middleware removes itself from the stack."""
+
+    with override_settings(QUERY_COUNT_HEADER=False):
+        with pytest.raises(MiddlewareNotUsed):
+            QueryCountMiddleware(lambda request: HttpResponse())
+
+
+def test_summarize_reports_percentiles_rps_and_queries():
+    """Latencies are aggregated in milliseconds and errors counted by status."""
+
+    samples = [(n / 1000, 200, 3) for n in range(1, 100)] + [(0.1, 500, None)]
+
+    row = summarize(samples, elapsed=2.0)
+
+    assert row["requests"] == 100
+    assert row["errors"] == 1
+    assert row["rps"] == 50.0
+    assert row["p50_ms"] == 50.0
+    assert row["p95_ms"] == 95.0
+    assert row["p99_ms"] == 99.0
+    assert row["queries_per_request"] == 3.0
+    assert percentile([], 50) is None
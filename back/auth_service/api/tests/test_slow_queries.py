@@ -0,0 +1,62 @@
+"""Tests for the slow-query log."""
+
+from __future__ import annotations
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from api.models import Athlete, SlowQuery
+from api.slow_queries import SlowQueryMiddleware, analyzable, fingerprint
+
+
+def _athlete_view(_request):
+    list(Athlete.objects.filter(pk__in=[1, 2, 3]))
+    list(Athlete.objects.filter(pk__in=[4]))
+    return HttpResponse()
+
+
+def test_fingerprint_collapses_literals_and_in_lists():
+    """Statements differing only in values or IN list length share a fingerprint."""
+
+    first = fingerprint("SELECT * FROM t WHERE a = 'x' AND id IN (%s, %s, %s) LIMIT 21")
+    second = fingerprint("SELECT * FROM t WHERE a = 'it''s' AND id IN (%s) LIMIT 5")
+
+    assert first == second
+    assert first[1] == "SELECT * FROM t WHERE a = ? AND id IN (...) LIMIT ?"
+
+
+def test_only_plain_selects_are_analyzed():
+    """ANALYZE never re-runs writes hidden in CTEs or locking reads."""
+
+    assert analyzable("SELECT * FROM t WHERE note = 'delete me'")
+    assert not analyzable("WITH gone AS (DELETE FROM t RETURNING id) SELECT * FROM gone")
+    assert not analyzable("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not analyzable("SELECT * FROM t WHERE id = %s FOR UPDATE")
+    assert not analyzable("UPDATE t SET a = 1")
+
+
+def test_middleware_is_removed_without_threshold():
+    """A zero threshold disables the execute wrapper entirely."""
+
+    with override_settings(SLOW_QUERY_MS=0):
+        with pytest.raises(MiddlewareNotUsed):
+            SlowQueryMiddleware(_athlete_view)
+
+
+def test_slow_queries_are_aggregated_per_fingerprint_with_plan():
+    """Both queries fold into one aggregate carrying the plan and origin frame."""
+
+    with override_settings(SLOW_QUERY_MS=1e-9, SLOW_QUERY_EXPLAIN=True):
+        middleware = SlowQueryMiddleware(_athlete_view)
+        middleware(RequestFactory().get("/api/athletes/"))
+
+    stats = SlowQuery.objects.get()
+    assert stats.calls == 2
+    assert stats.max_ms >= stats.total_ms / 2
+    assert stats.last_view == "/api/athletes/"
+    assert "test_slow_queries.py" in stats.last_frame
+    assert "_athlete_view" in stats.last_frame
+    assert "IN (...)" in stats.sql
+    assert stats.explain
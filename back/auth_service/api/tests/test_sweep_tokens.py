@@ -0,0 +1,76 @@
+"""Tests for the expired token sweeper and the reset confirmation path."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api import serializers
+from api.models import CompanyProfile, User
+
+
+def _age(user, days):
+    User.objects.filter(pk=user.pk).update(date_joined=timezone.now() - timedelta(days=days))
+
+
+def test_sweep_clears_expired_tokens_and_purges_abandoned_accounts(user_factory):
+    """Only stale tokens and unverified accounts owning nothing are removed."""
+
+    past = timezone.now() - timedelta(days=40)
+    abandoned, _ = user_factory(is_active=False, is_verified=False, verification_token_expiry=past)
+    _age(abandoned, 40)
+    recent, _ = user_factory(is_active=False, is_verified=False, verification_token_expiry=past)
+    owner, _ = user_factory(is_active=False, is_verified=False, verification_token_expiry=past)
+    _age(owner, 40)
+    CompanyProfile.objects.create(user=owner, name="Owner Co")
+    reset, _ = user_factory(reset_password_token=uuid.uuid4(), reset_token_expiry=past)
+
+    call_command("sweep_tokens", "--unverified-days", "30", "--batch-size", "1", stdout=None)
+
+    assert not User.objects.filter(pk=abandoned.pk).exists()
+    recent.refresh_from_db()
+    assert recent.verification_token is None and recent.verification_token_expiry is None
+    owner.refresh_from_db()
+    assert owner.verification_token is None
+    reset.refresh_from_db()
+    assert reset.reset_password_token is None and reset.reset_token_expiry is None
+
+
+def test_reset_confirmation_hashes_only_after_a_token_match(
+    monkeypatch, api_client, user_factory
+):
+    """A token lookup and one conditional update; bogus tokens never reach the hasher."""
+
+    hashed = []
+    monkeypatch.setattr(
+        serializers, "make_password", lambda raw: hashed.append(raw) or make_password(raw)
+    )
+    bogus = {"token": str(uuid.uuid4()), "new_password": "Sweeper123!"}
+    response = api_client.post(reverse("auth-reset-password-confirm"), bogus, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not hashed
+
+    token = uuid.uuid4()
+    user, _ = user_factory(
+        reset_password_token=token, reset_token_expiry=timezone.now() + timedelta(hours=1)
+    )
+    payload = {"token": str(token), "new_password": "Sweeper123!"}
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.post(reverse("auth-reset-password-confirm"), payload, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(ctx.captured_queries) == 2
+    assert hashed == ["Sweeper123!"]
+
+    user.refresh_from_db()
+    assert user.check_password("Sweeper123!")
+    replay = api_client.post(reverse("auth-reset-password-confirm"), payload, format="json")
+    assert replay.status_code == status.HTTP_400_BAD_REQUEST
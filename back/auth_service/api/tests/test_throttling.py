@@ -0,0 +1,74 @@
+"""Tests for the sliding-window throttles on the auth endpoints."""
+
+from __future__ import annotations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.throttling import LoginRateThrottle, PasswordResetRateThrottle
+
+
+def test_login_is_throttled_before_touching_the_database(monkeypatch, api_client, user_factory):
+    """Once the window is full, login attempts are rejected without any query."""
+
+    monkeypatch.setattr(LoginRateThrottle, "THROTTLE_RATES", {"login": "2/min"})
+    user, _ = user_factory()
+    payload = {"email": user.email, "password": "wrong-password"}
+
+    for _ in range(2):
+        response = api_client.post(reverse("auth-login"), payload, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = api_client.post(reverse("auth-login"), payload, format="json")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response
+    assert len(ctx.captured_queries) == 0
+
+
+def test_login_buckets_cover_the_ip_and_the_email_alone(monkeypatch, api_client, user_factory):
+    """Rotating emails from one IP, or IPs against one email, hits the same limit."""
+
+    monkeypatch.setattr(
+        LoginRateThrottle,
+        "THROTTLE_RATES",
+        {"login": "5/min", "login_ip": "2/min", "login_email": "2/min"},
+    )
+    user, _ = user_factory()
+    url = reverse("auth-login")
+
+    for index in range(2):
+        guess = {"email": f"guess-{index}@example.com", "password": "wrong-password"}
+        response = api_client.post(url, guess, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    target = {"email": user.email, "password": "wrong-password"}
+    response = api_client.post(url, target, format="json")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    target = {"email": "victim@example.com", "password": "wrong-password"}
+    for index in range(2):
+        response = api_client.post(url, target, format="json", REMOTE_ADDR=f"203.0.113.{index}")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = api_client.post(url, target, format="json", REMOTE_ADDR="203.0.113.9")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    fresh = {"email": "someone-else@example.com", "password": "wrong-password"}
+    response = api_client.post(url, fresh, format="json", REMOTE_ADDR="198.51.100.7")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_reset_password_emails_are_throttled(monkeypatch, api_client):
+    """Repeated reset requests for the same address are rate limited."""
+
+    monkeypatch.setattr(PasswordResetRateThrottle, "THROTTLE_RATES", {"password_reset": "1/hour"})
+    payload = {"email": "Victim@Example.com"}
+
+    first = api_client.post(reverse("auth-reset-password"), payload, format="json")
+    second = api_client.post(
+        reverse("auth-reset-password"), {"email": " victim@example.com"}, format="json"
+    )
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
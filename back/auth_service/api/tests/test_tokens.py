@@ -0,0 +1,111 @@
+"""Tests for refresh token rotation and revocation."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import RevokedToken
+from api.tokens import is_revoked, prune_revoked_tokens
+
+
+def _login(api_client, user_factory):
+    user, password = user_factory()
+    response = api_client.post(
+        reverse("auth-login"),
+        {"email": user.email, "password": password},
+        format="json",
+    )
+    return response.data
+
+
+def test_refresh_rotates_and_revokes_used_token(api_client, user_factory):
+    """A refresh token can be used once; the rotated one keeps working."""
+
+    tokens = _login(api_client, user_factory)
+
+    first = api_client.post(reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json")
+    assert first.status_code == status.HTTP_200_OK
+    assert first.data["refresh"] != tokens["refresh"]
+
+    replay = api_client.post(reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json")
+    assert replay.status_code == status.HTTP_401_UNAUTHORIZED
+
+    second = api_client.post(
+        reverse("auth-refresh"), {"refresh": first.data["refresh"]}, format="json"
+    )
+    assert second.status_code == status.HTTP_200_OK
+    assert RevokedToken.objects.count() == 2
+
+
+def test_logout_revokes_refresh_token(api_client, user_factory):
+    """Logging out prevents the refresh token from minting access tokens."""
+
+    tokens = _login(api_client, user_factory)
+
+    response = api_client.post(
+        reverse("auth-logout"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_205_RESET_CONTENT
+
+    response = api_client.post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_refreshing_an_issued_token_skips_the_revocation_table(api_client, user_factory):
+    """Issued and rotated tokens are cached as live, so checking them runs no query."""
+
+    tokens = _login(api_client, user_factory)
+    refresh = RefreshToken(tokens["refresh"])
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert is_revoked(refresh["jti"]) is False
+    assert len(ctx.captured_queries) == 0
+
+    rotated = api_client.post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    with CaptureQueriesContext(connection) as ctx:
+        assert is_revoked(RefreshToken(rotated.data["refresh"])["jti"]) is False
+        assert is_revoked(refresh["jti"]) is True
+    assert len(ctx.captured_queries) == 0
+
+
+def test_revocation_check_probes_the_table_once_per_token():
+    """A cache miss costs one lookup of that token, whose answer is then cached."""
+
+    revoked = uuid.uuid4()
+    RevokedToken.objects.create(jti=revoked, expires_at=timezone.now() + timedelta(hours=1))
+    cache.clear()
+    unknown = uuid.uuid4().hex
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert is_revoked(revoked.hex) is True
+        assert is_revoked(unknown) is False
+    assert len(ctx.captured_queries) == 2
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert is_revoked(unknown) is False
+    assert len(ctx.captured_queries) == 0
+
+
+def test_prune_removes_only_expired_revocations():
+    """Pruning keeps revocations of tokens that are still valid."""
+
+    RevokedToken.objects.create(jti=uuid.uuid4(), expires_at=timezone.now() - timedelta(minutes=1))
+    kept = RevokedToken.objects.create(
+        jti=uuid.uuid4(), expires_at=timezone.now() + timedelta(days=1)
+    )
+
+    assert prune_revoked_tokens(batch_size=1) == 1
+    assert list(RevokedToken.objects.values_list("jti", flat=True)) == [kept.jti]
@@ -0,0 +1,189 @@
+"""Rate limiting for the authentication endpoints.
+
+The throttles implement an approximated sliding window: requests are counted
+in fixed windows stored in Django's cache with atomic increments, and the
+previous window's count is weighted by how much of it still overlaps the
+sliding window. Counters live in the shared cache, so every gunicorn worker
+sees the same totals.
+
+Each request is counted in three buckets: the client IP, the submitted email
+and the pair of both. The pair bucket uses the scope's rate; the IP and email
+buckets use ``<scope>_ip`` and ``<scope>_email`` from ``DEFAULT_THROTTLE_RATES``
+when set and the scope's rate otherwise. A request is rejected as soon as one
+bucket is full, so rotating emails from one address or addresses against one
+email does not escape the limit.
+
+On Redis the counters of all buckets are incremented, and any closed-window
+count not yet known to the worker is read, in a single pipelined round trip.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import SimpleRateThrottle
+
+# Upper bound on previous-window counts remembered by each worker process.
+_PREVIOUS_COUNTS_LIMIT = 10000
+_previous_counts = {}
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Sliding-window throttle keyed on the client IP, the submitted email and both.
+
+    An allowed request costs one cache round trip on Redis (every counter
+    increment in one pipeline). The count of the window that just ended can no
+    longer change, so each worker reads it once and keeps it in memory.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    wait_seconds = None
+
+    def get_cache_key(self, request, view):
+        """Return the counter key for the client IP and normalised email."""
+
+        return self._bucket_key(self.scope, f"{self.get_ident(request)}|{self._email(request)}")
+
+    def get_bucket_keys(self, request, view):
+        """Return ``(key, num_requests, duration)`` for every bucket of ``request``.
+
+        Requests without an email are only counted per IP and per pair.
+        """
+
+        buckets = [
+            (self.get_cache_key(request, view), self.num_requests, self.duration),
+            (self._bucket_key(f"{self.scope}_ip", self.get_ident(request)), *self._rate("ip")),
+        ]
+        email = self._email(request)
+        if email:
+            buckets.append((self._bucket_key(f"{self.scope}_email", email), *self._rate("email")))
+        return buckets
+
+    def allow_request(self, request, view):
+        """Count the request in every bucket and reject it when one of them is full."""
+
+        if self.rate is None:
+            return True
+
+        now = self.timer()
+        self.wait_seconds = None
+        buckets = []
+        for key, num_requests, duration in self.get_bucket_keys(request, view):
+            window = int(now // duration)
+            buckets.append((f"{key}:{window}", f"{key}:{window - 1}", num_requests, duration))
+        # Keep each counter alive for its own window plus the following one.
+        counts = increment_counters(
+            [(current_key, duration * 2) for current_key, _, _, duration in buckets],
+            [previous_key for _, previous_key, _, _ in buckets],
+        )
+        for current_key, previous_key, num_requests, duration in buckets:
+            current = counts[current_key]
+            previous = counts[previous_key]
+            overlap = 1 - (now % duration) / duration
+            if previous * overlap + current > num_requests:
+                self.wait_seconds = max(self.wait_seconds or 0, duration - (now % duration))
+        return self.wait_seconds is None
+
+    def wait(self):
+        """Return the number of seconds until the current window rolls over."""
+
+        return self.wait_seconds
+
+    def _bucket_key(self, scope, value):
+        ident = hashlib.sha1(value.encode()).hexdigest()
+        return self.cache_format % {"scope": scope, "ident": ident}
+
+    @staticmethod
+    def _email(request):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        return str(email or "").strip().lower()
+
+    def _rate(self, bucket):
+        """Return ``(num_requests, duration)`` of ``bucket``, the scope's rate by default."""
+
+        rate = self.THROTTLE_RATES.get(f"{self.scope}_{bucket}") or self.rate
+        return self.parse_rate(rate)
+
+
+def increment_counters(counters, closed_keys):
+    """Increment ``counters`` and read the closed-window counts in ``closed_keys``.
+
+    Closed-window counts can no longer change, so each one is read from the
+    cache only once per worker. On Redis everything happens in one pipeline;
+    other backends increment key by key.
+
+    Args:
+        counters (list[tuple[str, int]]): ``(key, timeout)`` of each counter to increment.
+        closed_keys (list[str]): Keys of closed windows whose count is needed.
+
+    Returns:
+        dict[str, int]: The new count of every counter and the count of every closed window.
+    """
+
+    if len(_previous_counts) >= _PREVIOUS_COUNTS_LIMIT:
+        _previous_counts.clear()
+    unknown = [key for key in closed_keys if key not in _previous_counts]
+    if isinstance(cache, RedisCache):
+        counts = _increment_on_redis(counters, unknown)
+    else:
+        counts = {key: _increment(key, timeout) for key, timeout in counters}
+        counts.update({key: cache.get(key, 0) for key in unknown})
+    for key in unknown:
+        _previous_counts[key] = counts.pop(key)
+    counts.update({key: _previous_counts[key] for key in closed_keys})
+    return counts
+
+
+def _increment_on_redis(counters, unknown):
+    """Run the increments and reads of :func:`increment_counters` in one pipeline."""
+
+    client = cache._cache.get_client(write=True)  # pylint: disable=protected-access
+    pipeline = client.pipeline(transaction=False)
+    for key, timeout in counters:
+        redis_key = cache.make_and_validate_key(key)
+        # SET NX creates the counter with its expiry; INCR never touches the TTL.
+        pipeline.set(redis_key, 0, ex=timeout, nx=True)
+        pipeline.incr(redis_key)
+    for key in unknown:
+        pipeline.get(cache.make_and_validate_key(key))
+    results = pipeline.execute()
+    increments = results[1 : 2 * len(counters) : 2]
+    reads = results[2 * len(counters) :]
+    counts = {key: count for (key, _), count in zip(counters, increments)}
+    counts.update({key: int(value or 0) for key, value in zip(unknown, reads)})
+    return counts
+
+
+def _increment(key, timeout):
+    """Atomically increment ``key`` in the cache and return the new count."""
+
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        return cache.incr(key)
+
+
+class LoginRateThrottle(SlidingWindowRateThrottle):
+    """Throttle token requests before any password hashing happens."""
+
+    scope = "login"
+
+
+class PasswordResetRateThrottle(SlidingWindowRateThrottle):
+    """Throttle password reset emails."""
+
+    scope = "password_reset"
+
+
+class PasswordResetConfirmRateThrottle(SlidingWindowRateThrottle):
+    """Throttle password reset confirmations, which hash the new password."""
+
+    scope = "password_reset_confirm"
+
+
+class RegisterRateThrottle(SlidingWindowRateThrottle):
+    """Throttle account registrations."""
+
+    scope = "register"
@@ -0,0 +1,159 @@
+"""Refresh token rotation and revocation.
+
+Revoked refresh token identifiers (``jti``) are stored durably in the compact
+``RevokedToken`` table and mirrored in the shared cache with a TTL matching the
+token's remaining lifetime. Issued and rotated refresh tokens are recorded in
+the cache as not revoked for their whole lifetime, so ordinary refreshes never
+reach the table. Checks consult an in-process LRU of known revocations first,
+then make one cache round trip. On a cache miss (an evicted or flushed entry)
+a single primary-key probe of the table decides, and its answer is cached for
+that ``jti`` only.
+"""
+
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .claims import CLAIMS_VERSION_CLAIM, add_user_claims
+from .models import RevokedToken, User
+
+REVOKED_CACHE_PREFIX = "jwt:revoked:"
+# How long the answer of a table probe is cached.
+REVOKED_PROBE_TIMEOUT = 15 * 60
+_REVOKED_LRU_SIZE = 4096
+_revoked_lru = OrderedDict()
+
+
+def _remember(jti):
+    """Record ``jti`` in the in-process LRU of revoked identifiers."""
+
+    _revoked_lru[jti] = None
+    _revoked_lru.move_to_end(jti)
+    if len(_revoked_lru) > _REVOKED_LRU_SIZE:
+        _revoked_lru.popitem(last=False)
+
+
+def _expiry(token):
+    """Return the expiry of ``token`` as an aware datetime."""
+
+    return datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+
+
+def remember_issued(token):
+    """Cache ``token`` as not revoked until it expires, and return it.
+
+    Args:
+        token (RefreshToken): Refresh token that was just issued or rotated.
+
+    Returns:
+        RefreshToken: ``token``, for chaining.
+    """
+
+    timeout = max(1, int((_expiry(token) - now()).total_seconds()))
+    # add() never overwrites a revocation mark.
+    cache.add(REVOKED_CACHE_PREFIX + token[api_settings.JTI_CLAIM], 0, timeout=timeout)
+    return token
+
+
+def is_revoked(jti):
+    """Return True when the refresh token identified by ``jti`` was revoked."""
+
+    if jti in _revoked_lru:
+        return True
+    key = REVOKED_CACHE_PREFIX + jti
+    revoked = cache.get(key)
+    if revoked is None:
+        revoked = int(RevokedToken.objects.filter(jti=uuid.UUID(jti)).exists())
+        # add() never overwrites the mark a concurrent revoke() just set.
+        cache.add(key, revoked, timeout=REVOKED_PROBE_TIMEOUT)
+    if revoked:
+        _remember(jti)
+    return bool(revoked)
+
+
+def revoke(token):
+    """Revoke ``token`` and return False when it had already been revoked.
+
+    Args:
+        token (RefreshToken): Validated refresh token.
+
+    Returns:
+        bool: ``True`` when this call revoked the token.
+    """
+
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = _expiry(token)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=uuid.UUID(jti), expires_at=expires_at)
+        created = True
+    except IntegrityError:
+        created = False
+    timeout = max(1, int((expires_at - now()).total_seconds()))
+    cache.set(REVOKED_CACHE_PREFIX + jti, 1, timeout=timeout)
+    _remember(jti)
+    return created
+
+
+def prune_revoked_tokens(batch_size=1000):
+    """Delete revocations of tokens that have expired, in batches.
+
+    Returns:
+        int: Number of deleted rows.
+    """
+
+    deleted = 0
+    while True:
+        expired = RevokedToken.objects.filter(expires_at__lte=now())
+        batch = list(expired.values_list("jti", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        deleted += RevokedToken.objects.filter(jti__in=batch).delete()[0]
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer that rejects revoked tokens and revokes rotated ones.
+
+    Profile claims are re-minted from the user when the token's
+    ``claims_version`` is behind, so clients told their claims are stale get
+    fresh ones from a plain refresh.
+    """
+
+    def validate(self, attrs):
+        """Issue a new token pair and revoke the refresh token that was used.
+
+        Raises:
+            InvalidToken: When the refresh token was revoked or already rotated.
+            AuthenticationFailed: When the user no longer exists or is inactive.
+        """
+
+        refresh = self.token_class(attrs["refresh"])
+        if is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise InvalidToken("Token has been revoked.")
+
+        user = User.objects.filter(pk=refresh.payload.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        if refresh.payload.get(CLAIMS_VERSION_CLAIM) != user.claims_version:
+            add_user_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if not revoke(refresh):
+                # Another request rotated the same token concurrently.
+                raise InvalidToken("Token has been revoked.")
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(remember_issued(refresh))
+        return data
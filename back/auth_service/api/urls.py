@@ -2,7 +2,6 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from .views import (
     ChangePasswordView,
@@ -13,6 +12,8 @@ from .views import (
     ResetPasswordView,
     ResetPasswordConfirmView,
     MyTokenObtainPairView,
+    RotatingTokenRefreshView,
+    LogoutView,
     VerifyEmailAPIView,
     RightToErasureAPIView,
     UpdatePreferencesAPIView,
@@ -28,6 +29,8 @@ from .views import (
     ConversationViewSet,
     ConversationParticipantViewSet,
     MessageViewSet,
+    UnreadTotalAPIView,
+    DataExportViewSet,
     FollowedAthletesAPIView,
 )
 
@@ -42,6 +45,7 @@ router.register(r"activities", ActivityEventViewSet, basename="activity")
 router.register(r"conversations", ConversationViewSet, basename="conversation")
 router.register(r"participants", ConversationParticipantViewSet, basename="participant")
 router.register(r"messages", MessageViewSet, basename="message")
+router.register(r"privacy/exports", DataExportViewSet, basename="data-export")
 
 urlpatterns = [
     # User Endpoints
@@ -50,12 +54,14 @@ urlpatterns = [
 
     # Auth Endpoints
     path("auth/login/", MyTokenObtainPairView.as_view(), name="auth-login"),
-    path("auth/refresh/", TokenRefreshView.as_view(), name="auth-refresh"),
+    path("auth/refresh/", RotatingTokenRefreshView.as_view(), name="auth-refresh"),
+    path("auth/logout/", LogoutView.as_view(), name="auth-logout"),
     path("auth/register/", RegisterUserAPIView.as_view(), name="auth-register"),
     path("auth/verify-email/", VerifyEmailAPIView.as_view(), name="auth-verify-email"),
     path("auth/me/", RetrieveAPIView.as_view(), name="auth-me"),
     path("auth/preferences/", UpdatePreferencesAPIView.as_view(), name="auth-preferences"),
     path("privacy/erase/", RightToErasureAPIView.as_view(), name="privacy-erase"),
+    path("inbox/unread/", UnreadTotalAPIView.as_view(), name="inbox-unread"),
     path(
         "auth/change-password/",
         ChangePasswordView.as_view(),
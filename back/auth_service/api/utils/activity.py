@@ -0,0 +1,88 @@
+"""Bulk ingestion of activity events synced from social platforms."""
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from api.models import ActivityEvent, Athlete
+from api.serializers import media_assets_for_urls
+
+# Columns rewritten when an already ingested event is sent again.
+UPDATE_FIELDS = [
+    "athlete",
+    "type",
+    "text",
+    "competition_title",
+    "competition_location",
+    "competition_date",
+    "competition_result",
+    "followers_delta",
+    "followers_note",
+    "trophy_title",
+    "trophy_award",
+    "happened_at",
+]
+UNIQUE_FIELDS = ["platform", "external_id"]
+
+
+def ingest_activity_events(rows, batch_size=500):
+    """Upsert validated events and replace their images, with a fixed number of statements.
+
+    Events are keyed on ``(platform, external_id)``: new keys are inserted and
+    known ones, including their ``happened_at``, updated by a single ``INSERT
+    ... ON CONFLICT DO UPDATE`` per ``batch_size`` rows. Image links of the
+    whole batch are then rewritten with one delete and one bulk insert. When
+    a key appears several times in ``rows`` the last occurrence wins.
+
+    Args:
+        rows (list[dict]): ``ActivityEventIngestSerializer`` validated data.
+        batch_size (int): Rows per ``INSERT`` statement.
+
+    Returns:
+        tuple[int, int]: Number of created and of updated events.
+
+    Raises:
+        ValidationError: When a row references an unknown athlete.
+    """
+
+    rows = list({tuple(row[name] for name in UNIQUE_FIELDS): row for row in rows}.values())
+    athlete_ids = {row["athlete_id"] for row in rows}
+    known = set(Athlete.objects.filter(pk__in=athlete_ids).values_list("pk", flat=True))
+    unknown = sorted(str(pk) for pk in athlete_ids - known)
+    if unknown:
+        raise ValidationError({"athlete": [f"Unknown athletes: {', '.join(unknown)}."]})
+
+    events = [
+        ActivityEvent(**{name: value for name, value in row.items() if name != "images"})
+        for row in rows
+    ]
+    with transaction.atomic():
+        assets = media_assets_for_urls(url for row in rows for url in row.get("images", ()))
+        ActivityEvent.objects.bulk_create(
+            events,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=UNIQUE_FIELDS,
+            update_fields=UPDATE_FIELDS,
+        )
+        # Updated rows keep their stored id, so read the ids back in one query.
+        stored = {
+            tuple(key): pk
+            for pk, *key in ActivityEvent.objects.filter(
+                platform__in={row["platform"] for row in rows},
+                external_id__in={row["external_id"] for row in rows},
+            ).values_list("pk", *UNIQUE_FIELDS)
+        }
+        ids = [stored[tuple(getattr(event, name) for name in UNIQUE_FIELDS)] for event in events]
+
+        links = ActivityEvent.images.through
+        links.objects.filter(activityevent_id__in=ids).delete()
+        links.objects.bulk_create(
+            [
+                links(activityevent_id=event_id, mediaasset_id=assets[url].pk)
+                for event_id, row in zip(ids, rows)
+                for url in dict.fromkeys(row.get("images", ()))
+            ],
+            batch_size=batch_size,
+        )
+    created = sum(event.pk == event_id for event, event_id in zip(events, ids))
+    return created, len(events) - created
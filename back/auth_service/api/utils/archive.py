@@ -0,0 +1,185 @@
+"""Pack cold conversations into compressed archive rows and restore them on demand."""
+
+import gzip
+import json
+
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils.dateparse import parse_datetime
+from rest_framework.utils.encoders import JSONEncoder
+
+try:  # pragma: no cover - optional dependency, gzip is used when missing
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from api.models import Conversation, ConversationArchive, MediaAsset, Message, User
+from api.serializers import MessageSerializer
+
+# Rows per DELETE and per created_at UPDATE, to keep statements and their
+# parameter lists bounded on long threads.
+BATCH_SIZE = 500
+
+
+def compress(data):
+    """Compress ``data`` with zstd when available, gzip otherwise.
+
+    Args:
+        data (bytes): Raw payload.
+
+    Returns:
+        tuple[str, bytes]: Codec name and compressed payload.
+    """
+
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=9)
+
+
+def decompress(codec, payload):
+    """Reverse :func:`compress` for the given ``codec``."""
+
+    payload = bytes(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("The zstandard package is required to read this archive.")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return gzip.decompress(payload)
+
+
+def archived_messages(conversation):
+    """Return the archived messages of ``conversation`` in ``MessageSerializer`` shape.
+
+    Args:
+        conversation (Conversation): Archived conversation.
+
+    Returns:
+        list[dict]: Messages ordered by creation date.
+    """
+
+    archive = ConversationArchive.objects.get(conversation=conversation)
+    return json.loads(decompress(archive.codec, archive.payload))
+
+
+def archive_conversation(conversation, cutoff=None):
+    """Move the messages of ``conversation`` into a single compressed archive row.
+
+    The conversation row is locked first, so a concurrent send either lands
+    before the archive is built (and the thread is skipped when it is no
+    longer cold) or waits until the thread is archived and rehydrates it.
+    Only the messages packed into the archive are deleted.
+
+    Args:
+        conversation (Conversation): Conversation to archive.
+        cutoff (datetime | None): Skip the thread when it has a message at or
+            after this date.
+
+    Returns:
+        int: Number of archived messages, ``0`` when the thread was skipped.
+    """
+
+    with transaction.atomic():
+        locked = Conversation.objects.select_for_update().filter(pk=conversation.pk)
+        if list(locked.values_list("is_archived", flat=True)) != [False]:
+            return 0
+        messages = Message.objects.filter(conversation=conversation)
+        if cutoff is not None and messages.filter(created_at__gte=cutoff).exists():
+            return 0
+        messages = list(messages.prefetch_related("attachments", "read_by").order_by("created_at"))
+        data = MessageSerializer(messages, many=True).data
+        codec, payload = compress(json.dumps(data, cls=JSONEncoder).encode())
+        ConversationArchive.objects.update_or_create(
+            conversation=conversation,
+            defaults={"codec": codec, "payload": payload, "message_count": len(data)},
+        )
+        ids = [message.pk for message in messages]
+        for start in range(0, len(ids), BATCH_SIZE):
+            Message.objects.filter(pk__in=ids[start : start + BATCH_SIZE]).delete()
+        Conversation.objects.filter(pk=conversation.pk).update(is_archived=True)
+    conversation.is_archived = True
+    return len(data)
+
+
+def restore_conversation(conversation):
+    """Move archived messages of ``conversation`` back into the hot tables.
+
+    Messages whose sender was deleted in the meantime are dropped, as are
+    references to deleted attachments and readers.
+
+    Args:
+        conversation (Conversation): Conversation to rehydrate.
+
+    Returns:
+        int: Number of restored messages.
+    """
+
+    if not conversation.is_archived:
+        return 0
+
+    with transaction.atomic():
+        archive = (
+            ConversationArchive.objects.select_for_update()
+            .filter(conversation=conversation)
+            .first()
+        )
+        if archive is None:  # Restored concurrently.
+            conversation.is_archived = False
+            return 0
+
+        rows = json.loads(decompress(archive.codec, archive.payload))
+        user_ids = {row["sender"] for row in rows} | {u for row in rows for u in row["read_by"]}
+        media_ids = {m for row in rows for m in row["attachments"]}
+        users = {
+            str(pk) for pk in User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+        }
+        media = {
+            str(pk)
+            for pk in MediaAsset.objects.filter(pk__in=media_ids).values_list("pk", flat=True)
+        }
+        rows = [row for row in rows if row["sender"] in users]
+
+        Message.objects.bulk_create(
+            [
+                Message(
+                    id=row["id"],
+                    conversation_id=conversation.pk,
+                    sender_id=row["sender"],
+                    text=row["text"],
+                )
+                for row in rows
+            ]
+        )
+        # created_at is auto_now_add, so original timestamps are restored afterwards.
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start : start + BATCH_SIZE]
+            Message.objects.filter(pk__in=[row["id"] for row in batch]).update(
+                created_at=Case(
+                    *[
+                        When(pk=row["id"], then=Value(parse_datetime(row["created_at"])))
+                        for row in batch
+                    ]
+                )
+            )
+        Message.attachments.through.objects.bulk_create(
+            [
+                Message.attachments.through(message_id=row["id"], mediaasset_id=media_id)
+                for row in rows
+                for media_id in row["attachments"]
+                if media_id in media
+            ]
+        )
+        Message.read_by.through.objects.bulk_create(
+            [
+                Message.read_by.through(message_id=row["id"], user_id=user_id)
+                for row in rows
+                for user_id in row["read_by"]
+                if user_id in users
+            ]
+        )
+        archive.delete()
+        # The last_message pointer was nulled when the messages were archived.
+        Conversation.objects.filter(pk=conversation.pk).update(
+            is_archived=False, last_message_id=rows[-1]["id"] if rows else None
+        )
+    conversation.is_archived = False
+    return len(rows)
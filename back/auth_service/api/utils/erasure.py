@@ -0,0 +1,270 @@
+"""Chunked right-to-erasure pipeline.
+
+An erasure removes the data of one user in ordered steps. Every step deletes
+or rewrites bounded batches of rows, each batch in its own short transaction,
+and records its progress on the ``ErasureRequest``. Steps only touch rows
+that still belong to the user, so re-running an interrupted request simply
+continues with whatever is left.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import (
+    AthleteFollow,
+    CompanyProfile,
+    Conversation,
+    ConversationArchive,
+    ConversationParticipant,
+    DataExport,
+    ErasureRequest,
+    Message,
+)
+from api.utils.archive import compress, decompress
+from api.utils.export import delete_export_files
+from api.utils.messaging import adjust_unread_total
+
+
+def email_hash(email):
+    """Return the audit fingerprint stored in place of an erased address."""
+
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+def request_erasure(user):
+    """Queue the erasure of ``user`` and lock the account immediately.
+
+    Args:
+        user (User): Account to erase.
+
+    Returns:
+        ErasureRequest: The pending (or already queued) request.
+    """
+
+    with transaction.atomic():
+        pending = ErasureRequest.objects.filter(user=user, status__in=["pending", "running"])
+        existing = pending.first()
+        if existing is not None:
+            return existing
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        return ErasureRequest.objects.create(
+            user=user, subject_id=user.pk, email_hash=email_hash(user.email)
+        )
+
+
+def _delete_in_batches(queryset, batch_size, pause, before_delete=None):
+    """Delete ``queryset`` in primary-key batches and return the row count.
+
+    ``before_delete`` is called with the primary keys of each batch inside the
+    transaction that deletes them.
+    """
+
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            if before_delete is not None:
+                before_delete(pks)
+            deleted += model.objects.filter(pk__in=pks).delete()[1].get(model._meta.label, 0)
+        if pause:
+            time.sleep(pause)
+
+
+def _forget_unread(user, removed):
+    """Take removed messages of ``user`` off the other participants' unread counters.
+
+    Must run in the transaction that removes the messages. A message counts
+    as unread for every participant not among its readers.
+
+    Args:
+        user (User): Sender of the removed messages.
+        removed (list[tuple[uuid.UUID, set[str]]]): Conversation id and reader
+            ids of each removed message.
+    """
+
+    if not removed:
+        return
+    sent = Counter(conversation_id for conversation_id, _ in removed)
+    read = Counter(
+        (conversation_id, reader) for conversation_id, readers in removed for reader in readers
+    )
+    participants = list(
+        ConversationParticipant.objects.select_for_update()
+        .filter(conversation_id__in=sent)
+        .exclude(user=user)
+        .order_by("pk")
+    )
+    totals = Counter()
+    for participant in participants:
+        key = participant.conversation_id
+        unread = sent[key] - read[(key, str(participant.user_id))]
+        remaining = max(0, participant.unread_count - unread)
+        totals[participant.user_id] += remaining - participant.unread_count
+        participant.unread_count = remaining
+    # bulk_update skips the signal handlers, so the totals are adjusted here.
+    ConversationParticipant.objects.bulk_update(participants, ["unread_count"])
+    for user_id, delta in totals.items():
+        adjust_unread_total(user_id, delta)
+
+
+def _anonymise_athlete(user, batch_size, pause):  # pylint: disable=unused-argument
+    athlete = getattr(user, "athlete_profile", None)
+    if athlete is None:
+        return 0
+    athlete.user = None
+    athlete.name = "Profil supprimé"
+    athlete.bio = ""
+    athlete.certified = False
+    athlete.profile_url = f"/athletes/deleted-{uuid.uuid4().hex[:8]}"
+    athlete.save(update_fields=["user", "name", "bio", "certified", "profile_url"])
+    return 1
+
+
+def _delete_follows(user, batch_size, pause):
+    return _delete_in_batches(AthleteFollow.objects.filter(user=user), batch_size, pause)
+
+
+def _delete_read_receipts(user, batch_size, pause):
+    receipts = Message.read_by.through.objects.filter(user=user)
+    return _delete_in_batches(receipts, batch_size, pause)
+
+
+def _scrub_archives(user, batch_size, pause):  # pylint: disable=unused-argument
+    """Drop the user's messages and read receipts from archived threads in place.
+
+    Each archive is rewritten in its own transaction without restoring the
+    thread into the hot tables.
+    """
+
+    uid = str(user.pk)
+    archived = Conversation.objects.filter(is_archived=True, participants__user=user)
+    removed_count = 0
+    for conversation_id in list(archived.values_list("pk", flat=True)):
+        with transaction.atomic():
+            archive = (
+                ConversationArchive.objects.select_for_update()
+                .filter(conversation_id=conversation_id)
+                .first()
+            )
+            if archive is None:  # Restored concurrently; the messages step covers it.
+                continue
+            rows = json.loads(decompress(archive.codec, archive.payload))
+            removed = [
+                (conversation_id, set(row["read_by"])) for row in rows if row["sender"] == uid
+            ]
+            kept = [row for row in rows if row["sender"] != uid]
+            if not removed and not any(uid in row["read_by"] for row in kept):
+                continue
+            for row in kept:
+                row["read_by"] = [reader for reader in row["read_by"] if reader != uid]
+            _forget_unread(user, removed)
+            archive.codec, archive.payload = compress(json.dumps(kept).encode())
+            archive.message_count = len(kept)
+            archive.save(update_fields=["codec", "payload", "message_count"])
+            removed_count += len(removed)
+        if pause:
+            time.sleep(pause)
+    return removed_count
+
+
+def _delete_messages(user, batch_size, pause):
+    def forget_unread(pks):
+        readers = {pk: set() for pk in pks}
+        for message_id, reader_id in Message.read_by.through.objects.filter(
+            message_id__in=pks
+        ).values_list("message_id", "user_id"):
+            readers[message_id].add(str(reader_id))
+        messages = Message.objects.filter(pk__in=pks).values_list("pk", "conversation_id")
+        _forget_unread(user, [(conversation_id, readers[pk]) for pk, conversation_id in messages])
+
+    return _delete_in_batches(Message.objects.filter(sender=user), batch_size, pause, forget_unread)
+
+
+def _delete_participations(user, batch_size, pause):
+    participations = ConversationParticipant.objects.filter(user=user)
+    return _delete_in_batches(participations, batch_size, pause)
+
+
+def _delete_company(user, batch_size, pause):
+    return _delete_in_batches(CompanyProfile.objects.filter(user=user), batch_size, pause)
+
+
+def _delete_exports(user, batch_size, pause):  # pylint: disable=unused-argument
+    """Delete the user's exports together with their archives on disk."""
+
+    deleted = 0
+    for export in DataExport.objects.filter(user=user):
+        delete_export_files(export)
+        export.delete()
+        deleted += 1
+    return deleted
+
+
+def _delete_account(user, batch_size, pause):  # pylint: disable=unused-argument
+    return user.delete()[1].get(user._meta.label, 0)
+
+
+# Ordered so that the final account delete no longer cascades into large tables.
+STEPS = [
+    ("athlete", _anonymise_athlete),
+    ("follows", _delete_follows),
+    ("read_receipts", _delete_read_receipts),
+    ("archives", _scrub_archives),
+    ("messages", _delete_messages),
+    ("participants", _delete_participations),
+    ("company", _delete_company),
+    ("exports", _delete_exports),
+    ("account", _delete_account),
+]
+
+
+def process_erasure(erasure, batch_size=500, pause=0):
+    """Run (or resume) ``erasure`` until the account is gone.
+
+    Args:
+        erasure (ErasureRequest): Pending or interrupted request.
+        batch_size (int): Maximum rows removed per transaction.
+        pause (float): Seconds to sleep between batches.
+
+    Returns:
+        ErasureRequest: The completed request.
+    """
+
+    erasure.status = "running"
+    erasure.attempts += 1
+    erasure.started_at = erasure.started_at or timezone.now()
+    erasure.heartbeat_at = timezone.now()
+    erasure.save(update_fields=["status", "attempts", "started_at", "heartbeat_at"])
+
+    names = [name for name, _ in STEPS]
+    start = names.index(erasure.step) if erasure.step in names else 0
+    for name, step in STEPS[start:]:
+        erasure.step = name
+        erasure.save(update_fields=["step"])
+        user = erasure.user
+        if user is None:
+            break
+        erasure.progress[name] = erasure.progress.get(name, 0) + step(user, batch_size, pause)
+        if user.pk is None:
+            # The account itself is gone; the FK was nulled by SET_NULL.
+            erasure.user = None
+        # A fresh heartbeat keeps other workers from reclaiming the request as stale.
+        erasure.heartbeat_at = timezone.now()
+        erasure.save(update_fields=["progress", "heartbeat_at"])
+
+    erasure.status = "done"
+    erasure.step = ""
+    erasure.last_error = ""
+    erasure.completed_at = timezone.now()
+    erasure.save(update_fields=["status", "step", "last_error", "completed_at"])
+    return erasure
@@ -0,0 +1,242 @@
+"""Build right-of-access archives and serve them with HTTP range support.
+
+An export is a ZIP with one NDJSON file per dataset. Rows are read in
+primary-key ordered chunks and written straight into the compressed member,
+so memory stays flat however many messages the user has. Keyset chunks are
+used instead of ``QuerySet.iterator()`` because server-side cursors are
+disabled behind PgBouncer (``DB_PGBOUNCER``), where ``iterator()`` would
+fetch the whole result at once.
+"""
+
+import json
+import os
+import re
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from api.models import (
+    Athlete,
+    AthleteFollow,
+    CompanyProfile,
+    Conversation,
+    ConversationParticipant,
+    DataExport,
+    Message,
+    User,
+)
+from api.serializers import UserSerializer
+from api.utils.archive import archived_messages
+
+EXPORT_CHUNK_SIZE = 2000
+_STREAM_BLOCK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_PRIVATE_FIELDS = {"password", "raw_address"}
+
+
+def export_path(file_name):
+    """Return the absolute path of an export file stored under ``DATA_EXPORT_ROOT``."""
+
+    return Path(settings.DATA_EXPORT_ROOT) / file_name
+
+
+def export_file_name(export):
+    """Return the name the archive of ``export`` is stored under."""
+
+    return f"{export.user_id}-{export.pk}.zip"
+
+
+def delete_export_files(export):
+    """Remove the archive of ``export`` and any partial build left next to it."""
+
+    file_name = export.file_name or export_file_name(export)
+    export_path(file_name).unlink(missing_ok=True)
+    export_path(f"{export_file_name(export)}.part").unlink(missing_ok=True)
+
+
+def _chunked(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield ``values()`` rows of ``queryset`` in primary-key ordered chunks."""
+
+    fields = ["pk", *fields]
+    last = None
+    while True:
+        page = queryset.order_by("pk")
+        if last is not None:
+            page = page.filter(pk__gt=last)
+        rows = list(page.values(*fields)[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1]["pk"]
+        for row in rows:
+            row.pop("pk")
+            yield row
+
+
+def _archived_sent_messages(user):
+    """Yield the user's messages that live in compressed conversation archives."""
+
+    sender = str(user.pk)
+    for conversation in Conversation.objects.filter(is_archived=True, participants__user=user):
+        for message in archived_messages(conversation):
+            if str(message.get("sender")) == sender:
+                yield {
+                    "id": message["id"],
+                    "conversation_id": message["conversation"],
+                    "text": message.get("text"),
+                    "created_at": message["created_at"],
+                }
+
+
+def _datasets(user):
+    """Return ``(name, rows)`` pairs describing everything held about ``user``."""
+
+    user_fields = [name for name in UserSerializer.Meta.fields if name not in _PRIVATE_FIELDS]
+    athlete_fields = [field.attname for field in Athlete._meta.concrete_fields]
+    company_fields = [field.attname for field in CompanyProfile._meta.concrete_fields]
+    message_fields = ["id", "conversation_id", "text", "created_at"]
+    return [
+        ("profile", _chunked(User.objects.filter(pk=user.pk), user_fields)),
+        ("athlete", _chunked(Athlete.objects.filter(user=user), athlete_fields)),
+        ("company", _chunked(CompanyProfile.objects.filter(user=user), company_fields)),
+        (
+            "follows",
+            _chunked(
+                AthleteFollow.objects.filter(user=user),
+                ["athlete_id", "athlete__name", "created_at"],
+            ),
+        ),
+        (
+            "conversations",
+            _chunked(
+                ConversationParticipant.objects.filter(user=user),
+                ["conversation_id", "conversation__topic", "joined_at", "unread_count", "is_muted"],
+            ),
+        ),
+        ("messages", _chunked(Message.objects.filter(sender=user), message_fields)),
+        ("archived_messages", _archived_sent_messages(user)),
+    ]
+
+
+def _write_ndjson(handle, rows):
+    """Write ``rows`` as NDJSON into ``handle`` and return how many were written."""
+
+    count = 0
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+        count += 1
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            handle.write(("\n".join(buffer) + "\n").encode())
+            buffer.clear()
+    if buffer:
+        handle.write(("\n".join(buffer) + "\n").encode())
+    return count
+
+
+def build_export(export):
+    """Write the archive for ``export`` and mark it ready.
+
+    Args:
+        export (DataExport): Export being processed.
+
+    Returns:
+        DataExport: The updated export.
+    """
+
+    root = Path(settings.DATA_EXPORT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    file_name = export_file_name(export)
+    partial = root / f"{file_name}.part"
+
+    counts = {}
+    try:
+        with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, rows in _datasets(export.user):
+                with archive.open(f"{name}.ndjson", "w", force_zip64=True) as handle:
+                    counts[name] = _write_ndjson(handle, rows)
+                # A fresh heartbeat keeps other workers from reclaiming the export as stale.
+                DataExport.objects.filter(pk=export.pk).update(heartbeat_at=timezone.now())
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
+    os.replace(partial, root / file_name)
+
+    export.status = "ready"
+    export.file_name = file_name
+    export.size = (root / file_name).stat().st_size
+    export.row_counts = counts
+    export.last_error = ""
+    export.completed_at = timezone.now()
+    export.expires_at = export.completed_at + timedelta(days=settings.DATA_EXPORT_RETENTION_DAYS)
+    fields = ["status", "file_name", "size", "row_counts", "last_error", "completed_at"]
+    updated = DataExport.objects.filter(pk=export.pk).update(
+        **{name: getattr(export, name) for name in [*fields, "expires_at"]}
+    )
+    if not updated:
+        # The export was deleted while it was being built, e.g. by an erasure.
+        (root / file_name).unlink(missing_ok=True)
+    return export
+
+
+def _read_range(path, start, length):
+    """Yield ``length`` bytes of ``path`` starting at ``start``."""
+
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(_STREAM_BLOCK_SIZE, length))
+            if not block:
+                return
+            length -= len(block)
+            yield block
+
+
+def ranged_file_response(request, path, filename):
+    """Serve ``path`` as an attachment, honouring a single ``Range`` header.
+
+    Args:
+        request (HttpRequest): Incoming request.
+        path (Path): File to serve.
+        filename (str): Name offered to the client.
+
+    Returns:
+        HttpResponse: ``200`` with the whole file, ``206`` with the requested
+        slice, or ``416`` when the range cannot be satisfied.
+    """
+
+    size = path.stat().st_size
+    match = _RANGE_RE.match(request.META.get("HTTP_RANGE", "").strip())
+    if not match or match.groups() == ("", ""):
+        # FileResponse closes the handle once the body has been sent.
+        handle = open(path, "rb")  # pylint: disable=consider-using-with
+        response = FileResponse(handle, as_attachment=True, filename=filename)
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the final N bytes.
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    length = end - start + 1
+    response = StreamingHttpResponse(
+        _read_range(path, start, length), status=206, content_type="application/zip"
+    )
+    response["Content-Length"] = str(length)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,301 @@
+"""Ingest uploaded images and build their responsive WebP derivatives.
+
+Originals are stored once per SHA-256 digest under ``originals/`` in the
+default storage, so uploading the same picture twice returns the existing
+``MediaAsset``. Derivatives are produced out of band by ``process_media``:
+each configured width narrower than the original becomes a WebP copy under
+``derivatives/<digest>/``, and ``srcset`` turns them into the attribute the
+catalog grid hands to the browser.
+"""
+
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from api.models import ActivityEvent, AthleteImage, MediaAsset, Message
+
+LOGGER = logging.getLogger(__name__)
+
+_HASH_BLOCK_SIZE = 64 * 1024
+_ALLOWED_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}
+
+
+class InvalidImage(ValueError):
+    """Raised when an upload is not an image the pipeline accepts."""
+
+
+def content_hash(handle):
+    """Return the hex SHA-256 digest of a binary file object, read in blocks."""
+
+    digest = hashlib.sha256()
+    handle.seek(0)
+    for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    handle.seek(0)
+    return digest.hexdigest()
+
+
+def _probe(handle):
+    """Return ``(format, width, height)`` of an image file or raise ``InvalidImage``."""
+
+    try:
+        with Image.open(handle) as image:
+            image.verify()
+            found, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as exc:
+        raise InvalidImage("Upload a valid image file.") from exc
+    finally:
+        handle.seek(0)
+    if found not in _ALLOWED_FORMATS:
+        raise InvalidImage(f"Unsupported image format: {found}.")
+    return found, width, height
+
+
+def ingest_image(handle, alt_text=None, url=None):
+    """Store an uploaded image, reusing the asset of an identical earlier upload.
+
+    Args:
+        handle (File): Binary file object holding the upload.
+        alt_text (str | None): Alternative text for a newly created asset.
+        url (str | None): Public URL to keep instead of the storage URL.
+
+    Returns:
+        tuple[MediaAsset, bool]: The asset and whether it was created.
+
+    Raises:
+        InvalidImage: If ``handle`` is not a supported image.
+    """
+
+    digest = content_hash(handle)
+    existing = MediaAsset.objects.filter(content_hash=digest).first()
+    if existing is not None:
+        return existing, False
+
+    found, width, height = _probe(handle)
+    name = f"originals/{digest[:2]}/{digest}{_ALLOWED_FORMATS[found]}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, handle)
+    try:
+        with transaction.atomic():
+            asset = MediaAsset.objects.create(
+                url=url or default_storage.url(name),
+                alt_text=alt_text,
+                content_hash=digest,
+                original=name,
+                width=width,
+                height=height,
+                status="pending",
+            )
+    except IntegrityError:
+        # A concurrent upload of the same bytes won the unique constraint.
+        return MediaAsset.objects.get(content_hash=digest), False
+    return asset, True
+
+
+def adopt_original(asset, path):
+    """Attach the local file ``path`` as the original of an external ``asset``.
+
+    The file is ingested like an upload, then the gallery, activity and
+    attachment links of ``asset`` move to the resulting asset and the external
+    row is deleted, so rows that referenced the same bytes under different
+    URLs collapse into one. Links the resulting asset already has are dropped.
+
+    Args:
+        asset (MediaAsset): External asset whose URL resolves to ``path``.
+        path (Path): Local copy of the image.
+
+    Returns:
+        MediaAsset: The asset that now owns the image.
+    """
+
+    with open(path, "rb") as handle:
+        canonical, _ = ingest_image(handle, alt_text=asset.alt_text, url=asset.url)
+    if canonical.pk != asset.pk:
+        with transaction.atomic():
+            taken = AthleteImage.objects.filter(media=canonical).values("athlete_id")
+            AthleteImage.objects.filter(media=asset).exclude(athlete_id__in=taken).update(
+                media=canonical
+            )
+            for links, owner in (
+                (ActivityEvent.images.through, "activityevent_id"),
+                (Message.attachments.through, "message_id"),
+            ):
+                taken = links.objects.filter(mediaasset=canonical).values(owner)
+                links.objects.filter(mediaasset=asset).exclude(**{f"{owner}__in": taken}).update(
+                    mediaasset=canonical
+                )
+            asset.delete()
+    return canonical
+
+
+def _resized(image, width):
+    """Return a WebP encoding of ``image`` scaled to ``width`` pixels wide."""
+
+    height = max(round(image.height * width / image.width), 1)
+    copy = image.resize((width, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    copy.save(buffer, "WEBP", quality=settings.MEDIA_WEBP_QUALITY, method=4)
+    return buffer.getvalue()
+
+
+def build_derivatives(asset):
+    """Write the WebP derivatives of ``asset`` and mark it ready.
+
+    Widths from ``MEDIA_DERIVATIVE_WIDTHS`` that are not narrower than the
+    original are skipped; a WebP at the original width is always produced so
+    browsers never need the source file.
+
+    Args:
+        asset (MediaAsset): Asset with a stored ``original``.
+
+    Returns:
+        MediaAsset: The updated asset.
+    """
+
+    with default_storage.open(asset.original, "rb") as handle:
+        with Image.open(handle) as source:
+            image = ImageOps.exif_transpose(source)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    widths = sorted(
+        {w for w in settings.MEDIA_DERIVATIVE_WIDTHS if w < image.width} | {image.width}
+    )
+    derivatives = []
+    for width in widths:
+        name = f"derivatives/{asset.content_hash}/{width}.webp"
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        derivatives.append(
+            {
+                "width": width,
+                "name": default_storage.save(name, ContentFile(_resized(image, width))),
+            }
+        )
+
+    asset.width, asset.height = image.size
+    asset.derivatives = derivatives
+    asset.status = "ready"
+    asset.last_error = ""
+    asset.save(update_fields=["width", "height", "derivatives", "status", "last_error"])
+    return asset
+
+
+def claimable(statuses, stale_before=None):
+    """Return the filter matching assets a worker may claim.
+
+    Args:
+        statuses (tuple[str]): Statuses an asset may be claimed from.
+        stale_before (datetime | None): Also reclaim ``running`` assets claimed
+            before this moment, left behind by a worker that died.
+    """
+
+    condition = Q(status__in=statuses)
+    if stale_before is not None:
+        condition |= Q(status="running", started_at__lt=stale_before)
+    return condition
+
+
+def _process(asset_id, statuses, stale_before=None):
+    """Claim one asset and build its derivatives.
+
+    Returns:
+        bool | None: Whether it succeeded, or ``None`` if another worker had it.
+    """
+
+    claimed = MediaAsset.objects.filter(claimable(statuses, stale_before), pk=asset_id).update(
+        status="running", started_at=timezone.now()
+    )
+    if not claimed:
+        return None
+    asset = MediaAsset.objects.get(pk=asset_id)
+    try:
+        build_derivatives(asset)
+        return True
+    except Exception as exc:  # pylint: disable=broad-except
+        LOGGER.exception("Media derivatives for %s failed", asset_id)
+        MediaAsset.objects.filter(pk=asset_id).update(status="failed", last_error=str(exc))
+        return False
+
+
+def _process_in_thread(asset_id, statuses, stale_before):
+    """Run ``_process`` on a pool thread and release its database connection."""
+
+    try:
+        return _process(asset_id, statuses, stale_before)
+    finally:
+        connection.close()
+
+
+def process_pending(asset_ids, statuses=("pending",), workers=None, stale_before=None):
+    """Build derivatives for ``asset_ids`` on a pool of worker threads.
+
+    Each asset is claimed with a conditional ``UPDATE`` so concurrent
+    ``process_media`` runs never process the same row twice. With one worker
+    the assets are processed inline.
+
+    Args:
+        asset_ids (Iterable[UUID]): Assets to process.
+        statuses (tuple[str]): Statuses an asset may be claimed from.
+        workers (int | None): Pool size, ``MEDIA_WORKERS`` by default.
+        stale_before (datetime | None): Also reclaim ``running`` assets claimed
+            before this moment.
+
+    Returns:
+        tuple[int, int]: Number of assets processed and number that failed.
+    """
+
+    workers = workers or settings.MEDIA_WORKERS
+    if workers <= 1:
+        results = [_process(asset_id, statuses, stale_before) for asset_id in asset_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-worker") as pool:
+            results = list(
+                pool.map(
+                    lambda asset_id: _process_in_thread(asset_id, statuses, stale_before),
+                    asset_ids,
+                )
+            )
+    return results.count(True), results.count(False)
+
+
+def srcset(asset, absolute=None):
+    """Return the ``srcset`` attribute value for ``asset`` or ``""`` if it has none.
+
+    Args:
+        asset (MediaAsset): Asset whose derivatives are listed.
+        absolute (Callable[[str], str] | None): Optional URL builder such as
+            ``request.build_absolute_uri``.
+    """
+
+    return derivatives_srcset(asset.derivatives, absolute)
+
+
+def derivatives_srcset(derivatives, absolute=None):
+    """Return the ``srcset`` attribute value for a ``MediaAsset.derivatives`` list."""
+
+    candidates = []
+    for item in derivatives or ():
+        url = default_storage.url(item["name"])
+        candidates.append(f"{absolute(url) if absolute else url} {item['width']}w")
+    return ", ".join(candidates)
+
+
+def local_path(url, root):
+    """Map a site-relative ``url`` such as ``/images/a.jpg`` to a file under ``root``."""
+
+    if not url or not url.startswith("/"):
+        return None
+    path = (root / url.lstrip("/")).resolve()
+    if root.resolve() not in path.parents or not os.path.isfile(path):
+        return None
+    return path
@@ -0,0 +1,124 @@
+"""Send messages and keep the conversation metadata and unread counters in step.
+
+Every participant row carries an ``unread_count`` and every user an
+``unread_total``, the sum of their participant counters, so the inbox badge is
+a primary-key read. Sends update both with ``F()`` expressions; any other
+change to a participant row (saves, deletes, cascades from a deleted
+conversation) is folded into the total by the signal handlers below.
+Bulk ``QuerySet.update()`` calls on ``unread_count`` bypass them and must
+adjust the totals themselves, as :func:`send_message` does.
+"""
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.models import Conversation, ConversationParticipant, Message, User
+from api.utils.archive import restore_conversation
+
+
+def send_message(conversation, sender, text=None, attachments=()):
+    """Append a message to ``conversation`` in one short transaction.
+
+    The conversation row is locked first, so concurrent sends on the same
+    thread queue behind each other and ``last_message`` always points at the
+    newest message. The other participants' ``unread_count`` and their
+    ``unread_total`` are bumped with one ``UPDATE ... SET n = n + 1`` each,
+    which never loses an increment however many senders race.
+
+    Args:
+        conversation (Conversation): Target conversation, restored first if archived.
+        sender (User): Author of the message.
+        text (str | None): Message body.
+        attachments (Iterable[MediaAsset]): Media attached to the message.
+
+    Returns:
+        Message: The stored message.
+    """
+
+    with transaction.atomic():
+        # Lock before checking the archive flag, so a concurrent archive run
+        # either finishes first (and the thread is restored) or waits for us.
+        locked = Conversation.objects.select_for_update().filter(pk=conversation.pk)
+        conversation.is_archived = locked.values_list("is_archived", flat=True).get()
+        restore_conversation(conversation)
+        message = Message.objects.create(conversation_id=conversation.pk, sender=sender, text=text)
+        if attachments:
+            message.attachments.set(attachments)
+        Conversation.objects.filter(pk=conversation.pk).update(
+            updated_at=message.created_at, last_message_id=message.pk
+        )
+        participants = ConversationParticipant.objects.filter(conversation_id=conversation.pk)
+        recipients = participants.exclude(user=sender)
+        recipients.update(unread_count=F("unread_count") + 1)
+        User.objects.filter(pk__in=recipients.values("user_id")).update(
+            unread_total=F("unread_total") + 1
+        )
+    conversation.updated_at = message.created_at
+    conversation.last_message = message
+    return message
+
+
+def adjust_unread_total(user_id, delta):
+    """Add ``delta`` (possibly negative) to the unread total of ``user_id``, never below zero."""
+
+    if delta:
+        User.objects.filter(pk=user_id).update(
+            unread_total=Greatest(F("unread_total") + delta, Value(0))
+        )
+
+
+def recount_unread_totals(users=None):
+    """Recompute ``unread_total`` from the participant counters.
+
+    Args:
+        users (QuerySet[User] | None): Users to repair; all users by default.
+
+    Returns:
+        int: Number of users updated.
+    """
+
+    totals = (
+        ConversationParticipant.objects.filter(user=OuterRef("pk"))
+        .order_by()
+        .values("user")
+        .annotate(total=Sum("unread_count"))
+        .values("total")
+    )
+    users = User.objects.all() if users is None else users
+    return users.update(unread_total=Coalesce(Subquery(totals), 0))
+
+
+@receiver(pre_save, sender=ConversationParticipant)
+def _remember_unread_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Record the stored counter and owner so post_save can apply the difference."""
+
+    previous = None
+    if not instance._state.adding:  # pylint: disable=protected-access
+        previous = (
+            sender.objects.filter(pk=instance.pk).values_list("user_id", "unread_count").first()
+        )
+    instance._unread_previous = previous  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=ConversationParticipant)
+def _apply_unread_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Fold a saved participant counter into its user's total."""
+
+    previous = getattr(instance, "_unread_previous", None)
+    if previous is None:
+        adjust_unread_total(instance.user_id, instance.unread_count)
+    elif previous[0] == instance.user_id:
+        adjust_unread_total(instance.user_id, instance.unread_count - previous[1])
+    else:
+        adjust_unread_total(previous[0], -previous[1])
+        adjust_unread_total(instance.user_id, instance.unread_count)
+
+
+@receiver(post_delete, sender=ConversationParticipant)
+def _remove_unread_count(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Subtract a deleted participant's counter from its user's total."""
+
+    adjust_unread_total(instance.user_id, -instance.unread_count)
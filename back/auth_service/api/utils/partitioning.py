@@ -0,0 +1,96 @@
+"""Helpers for time-range partitioning of the append-only tables.
+
+``Message`` and ``ActivityEvent`` are the only tables that grow without bound.
+On PostgreSQL their parent tables can be range partitioned by month on the
+timestamp column listed in ``PARTITIONED_TABLES``; these helpers generate the
+DDL used by ``manage.py maintain_partitions`` to keep future partitions created
+and old ones detached.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection as default_connection
+
+# Table name -> timestamp column used as the range partition key.
+PARTITIONED_TABLES = {
+    "api_message": "created_at",
+    "api_activityevent": "happened_at",
+}
+
+
+def month_start(value):
+    """Return the first instant (UTC) of the month containing ``value``."""
+
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(value, months):
+    """Return the first instant of the month ``months`` after ``value``'s month."""
+
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_name(table, month):
+    """Return the child table name holding ``month`` for ``table``."""
+
+    return f"{table}_p{month:%Y%m}"
+
+
+def create_partition_sql(table, month, quote_name=None):
+    """Return the DDL creating the monthly partition of ``table`` for ``month``."""
+
+    quote_name = quote_name or default_connection.ops.quote_name
+    lower = month_start(month)
+    upper = add_months(lower, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {quote_name(partition_name(table, lower))} "
+        f"PARTITION OF {quote_name(table)} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def detach_partition_sql(table, child, quote_name=None):
+    """Return the DDL detaching the ``child`` partition from ``table``."""
+
+    quote_name = quote_name or default_connection.ops.quote_name
+    return f"ALTER TABLE {quote_name(table)} DETACH PARTITION {quote_name(child)}"
+
+
+def is_partitioned(table, connection=None):
+    """Return True when ``table`` is a partitioned parent on PostgreSQL."""
+
+    connection = connection or default_connection
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table, connection=None):
+    """Return ``(child_name, month)`` tuples for the monthly partitions of ``table``."""
+
+    connection = connection or default_connection
+    prefix = f"{table}_p"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        suffix = name[len(prefix):] if name.startswith(prefix) else ""
+        if len(suffix) == 6 and suffix.isdigit():
+            month = datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=dt_timezone.utc)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda item: item[1])
@@ -7,18 +7,30 @@ import uuid
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.exceptions import ValidationError
-from django.db import DataError
+from django.db.models import Exists, OuterRef
 from django.utils.timezone import now
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .fast_serializers import ActivityEventListSerializer, AthleteListSerializer, UserListSerializer
+from .pagination import MessageAnchorPagination
+from .utils.activity import ingest_activity_events
+from .utils.archive import archived_messages
 from .utils.email import send_html_email
+from .utils.erasure import request_erasure
+from .utils.export import export_path, ranged_file_response
+from .utils.media import InvalidImage, ingest_image
+from .utils.messaging import send_message
 
 from .models import (
     ActivityEvent,
@@ -28,14 +40,30 @@ from .models import (
     CompanyProfile,
     Conversation,
     ConversationParticipant,
+    DataExport,
     MediaAsset,
     Message,
     SocialStat,
     SportCategory,
     User,
 )
+from .claims import (
+    CLAIMS_VERSION_CLAIM,
+    STALE_CLAIMS_HEADER,
+    add_user_claims,
+    bump_claims_version,
+    cached_profile,
+)
 from .permissions import IsAthleteOwnerOrReadOnly, IsCompanyOwnerOrReadOnly, IsSelfOrAdmin
+from .throttling import (
+    LoginRateThrottle,
+    PasswordResetConfirmRateThrottle,
+    PasswordResetRateThrottle,
+    RegisterRateThrottle,
+)
+from .tokens import RotatingTokenRefreshSerializer, remember_issued, revoke
 from .serializers import (
+    ActivityEventIngestSerializer,
     ActivityEventSerializer,
     AthleteFollowSerializer,
     AthleteImageSerializer,
@@ -44,7 +72,10 @@ from .serializers import (
     CompanyProfileSerializer,
     ConversationParticipantSerializer,
     ConversationSerializer,
+    DataExportSerializer,
     MediaAssetSerializer,
+    MediaUploadSerializer,
+    MessageSendSerializer,
     MessageSerializer,
     ResetPasswordConfirmSerializer,
     SocialStatSerializer,
@@ -55,9 +86,65 @@ from .serializers import (
 LOGGER = logging.getLogger(__name__)
 
 
+# Upper bound on the number of athletes accepted by the batch follow endpoints.
+FOLLOW_BATCH_LIMIT = 100
+# Upper bound on the number of events accepted by the bulk activity ingestion endpoint.
+ACTIVITY_BATCH_LIMIT = 1000
+
+
+def _parse_athlete_ids(values):
+    """Validate a list of athlete identifiers sent to the batch follow endpoints.
+
+    Args:
+        values (list[str] | None): Raw identifiers supplied by the client.
+
+    Returns:
+        tuple[list[uuid.UUID], str | None]: De-duplicated UUIDs and an error message
+            when the payload is invalid.
+    """
+
+    if not values or not isinstance(values, (list, tuple)):
+        return [], "A non-empty list of athlete identifiers is required."
+
+    if len(values) > FOLLOW_BATCH_LIMIT:
+        return [], f"At most {FOLLOW_BATCH_LIMIT} athletes can be sent at once."
+
+    athlete_ids = {}
+    for value in values:
+        try:
+            athlete_ids[uuid.UUID(str(value))] = None
+        except ValueError:
+            return [], f"'{value}' is not a valid UUID."
+    return list(athlete_ids), None
+
+
+class FastListMixin:
+    """Render ``list`` with a :mod:`api.fast_serializers` class instead of the model serializer.
+
+    Rows are paginated as ``.values()`` dicts, so the regular serializer is
+    only instantiated for writes and detail views.
+    """
+
+    fast_list_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        """Return the paginated collection rendered through the fast path."""
+
+        fast = self.fast_list_serializer_class(  # pylint: disable=not-callable
+            context=self.get_serializer_context()
+        )
+        rows = fast.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.render(page))
+        return Response(fast.render(rows))
+
+
 class ResetPasswordView(APIView):
     """Issue password reset tokens so users can recover their accounts."""
 
+    throttle_classes = [PasswordResetRateThrottle]
+
     def post(self, request):
         """Send a password reset link when the email is recognised.
 
@@ -109,6 +196,8 @@ class ResetPasswordView(APIView):
 class ResetPasswordConfirmView(APIView):
     """Validate reset tokens and apply the new password."""
 
+    throttle_classes = [PasswordResetConfirmRateThrottle]
+
     def post(self, request):
         """Confirm a password reset request.
 
@@ -125,8 +214,13 @@ class ResetPasswordConfirmView(APIView):
 
 
 class RetrieveAPIView(APIView):
-    """Expose the authenticated user's profile."""
+    """Expose the authenticated user's profile.
 
+    The user is taken from the token without a database lookup and the profile
+    is served from the cache maintained by :mod:`api.claims`.
+    """
+
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -136,19 +230,27 @@ class RetrieveAPIView(APIView):
             request (Request): Incoming request containing the authenticated user.
 
         Returns:
-            Response: Serialised user payload.
+            Response: Serialised user payload, flagged with ``X-Claims-Stale``
+            when the token's claims predate the latest profile change.
         """
 
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        entry = cached_profile(request.user.pk)
+        if entry is None or not entry["data"]["is_active"]:
+            raise AuthenticationFailed("User not found or inactive.", code="user_inactive")
+
+        response = Response(entry["data"])
+        if request.auth is not None and request.auth.get(CLAIMS_VERSION_CLAIM) != entry["version"]:
+            response[STALE_CLAIMS_HEADER] = "1"
+        return response
 
 
-class UserListAPIView(generics.ListAPIView):
+class UserListAPIView(FastListMixin, generics.ListAPIView):
     """List all users (restricted to admin staff)."""
 
     permission_classes = [IsAdminUser]
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    fast_list_serializer_class = UserListSerializer
 
 
 class UserCreateAPIView(generics.CreateAPIView):
@@ -213,17 +315,7 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
             Token: Refresh/access token pair containing custom claims.
         """
 
-        token = super().get_token(user)
-        token["first_name"] = user.first_name
-        token["last_name"] = user.last_name
-        token["subscription_plan"] = user.subscription_plan
-        token["email"] = user.email
-        token["is_verified"] = user.is_verified
-        token["is_staff"] = user.is_staff
-        token["language"] = getattr(user, "language", None)
-        token["currency"] = getattr(user, "currency", None)
-        token["timezone"] = getattr(user, "timezone", None)
-        return token
+        return remember_issued(add_user_claims(super().get_token(user), user))
 
     def create(self, validated_data):
         """Return validated data to satisfy serializer interface."""
@@ -240,6 +332,35 @@ class MyTokenObtainPairView(TokenObtainPairView):
     """Issue JWT tokens using the customised serializer."""
 
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [LoginRateThrottle]
+
+
+class RotatingTokenRefreshView(TokenRefreshView):
+    """Rotate refresh tokens, revoking each one as soon as it is used."""
+
+    serializer_class = RotatingTokenRefreshSerializer
+
+
+class LogoutView(APIView):
+    """Revoke a refresh token so it can no longer mint access tokens."""
+
+    def post(self, request):
+        """Revoke the refresh token supplied in the payload.
+
+        Args:
+            request (Request): Incoming request containing the ``refresh`` token.
+
+        Returns:
+            Response: ``205`` once revoked, ``401`` when the token is missing or invalid.
+        """
+
+        try:
+            token = RefreshToken(request.data.get("refresh") or "")
+        except TokenError as exc:
+            raise InvalidToken(exc.args[0]) from exc
+
+        revoke(token)
+        return Response(status=status.HTTP_205_RESET_CONTENT)
 
 
 class VerifyEmailView(APIView):
@@ -293,12 +414,17 @@ class VerifyEmailView(APIView):
 # --- Athlete CRUD Views ---
 
 
-class AthleteListCreateAPIView(generics.ListCreateAPIView):
+class AthleteListCreateAPIView(FastListMixin, generics.ListCreateAPIView):
     """List existing athletes or create new ones for the authenticated user."""
-    queryset = Athlete.objects.all()
     serializer_class = AthleteSerializer
+    fast_list_serializer_class = AthleteListSerializer
     permission_classes = [IsAthleteOwnerOrReadOnly]
 
+    def get_queryset(self):
+        """Return athletes with counters and gallery loaded up front."""
+
+        return Athlete.objects.for_listing(self.request.user)
+
     def perform_create(self, serializer):
         """Persist the athlete while assigning ownership to the requester."""
 
@@ -307,10 +433,14 @@ class AthleteListCreateAPIView(generics.ListCreateAPIView):
 
 class AthleteRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a specific athlete profile."""
-    queryset = Athlete.objects.all()
     serializer_class = AthleteSerializer
     permission_classes = [IsAthleteOwnerOrReadOnly]
 
+    def get_queryset(self):
+        """Return athletes with counters and gallery loaded up front."""
+
+        return Athlete.objects.for_listing(self.request.user)
+
     def perform_update(self, serializer):
         """Prevent ownership changes unless the actor is staff."""
 
@@ -343,6 +473,35 @@ class MediaAssetViewSet(DefaultReadWritePermissions, viewsets.ModelViewSet):
     queryset = MediaAsset.objects.all()
     serializer_class = MediaAssetSerializer
 
+    @action(detail=False, methods=["post"], parser_classes=[MultiPartParser])
+    def upload(self, request):
+        """Store an uploaded image, deduplicated by content hash.
+
+        Derivatives are built afterwards by ``process_media``; until then the
+        asset is ``pending`` and its ``srcset`` is empty.
+
+        Args:
+            request (Request): Multipart request with ``file`` and optional ``alt_text``.
+
+        Returns:
+            Response: ``201`` with a new asset, or ``200`` with the asset that
+            already holds the same bytes.
+        """
+
+        upload = MediaUploadSerializer(data=request.data)
+        upload.is_valid(raise_exception=True)
+        try:
+            asset, created = ingest_image(
+                upload.validated_data["file"],
+                alt_text=upload.validated_data.get("alt_text") or None,
+            )
+        except InvalidImage as exc:
+            raise ValidationError({"file": [str(exc)]}) from exc
+        return Response(
+            self.get_serializer(asset).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
 
 class AthleteImageViewSet(DefaultReadWritePermissions, viewsets.ModelViewSet):
     """CRUD operations for athlete image associations."""
@@ -454,12 +613,118 @@ class AthleteFollowViewSet(DefaultReadWritePermissions, viewsets.ModelViewSet):
         deleted, _ = AthleteFollow.objects.filter(user=request.user, athlete_id=athlete_id).delete()
         return Response(status=status.HTTP_204_NO_CONTENT if deleted else status.HTTP_200_OK)
 
+    @action(
+        detail=False,
+        methods=["post", "delete"],
+        url_path="batch",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def batch(self, request):
+        """Follow (``POST``) or unfollow (``DELETE``) several athletes at once.
+
+        Args:
+            request (Request): Incoming request containing an ``athletes`` list of UUIDs.
+
+        Returns:
+            Response: The affected athlete identifiers, or ``400`` on an invalid payload.
+        """
+
+        athlete_ids, error = _parse_athlete_ids(request.data.get("athletes"))
+        if error:
+            return Response({"athletes": [error]}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.method == "DELETE":
+            deleted, _ = AthleteFollow.objects.filter(
+                user=request.user,
+                athlete_id__in=athlete_ids,
+            ).delete()
+            return Response({"unfollowed": deleted}, status=status.HTTP_200_OK)
+
+        existing = list(
+            Athlete.objects.filter(pk__in=athlete_ids).values_list("pk", flat=True)
+        )
+        AthleteFollow.objects.bulk_create(
+            [AthleteFollow(user=request.user, athlete_id=pk) for pk in existing],
+            ignore_conflicts=True,
+        )
+        return Response(
+            {"followed": [str(pk) for pk in existing]},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="state",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def state(self, request):
+        """Return the follow state of many athletes with a single ``IN`` query.
+
+        Args:
+            request (Request): Incoming request with a comma separated ``athletes``
+                query parameter (repeated parameters are accepted too).
+
+        Returns:
+            Response: Mapping of athlete UUID to a boolean follow flag.
+        """
+
+        raw = []
+        for value in request.query_params.getlist("athletes"):
+            raw.extend(part for part in value.split(",") if part)
+        athlete_ids, error = _parse_athlete_ids(raw)
+        if error:
+            return Response({"athletes": [error]}, status=status.HTTP_400_BAD_REQUEST)
+
+        followed = set(
+            AthleteFollow.objects.filter(
+                user=request.user,
+                athlete_id__in=athlete_ids,
+            ).values_list("athlete_id", flat=True)
+        )
+        return Response({str(pk): pk in followed for pk in athlete_ids})
+
 
-class ActivityEventViewSet(DefaultReadWritePermissions, viewsets.ModelViewSet):
+class ActivityEventViewSet(FastListMixin, DefaultReadWritePermissions, viewsets.ModelViewSet):
     """Expose the activity feed for athlete profiles."""
 
     queryset = ActivityEvent.objects.all()
     serializer_class = ActivityEventSerializer
+    fast_list_serializer_class = ActivityEventListSerializer
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAdminUser])
+    def bulk(self, request):
+        """Upsert a batch of events synced from a social platform integration.
+
+        The body is ``{"events": [...]}``, each event identified by ``platform``
+        and ``external_id``; sending an event again updates it. The whole batch is
+        written by :func:`~api.utils.activity.ingest_activity_events` with a
+        fixed number of statements. Feeds and activity counters are computed
+        from the ``(athlete, happened_at)`` index when read, so a batch needs
+        no further bookkeeping.
+
+        Args:
+            request (Request): Staff request carrying up to ``ACTIVITY_BATCH_LIMIT`` events.
+
+        Returns:
+            Response: ``{"created": n, "updated": n}``.
+        """
+
+        events = request.data.get("events")
+        if not isinstance(events, list) or not events:
+            return Response(
+                {"events": ["Send a non-empty list of events."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(events) > ACTIVITY_BATCH_LIMIT:
+            return Response(
+                {"events": [f"At most {ACTIVITY_BATCH_LIMIT} events can be sent at once."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = ActivityEventIngestSerializer(data=events, many=True)
+        serializer.is_valid(raise_exception=True)
+        created, updated = ingest_activity_events(serializer.validated_data)
+        return Response({"created": created, "updated": updated}, status=status.HTTP_200_OK)
 
 
 class ConversationViewSet(viewsets.ModelViewSet):
@@ -473,6 +738,72 @@ class ConversationViewSet(viewsets.ModelViewSet):
 
         return Conversation.objects.filter(participants__user=self.request.user).distinct()
 
+    def participant_conversation(self, pk):
+        """Return conversation ``pk`` if the requester takes part in it.
+
+        Membership is a single ``EXISTS`` on the ``(conversation, user)``
+        participant index rather than the distinct join of :meth:`get_queryset`.
+
+        Raises:
+            NotFound: When the conversation does not exist or the requester is not a participant.
+        """
+
+        try:
+            conversation_id = uuid.UUID(str(pk))
+        except ValueError as exc:
+            raise NotFound() from exc
+        membership = ConversationParticipant.objects.filter(
+            conversation=OuterRef("pk"), user=self.request.user
+        )
+        conversation = (
+            Conversation.objects.filter(Exists(membership), pk=conversation_id)
+            .only("id", "is_archived")
+            .first()
+        )
+        if conversation is None:
+            raise NotFound()
+        return conversation
+
+    @action(detail=True, methods=["get", "post"], pagination_class=MessageAnchorPagination)
+    def messages(self, request, pk=None):
+        """Read one page of a conversation's messages, or post a new message.
+
+        ``GET`` pages through the ``(conversation, created_at)`` message index,
+        anchored with ``?before=<message id>`` or ``?after=<message id>``, and
+        reads archived threads transparently. ``POST`` sends a message as the
+        requester with :func:`~api.utils.messaging.send_message`.
+
+        Args:
+            request (Request): Incoming request from a conversation participant.
+            pk (str): Conversation identifier.
+
+        Returns:
+            Response: Messages in chronological order with ``previous``/``next``
+            links, or the created message.
+        """
+
+        conversation = self.participant_conversation(pk)
+        if request.method == "POST":
+            serializer = MessageSendSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            message = send_message(
+                conversation,
+                request.user,
+                text=serializer.validated_data.get("text"),
+                attachments=serializer.validated_data.get("attachments", ()),
+            )
+            return Response(MessageSerializer(message).data, status=status.HTTP_201_CREATED)
+
+        paginator = self.paginator
+        if conversation.is_archived:
+            page = paginator.paginate_list(archived_messages(conversation), request)
+            return paginator.get_paginated_response(page)
+
+        queryset = Message.objects.filter(conversation_id=conversation.pk)
+        queryset = queryset.prefetch_related("attachments", "read_by")
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(MessageSerializer(page, many=True).data)
+
 
 class ConversationParticipantViewSet(viewsets.ModelViewSet):
     """Manage conversation membership records."""
@@ -504,12 +835,56 @@ class MessageViewSet(viewsets.ModelViewSet):
             .distinct()
         )
 
+    def perform_create(self, serializer):
+        """Send the message, keeping the conversation metadata and unread counters current."""
+
+        data = serializer.validated_data
+        serializer.instance = send_message(
+            data["conversation"],
+            data["sender"],
+            text=data.get("text"),
+            attachments=data.get("attachments", ()),
+        )
+        if data.get("read_by"):
+            serializer.instance.read_by.set(data["read_by"])
+
+
+class UnreadTotalAPIView(APIView):
+    """Expose the authenticated user's unread message total for the inbox badge.
+
+    The user is taken from the token and the total read from its user row, a
+    single primary-key lookup, so clients can poll it.
+    """
+
+    authentication_classes = [JWTStatelessUserAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Return ``{"unread": <total>}`` for the requester.
+
+        Args:
+            request (Request): Incoming request containing the authenticated user.
+
+        Returns:
+            Response: The unread total, maintained by :mod:`api.utils.messaging`.
+        """
+
+        total = (
+            User.objects.filter(pk=request.user.pk, is_active=True)
+            .values_list("unread_total", flat=True)
+            .first()
+        )
+        if total is None:
+            raise AuthenticationFailed("User not found or inactive.", code="user_inactive")
+        return Response({"unread": total})
+
 
 class RegisterUserAPIView(generics.CreateAPIView):
     """Register new users and send them a verification email."""
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    throttle_classes = [RegisterRateThrottle]
 
     def create(self, request, *args, **kwargs):
         """Create an inactive user and dispatch a verification email.
@@ -610,58 +985,77 @@ class RightToErasureAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        """Anonymise related profiles and delete the user account.
+        """Queue the erasure of the account and lock it immediately.
+
+        The athlete profile is anonymised and dependent rows are removed by
+        ``manage.py process_erasures`` in bounded chunks.
 
         Args:
             request (Request): Incoming request carrying the authenticated user.
 
         Returns:
-            Response: Confirmation that the erasure process completed.
+            Response: ``202`` with the identifier and status of the queued request.
         """
 
-        user = request.user
+        erasure = request_erasure(request.user)
+        return Response(
+            {
+                "id": str(erasure.id),
+                "status": erasure.status,
+                "message": "Account erasure has been scheduled.",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
-        athlete = getattr(user, "athlete_profile", None)
-        if athlete:
-            try:
-                athlete.user = None
-                athlete.name = "Profil supprimé"
-                athlete.bio = ""
-                athlete.certified = False
-                athlete.profile_url = f"/athletes/deleted-{uuid.uuid4().hex[:8]}"
-                athlete.save(
-                    update_fields=["user", "name", "bio", "certified", "profile_url"]
-                )
-            except (
-                ValidationError,
-                DataError,
-                AttributeError,
-            ) as exc:  # pragma: no cover - safeguard path
-                LOGGER.warning(
-                    "Failed to anonymise athlete %s: %s",
-                    athlete.pk,
-                    exc,
-                )
-
-        company = getattr(user, "company_profile", None)
-        if company:
-            try:
-                company.delete()
-            except (
-                ValidationError,
-                DataError,
-                AttributeError,
-            ) as exc:  # pragma: no cover - safeguard path
-                LOGGER.warning(
-                    "Failed to delete company profile %s: %s",
-                    company.pk,
-                    exc,
-                )
-
-        email = user.email
-        user.delete()
-
-        return Response({"message": f"Account for {email} erased."}, status=status.HTTP_200_OK)
+
+class DataExportViewSet(viewsets.ReadOnlyModelViewSet):
+    """Request, poll and download right-of-access exports of the current user."""
+
+    serializer_class = DataExportSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        """Limit exports to those of the authenticated user."""
+
+        return DataExport.objects.filter(user=self.request.user).order_by("-requested_at")
+
+    def create(self, request):
+        """Queue an export, reusing one that is still being built.
+
+        Args:
+            request (Request): Incoming request carrying the authenticated user.
+
+        Returns:
+            Response: ``202`` with the queued export.
+        """
+
+        export = self.get_queryset().filter(status__in=["pending", "running"]).first()
+        if export is None:
+            export = DataExport.objects.create(user=request.user)
+        return Response(self.get_serializer(export).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        """Stream the export archive, honouring ``Range`` requests.
+
+        Args:
+            request (Request): Incoming request, optionally with a ``Range`` header.
+            pk (str): Identifier of the export.
+
+        Returns:
+            HttpResponse: The archive (``200``/``206``) or ``409`` while it is not ready.
+        """
+
+        export = self.get_object()
+        if export.status != "ready":
+            return Response({"detail": "Export is not ready."}, status=status.HTTP_409_CONFLICT)
+        path = export_path(export.file_name)
+        if not path.exists():
+            return Response({"detail": "Export has expired."}, status=status.HTTP_410_GONE)
+        return ranged_file_response(
+            request, path, f"sponsorsclub-export-{export.requested_at:%Y%m%d}.zip"
+        )
 
 
 class FollowedAthletesAPIView(APIView):
@@ -680,12 +1074,12 @@ class FollowedAthletesAPIView(APIView):
         """
 
         queryset = (
-            Athlete.objects.filter(followers__user=request.user)
-            .distinct()
+            Athlete.objects.for_listing(request.user)
+            .filter(followed_by_user=True)
             .order_by("name")
         )
-        serializer_context = {"request": request}
-        data = AthleteSerializer(queryset, many=True, context=serializer_context).data
+        fast = AthleteListSerializer(context={"request": request})
+        data = fast.render(fast.values(queryset))
         return Response({"results": data, "count": len(data)})
 
 
@@ -724,5 +1118,6 @@ class UpdatePreferencesAPIView(APIView):
 
         if changed_fields:
             user.save(update_fields=changed_fields)
+            bump_claims_version(user)
 
         return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
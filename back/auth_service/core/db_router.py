@@ -0,0 +1,103 @@
+"""
+Primary/replica database routing.
+
+Reads issued while serving safe HTTP methods are spread across the aliases
+listed in ``settings.DATABASE_REPLICAS``. Everything else goes to ``default``:
+writes, reads inside a transaction, reads made later in a request that already
+wrote, and reads from a client that wrote less than
+``settings.DATABASE_REPLICA_LAG_WINDOW`` seconds ago.
+"""
+
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Whether reads must go to the primary for the current request/thread.
+_pinned = ContextVar("db_pinned_to_primary", default=False)
+# Whether the current request/thread has written to the primary.
+_wrote = ContextVar("db_wrote_to_primary", default=False)
+
+PIN_CACHE_PREFIX = "db:pin:"
+
+
+def pin_to_primary():
+    """Route every following read of the current request to the primary."""
+
+    _pinned.set(True)
+
+
+def is_pinned():
+    """Return True when reads are currently pinned to the primary."""
+
+    return _pinned.get()
+
+
+class PrimaryReplicaRouter:
+    """Send reads to a random replica unless the caller must read its own writes."""
+
+    def __init__(self, replicas=None):
+        if replicas is None:
+            replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        self.replicas = list(replicas)
+
+    def db_for_read(self, model, **hints):
+        """Pick a replica for the read, or the primary when pinned."""
+
+        if not self.replicas or _pinned.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        """Always write to the primary and pin later reads to it."""
+
+        _wrote.set(True)
+        _pinned.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas mirror the primary, so relations across aliases are fine."""
+
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Only migrate the primary; replicas receive changes via replication."""
+
+        return db not in self.replicas
+
+
+def _client_key(request):
+    """Return a cache key identifying the client that issued ``request``."""
+
+    identity = request.META.get("HTTP_AUTHORIZATION") or request.META.get("REMOTE_ADDR", "")
+    return PIN_CACHE_PREFIX + hashlib.sha1(identity.encode()).hexdigest()
+
+
+class ReplicaPinningMiddleware:
+    """Keep a client on the primary while its writes may not have replicated."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lag_window = getattr(settings, "DATABASE_REPLICA_LAG_WINDOW", 2)
+
+    def __call__(self, request):
+        key = _client_key(request)
+        pinned = request.method not in ("GET", "HEAD", "OPTIONS") or bool(cache.get(key))
+        pinned_token = _pinned.set(pinned)
+        wrote_token = _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get() and self.lag_window > 0:
+                cache.set(key, 1, timeout=self.lag_window)
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+        return response
@@ -0,0 +1,45 @@
+"""
+Per-request SQL query counting.
+
+When ``settings.QUERY_COUNT_HEADER`` is enabled every response carries an
+``X-Query-Count`` header with the number of statements the request executed
+across all database aliases. The load-testing harness (``manage.py bench_load``)
+reads it to report queries per request; it is off by default in production.
+"""
+
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class QueryCounter:
+    """Execute wrapper that counts the statements it lets through."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryCountMiddleware:
+    """Report the number of queries a request issued in ``X-Query-Count``."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_COUNT_HEADER", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+        response[QUERY_COUNT_HEADER] = str(counter.count)
+        return response
@@ -6,6 +6,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = str(os.environ.get("SECRET_KEY"))
@@ -28,6 +30,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.query_count.QueryCountMiddleware",
+    "api.slow_queries.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -35,6 +39,9 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.profiling.ProfilingMiddleware",
+    "api.idempotency.IdempotencyMiddleware",
+    "core.db_router.ReplicaPinningMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -64,8 +71,39 @@ REST_FRAMEWORK = {
     # Enable pagination for collection endpoints
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 12,
+    # Rates for the throttles in api/throttling.py, keyed on client IP + email.
+    # The "_ip" and "_email" rates cap each of the two alone; an IP can be
+    # shared behind NAT, so its default is looser.
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.environ.get("THROTTLE_LOGIN_RATE", "10/min"),
+        "login_ip": os.environ.get("THROTTLE_LOGIN_IP_RATE", "30/min"),
+        "password_reset": os.environ.get("THROTTLE_PASSWORD_RESET_RATE", "5/hour"),
+        "password_reset_ip": os.environ.get("THROTTLE_PASSWORD_RESET_IP_RATE", "20/hour"),
+        "password_reset_confirm": os.environ.get(
+            "THROTTLE_PASSWORD_RESET_CONFIRM_RATE", "10/hour"
+        ),
+        "register": os.environ.get("THROTTLE_REGISTER_RATE", "10/hour"),
+        "register_ip": os.environ.get("THROTTLE_REGISTER_IP_RATE", "30/hour"),
+    },
 }
 
+# Shared cache used for rate limiting and other cross-worker state. Without
+# REDIS_URL every gunicorn worker falls back to its own in-memory cache.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 WSGI_APPLICATION = "core.wsgi.application"
 
 DATABASES = {
@@ -84,6 +122,16 @@ DB_IS_AVAIL = all([DB_USERNAME, DB_PASSWORD, DB_DATABASE, DB_HOST, DB_PORT])
 
 POSTGRES_READY = str(os.environ.get("POSTGRES_READY")) == "1"
 
+# Persistent connections: seconds a connection is kept open between requests
+# (0 closes it after every request, "none" keeps it open forever).
+DB_CONN_MAX_AGE = os.environ.get("DB_CONN_MAX_AGE", "60")
+DB_CONN_MAX_AGE = None if DB_CONN_MAX_AGE.lower() == "none" else int(DB_CONN_MAX_AGE)
+DB_CONN_HEALTH_CHECKS = str(os.environ.get("DB_CONN_HEALTH_CHECKS", "1")) == "1"
+# Set when connecting through pgbouncer in transaction pooling mode: server-side
+# cursors (used by QuerySet.iterator()) do not survive across pooled transactions.
+DB_PGBOUNCER = str(os.environ.get("DB_PGBOUNCER")) == "1"
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+
 if DB_IS_AVAIL:
     DATABASES = {
         "default": {
@@ -93,9 +141,59 @@ if DB_IS_AVAIL:
             "PASSWORD": DB_PASSWORD,
             "HOST": DB_HOST,
             "PORT": DB_PORT,
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": DB_CONN_HEALTH_CHECKS,
+            "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+            "OPTIONS": {"connect_timeout": DB_CONNECT_TIMEOUT},
         }
     }
 
+# Read replicas: comma separated "host[:port]" list sharing the primary credentials.
+DB_REPLICA_HOSTS = [
+    host.strip()
+    for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+]
+DATABASE_REPLICAS = []
+if DB_IS_AVAIL:
+    for index, replica in enumerate(DB_REPLICA_HOSTS, start=1):
+        replica_host, _, replica_port = replica.partition(":")
+        alias = f"replica_{index}"
+        DATABASES[alias] = {
+            **DATABASES["default"],
+            "HOST": replica_host,
+            "PORT": replica_port or DB_PORT,
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(alias)
+
+# Seconds a client keeps reading from the primary after a write (replica lag budget).
+DATABASE_REPLICA_LAG_WINDOW = float(os.environ.get("DB_REPLICA_LAG_WINDOW", "2"))
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"] if DATABASE_REPLICAS else []
+
+# Password hashing tier: "pbkdf2" (default), "argon2" (needs argon2-cffi),
+# "scrypt", or "fast" for tests and demo seeding only. The selected hasher
+# creates new hashes; the others stay listed so existing hashes still verify
+# and are upgraded on the next login.
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHER_TIERS = {
+    "pbkdf2": "api.hashers.TunedPBKDF2PasswordHasher",
+    "argon2": "api.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "api.hashers.TunedScryptPasswordHasher",
+    "fast": "django.contrib.auth.hashers.MD5PasswordHasher",
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_TIERS[PASSWORD_HASHER]] + [
+    path
+    for tier, path in PASSWORD_HASHER_TIERS.items()
+    if tier not in (PASSWORD_HASHER, "fast")
+]
+PBKDF2_ITERATIONS = int(os.environ.get("PBKDF2_ITERATIONS", "0")) or None
+ARGON2_TIME_COST = int(os.environ.get("ARGON2_TIME_COST", "0")) or None
+ARGON2_MEMORY_COST = int(os.environ.get("ARGON2_MEMORY_COST", "0")) or None  # KiB
+ARGON2_PARALLELISM = int(os.environ.get("ARGON2_PARALLELISM", "0")) or None
+SCRYPT_WORK_FACTOR = int(os.environ.get("SCRYPT_WORK_FACTOR", "0")) or None
+SCRYPT_BLOCK_SIZE = int(os.environ.get("SCRYPT_BLOCK_SIZE", "0")) or None
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -129,13 +227,53 @@ STATICFILES_STORAGE = STORAGE_BACKEND
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Private directory for right-of-access archives; never served as static/media.
+DATA_EXPORT_ROOT = Path(os.environ.get("DATA_EXPORT_ROOT", BASE_DIR / "exports"))
+DATA_EXPORT_RETENTION_DAYS = int(os.environ.get("DATA_EXPORT_RETENTION_DAYS", "7"))
+
+# Uploaded media originals and their resized WebP derivatives.
+MEDIA_URL = os.environ.get("MEDIA_URL", "/media/")
+MEDIA_ROOT = Path(os.environ.get("MEDIA_ROOT", BASE_DIR / "media"))
+MEDIA_DERIVATIVE_WIDTHS = [
+    int(width) for width in os.environ.get("MEDIA_DERIVATIVE_WIDTHS", "320,640,960,1280").split(",")
+]
+MEDIA_WEBP_QUALITY = int(os.environ.get("MEDIA_WEBP_QUALITY", "80"))
+MEDIA_MAX_UPLOAD_BYTES = int(os.environ.get("MEDIA_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MEDIA_WORKERS = int(os.environ.get("MEDIA_WORKERS", "4"))
+
+# Adds X-Query-Count to every response; used by ``manage.py bench_load``.
+QUERY_COUNT_HEADER = str(os.environ.get("QUERY_COUNT_HEADER")) == "1"
+
+# Per-request profiling (api.profiling): staff send ``X-Profile: 1``, others are sampled.
+PROFILING_ENABLED = str(os.environ.get("PROFILING_ENABLED")) == "1"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_BACKEND = os.environ.get("PROFILING_BACKEND", "cprofile")  # or "pyinstrument"
+PROFILING_ROOT = Path(os.environ.get("PROFILING_ROOT", BASE_DIR / "profiles"))
+# Newest captures kept on disk; older ones are deleted as new ones arrive (0 keeps all).
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", "500"))
+
+# Slow-query log (api.slow_queries); 0 disables it. ANALYZE re-runs the query, so it is opt-in.
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_EXPLAIN = str(os.environ.get("SLOW_QUERY_EXPLAIN", "1")) == "1"
+SLOW_QUERY_EXPLAIN_ANALYZE = str(os.environ.get("SLOW_QUERY_EXPLAIN_ANALYZE")) == "1"
+
+# Seconds a POST response is kept for replay to retries sent with the same
+# Idempotency-Key; 0 disables it.
+IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+# Path prefixes never replayed: the token endpoints, whose responses carry credentials.
+IDEMPOTENCY_EXCLUDED_PATHS = ["/api/auth/login/", "/api/auth/refresh/", "/api/auth/logout/"]
+
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+# Lets the front end see when /auth/me reports stale token claims and when a POST was replayed.
+CORS_EXPOSE_HEADERS = ["X-Claims-Stale", "Idempotent-Replayed"]
 
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
-    "ROTATE_REFRESH_TOKENS": False,
+    "ROTATE_REFRESH_TOKENS": True,
+    # Rotated tokens are revoked by api.tokens instead of the token_blacklist app.
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": False,
     "ALGORITHM": "HS256",
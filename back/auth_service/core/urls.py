@@ -2,6 +2,8 @@
 This file is used to define the URL patterns for the app.
 """
 
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
@@ -9,3 +11,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
 ]
+
+# Uploaded media is served by the reverse proxy in production.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
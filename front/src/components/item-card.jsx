@@ -21,6 +21,8 @@ const ItemCard = ({ item, badgeColor = "bg-pink-600" }) => {
   const images = Array.isArray(item.images) && item.images.length
     ? item.images
     : [item.image1, item.image2, item.image3].filter(Boolean);
+  // Responsive WebP candidates built by the backend, aligned with `images`.
+  const srcsets = Array.isArray(item.image_srcsets) ? item.image_srcsets : [];
   const isCarousel = item.isCarousel ?? item.is_carousel ?? Boolean(images.length);
   const subs = item.subscribers || {
     instagram: item.subscribers_instagram ?? 0,
@@ -47,13 +49,27 @@ const ItemCard = ({ item, badgeColor = "bg-pink-600" }) => {
                     key={index}
                     className="flex items-center justify-center h-full w-full"
                   >
-                    <Image
-                      src={image}
-                      alt={`Slide ${index + 1}`}
-                      width={500}
-                      height={300}
-                      className="w-full h-full object-cover object-center mx-auto"
-                    />
+                    {srcsets[index] ? (
+                      <img
+                        src={image}
+                        srcSet={srcsets[index]}
+                        sizes="(min-width: 1280px) 25vw, (min-width: 768px) 50vw, 100vw"
+                        alt={`Slide ${index + 1}`}
+                        width={500}
+                        height={300}
+                        loading={index === 0 ? "eager" : "lazy"}
+                        decoding="async"
+                        className="w-full h-full object-cover object-center mx-auto"
+                      />
+                    ) : (
+                      <Image
+                        src={image}
+                        alt={`Slide ${index + 1}`}
+                        width={500}
+                        height={300}
+                        className="w-full h-full object-cover object-center mx-auto"
+                      />
+                    )}
                   </CarouselItem>
                 ))}
                 {/* Chart slides for follower growth and radar stats */}
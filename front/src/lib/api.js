@@ -166,11 +166,23 @@ export const refreshAccessToken = async () => {
 
   const data = await res.json();
   localStorage.setItem("accessToken", data.access);
+  // Refresh tokens are rotated: the one just used is now revoked.
+  if (data.refresh) localStorage.setItem("refreshToken", data.refresh);
   return data.access;
 };
 
 // 🔹 Logout User
 export const logout = () => {
+  const refreshToken = localStorage.getItem("refreshToken");
+  if (refreshToken) {
+    // Revoke the refresh token server-side; the redirect must not wait for it.
+    fetch(`${API_BASE_URL}/api/auth/logout/`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ refresh: refreshToken }),
+      keepalive: true,
+    }).catch(() => {});
+  }
   localStorage.removeItem("accessToken");
   localStorage.removeItem("refreshToken");
 
@@ -198,6 +210,8 @@ export const fetchUserProfile = async () => {
   }
 
   if (!res.ok) throw new Error("Failed to fetch user profile");
+  // The profile changed since this token was issued: refresh it in the background.
+  if (res.headers.get("X-Claims-Stale")) refreshAccessToken().catch(() => {});
   return res.json();
 };
 